@@ -1,2 +1,2 @@
-from .sc import ScMemoryContext
+from .sc import ScMemoryContext, ScLinkSearchMode
 from .sc_class import *
\ No newline at end of file
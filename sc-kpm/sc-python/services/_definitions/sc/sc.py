@@ -8,6 +8,11 @@ from .sc_class import *
 IterParam = TypeVar('IterParam', ScAddr, ScType)
 BuildTemplateParam = TypeVar('BuildTemplateParam', ScAddr, str)
 
+class ScLinkSearchMode(Enum):
+  Exact = 0
+  Prefix = 1
+  Substring = 2
+
 class ScMemoryContext:
 
   @staticmethod
@@ -23,6 +28,9 @@ class ScMemoryContext:
   def CreateLink(self) -> ScAddr:
     return ScAddr()
 
+  def CreateElementsBatch(self, spec: List[tuple]) -> memoryview:
+    return memoryview(b'').cast('Q')
+
   def DeleteElement(self, elAddr: ScAddr) -> bool:
     return False
 
@@ -41,12 +49,21 @@ class ScMemoryContext:
   def FindLinksByContent(self, content: Any) -> List[ScAddr]:
     return []
 
+  def FindLinksByContentIndex(self, query: str, mode: ScLinkSearchMode = ScLinkSearchMode.Exact, limit: int = 0) -> List[ScAddr]:
+    return []
+
+  def SetLinkContentIndexEnabled(self, enabled: bool):
+    pass
+
   def SetLinkContent(self, addr: ScAddr, content: Any) -> bool:
     return False
 
   def GetLinkContent(self, addr: ScAddr) -> ScLinkContent:
     return ScLinkContent()
 
+  def GetLinkStream(self, addr: ScAddr) -> ScLinkStream:
+    return ScLinkStream()
+
   def Iterator3(self, src: IterParam, edge: IterParam, trg: IterParam) -> ScIterator3:
     return ScIterator3()
 
@@ -56,9 +73,15 @@ class ScMemoryContext:
   def HelperResolveSystemIdtf(self, idtf: str, elType: ScType=ScType.Unknown) -> ScAddr:
     return ScAddr()
 
+  def HelperResolveSystemIdtfs(self, idtfs: List[str], elType: ScType=ScType.Unknown) -> List[ScAddr]:
+    return []
+
   def HelperSetSystemIdtf(self, idtf: str, addr: ScAddr) -> bool:
     return False
 
+  def HelperGetSystemIdtfsVersion(self) -> int:
+    return 0
+
   def HelperGetSystemIdtf(self, addr: ScAddr) -> str:
     return ''
 
@@ -1,6 +1,6 @@
 from .sc_addr import ScAddr
 from .sc_type import ScType
 from .sc_template import ScTemplate, ScTemplateParams, ScTemplateGenResult, ScTemplateSearchResult, ScTemplateSearchResultItem
-from .sc_link_content import ScLinkContent
+from .sc_link_content import ScLinkContent, ScLinkStream
 from .sc_iterator import ScIterator3, ScIterator5
 from .sc_result import ScResult
\ No newline at end of file
@@ -12,6 +12,9 @@ class ScAddr:
   def __ne__(self, other: ScAddr) -> bool:
     return False
 
+  def __hash__(self) -> int:
+    return 0
+
   def __rshift__(self, other):
     return None
 
@@ -10,6 +10,14 @@ class ScIterator3:
   def Get(self, idx: int) -> ScAddr:
     return ScAddr()
 
+  def NextBatch(self, count: int) -> memoryview:
+    """Returns uint64 memoryview with shape (rows, 3)"""
+    return memoryview(b'').cast('Q')
+
+  def __iter__(self):
+    """Iterates rows: tuples of 3 ScAddr"""
+    return iter([])
+
 
 class ScIterator5:
   def Next(self) -> bool:
@@ -19,4 +27,12 @@ class ScIterator5:
     return False
 
   def Get(self, idx: int) -> ScAddr:
-    return ScAddr()
\ No newline at end of file
+    return ScAddr()
+
+  def NextBatch(self, count: int) -> memoryview:
+    """Returns uint64 memoryview with shape (rows, 5)"""
+    return memoryview(b'').cast('Q')
+
+  def __iter__(self):
+    """Iterates rows: tuples of 5 ScAddr"""
+    return iter([])
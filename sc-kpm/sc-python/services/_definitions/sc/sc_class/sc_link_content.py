@@ -19,3 +19,18 @@ class ScLinkContent:
 
   def GetType(self) -> int:
     return ScLinkContent.String
+
+
+class ScLinkStream:
+
+  def Size(self) -> int:
+    return 0
+
+  def Pos(self) -> int:
+    return 0
+
+  def Seek(self, pos: int) -> bool:
+    return False
+
+  def Read(self, size: int) -> bytes:
+    return b''
@@ -29,6 +29,9 @@ class ScTemplateSearchResult:
   def Aliases(self) -> [str]:
     return []
 
+  def ToArray(self, start: int = 0, count: int = -1) -> memoryview:
+    return memoryview(b'').cast('Q')
+
 class ScTemplateParams:
   def Add(self, paramName: str, value: ScAddr):
     pass
@@ -6,4 +6,16 @@ class ScPythonEventType(Enum):
     ContentChanged = 2
     EraseElement = 3
     RemoveInputEdge = 4
-    RemoveOutputEdge = 5
\ No newline at end of file
+    RemoveOutputEdge = 5
+
+
+class ScPythonEventBatch:
+    def Size(self) -> int:
+        return 0
+
+    def __getitem__(self, idx: int) -> tuple:
+        """Returns tuple (event id, addr, edge_addr, other_addr)"""
+        return ()
+
+    def ToArray(self) -> memoryview:
+        return memoryview(b'').cast('Q')
@@ -1,7 +1,11 @@
-from .sc_keynodes import ScKeynodes
+from .sc_keynodes import ScKeynodes, ScKeynodesCache
+from .sc_context_pool import ScMemoryContextPool
+from .sc_binary import ScAddrArray
 from .sc_module import ScModule
 from .sc_exception import *
-from .sc_event import ScEventManager, ScEvent, ScEventParams
+from .sc_event import ScEventManager, ScEvent, ScEventParams, ScEventSubscriptions
+from .sc_link_cache import ScLinkContentCache
 from .sc_set import *
+from .sc_scheduler import ScAgentScheduler, ScAgentSettings, ScOverflowPolicy
 from .sc_agent import *
 from .sc_helper import *
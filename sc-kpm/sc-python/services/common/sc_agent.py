@@ -3,10 +3,13 @@ from enum import Enum
 from common.sc_keynodes import ScKeynodes
 from common.sc_set import ScSet
 from common.sc_event import ScEventParams
+from common.sc_scheduler import ScAgentScheduler
 
 from sc import *
 from scb import *
 
+import threading
+
 
 class ScAgent:
 
@@ -29,7 +32,29 @@ class ScAgent:
   def __init__(self, module):
     self.module = module
     self.evt = None
-    self.keynodes = ScKeynodes(module.ctx)
+    self.scheduler = None
+
+  @property
+  def ctx(self) -> ScMemoryContext:
+    """Memory context, that should be used by agent. It's a context of worker
+    thread, when agent runs in scheduler; otherwise it's a context of module
+    """
+    ctx = ScAgentScheduler.Context()
+    return ctx if ctx else self.module.ctx
+
+  @property
+  def keynodes(self) -> ScKeynodes:
+    """Keynodes, that are resolved with memory context of agent (see `ctx`)
+    """
+    return ScKeynodes(self.ctx)
+
+  def RunIn(self, scheduler, settings=None):
+    """Process events of this agent in worker threads of scheduler
+    scheduler - ScAgentScheduler instance
+    settings - ScAgentSettings instance. Default settings are used, if it's None
+    """
+    scheduler.Add(self, settings)
+    self.scheduler = scheduler
 
   def Register(self, addr, evt_type):
     """Register this agent to a specified event
@@ -38,7 +63,7 @@ class ScAgent:
     """
     assert self.evt == None
     self.evt = self.module.events.CreateEventInternal(
-        addr, evt_type, self._run)
+        addr, evt_type, self._emit)
     
     self.module.log.info(self.__class__.__name__ + ' registered')
 
@@ -46,6 +71,10 @@ class ScAgent:
     self.module.events.DestroyEvent(self.evt)
     self.evt = None
 
+    if self.scheduler:
+      self.scheduler.Remove(self)
+      self.scheduler = None
+
     self.module.log.info(self.__class__.__name__ + ' unregistered')
 
   def RunImpl(self, evt: ScEventParams) -> ScResult:
@@ -64,6 +93,15 @@ class ScAgent:
     return True
 
   # --- Internal usage methods ---
+  def _emit(self, evt: ScEventParams):
+    """Just for internal usage
+    """
+    if self.scheduler:
+      if not self.scheduler.Submit(self, evt):
+        self.module.log.warning(self.__class__.__name__ + ' dropped event')
+    else:
+      self._run(evt)
+
   def _run(self, evt: ScEventParams):
     """Just for internal usage
     """
@@ -80,60 +118,81 @@ class ScAgentCommand(ScAgent):
   """This type of agents initiated with command_initiated set.
   It check if initiated command class is equal to specified one,
   then run it. You doesn't need to call register function for this
-  type of agents
+  type of agents.
+
+  Command and result set are stored per thread, so agent can process
+  several commands at the same time in `ScAgentScheduler`
   """
 
   def __init__(self, module, cmd_class_addr):
     ScAgent.__init__(self, module)
     self.cmd_class = cmd_class_addr
-    self.cmd_addr = ScAddr()
-    self.result_set = None
+    # state of command, that processed by current thread
+    self.__run = threading.local()
 
     self.Register(
         self.keynodes[ScAgent.kCmdInitiated],
         ScPythonEventType.AddOutputEdge)
 
+  @property
+  def cmd_addr(self) -> ScAddr:
+    """ScAddr of command, that processed by current thread"""
+    return getattr(self.__run, 'cmd_addr', ScAddr())
+
+  @property
+  def result_set(self) -> ScSet:
+    """ScSet of result structure of command, that processed by current thread"""
+    return getattr(self.__run, 'result_set', None)
+
   def CheckImpl(self, evt):
     """Check if type of initiated command is equal to specified one
     """
-    return self.module.ctx.HelperCheckEdge(
+    return self.ctx.HelperCheckEdge(
         self.cmd_class,
         evt.other_addr,
         ScType.EdgeAccessConstPosPerm)
 
   def RunImpl(self, evt):
-    self.cmd_addr = evt.other_addr
-    assert self.cmd_addr.IsValid()
+    cmd_addr = evt.other_addr
+    assert cmd_addr.IsValid()
 
+    self.__run.cmd_addr = cmd_addr
+    try:
+      return self.__runCommand(evt, cmd_addr)
+    finally:
+      self.__run.cmd_addr = ScAddr()
+      self.__run.result_set = None
+
+  def __runCommand(self, evt, cmd_addr):
     # change state to a progress
     progress_edge = evt.edge_addr
 
     def change_progress(state: ScAddr):
-      self.module.ctx.DeleteElement(progress_edge)
-      self.module.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, state, self.cmd_addr)
+      self.ctx.DeleteElement(progress_edge)
+      self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, state, cmd_addr)
 
     change_progress(ScKeynodes.kCommandProgressdAddr())
 
     # create result structure
     templ = ScTemplate()
     templ.TripleWithRelation(
-        self.cmd_addr,
+        cmd_addr,
         ScType.EdgeDCommonVar,
         ScType.NodeVarStruct >> '_result',
         ScType.EdgeAccessVarPosPerm,
         self.keynodes[ScAgent.kNrelResult])
 
-    gen_res = self.module.ctx.HelperGenTemplate(templ, ScTemplateParams())
+    gen_res = self.ctx.HelperGenTemplate(templ, ScTemplateParams())
     assert gen_res.Size() > 0
 
     res_addr = gen_res['_result']
-    self.result_set = ScSet(self.module.ctx, res_addr)
+    self.__run.result_set = ScSet(self.ctx, res_addr)
 
     # run implementation of command
     result = self.DoCommand()
 
     # generate result type
-    self.module.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, ScKeynodes.GetResultCodeAddr(result), res_addr)
+    self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, ScKeynodes.GetResultCodeAddr(result), res_addr)
     change_progress(ScKeynodes.kCommandFinishedAddr())
 
     return result
@@ -158,7 +217,7 @@ class ScAgentCommand(ScAgent):
         ScType.EdgeAccessVarPosPerm,
         self.keynodes['rrel_{}'.format(index)])
 
-    search_res = self.module.ctx.HelperSearchTemplate(templ)
+    search_res = self.ctx.HelperSearchTemplate(templ)
     if search_res.Size() == 0:
       return ScAddr()
 
@@ -0,0 +1,141 @@
+"""Binary framing for websocket protocol (`sc-binary` subprotocol).
+
+Each binary frame has such structure (all numbers are little-endian):
+  uint32 - size (N) of header in bytes
+  N bytes - header. It's a UTF-8 encoded JSON object (the same as in text frames)
+  rest - data section
+
+Binary values in header are replaced with objects:
+  {"$bin": {"offset": 0, "size": 16, "format": "Q", "shape": [1, 2]}}
+where `offset` and `size` locate value in data section, `format` is a type of items:
+`Q` - uint64 (ScAddr values), `B` - raw bytes.
+"""
+
+import array
+import json
+import struct
+import sys
+
+PROTOCOL_JSON = 'sc-json'
+PROTOCOL_BINARY = 'sc-binary'
+
+_header_size = struct.Struct('<I')
+
+
+class ScAddrArray:
+  """Packed array of ScAddr values. It encodes as a list (or list of lists for 2-D arrays)
+  in JSON mode, and as a packed uint64 array in binary mode.
+  """
+
+  def __init__(self, data, shape):
+    """
+    data - bytes-like object with packed uint64 values in native byte order
+    shape - list of dimensions: [count] or [rows, columns]
+    """
+    self.data = data
+    self.shape = list(shape)
+
+  @staticmethod
+  def FromList(values):
+    return ScAddrArray(array.array('Q', values), [len(values)])
+
+  @staticmethod
+  def FromRows(rows, columns):
+    data = array.array('Q')
+    for row in rows:
+      data.extend(row)
+    return ScAddrArray(data, [len(rows), columns])
+
+  def ToBytes(self) -> bytes:
+    values = array.array('Q', bytes(self.data))
+    if sys.byteorder != 'little':
+      values.byteswap()
+    return values.tobytes()
+
+  def ToList(self):
+    values = array.array('Q', bytes(self.data)).tolist()
+    if len(self.shape) < 2:
+      return values
+    if len(values) == 0:
+      return [[] for _ in range(self.shape[0])]
+
+    columns = self.shape[1]
+    return [values[i:i + columns] for i in range(0, len(values), columns)]
+
+
+def _jsonDefault(value):
+  if isinstance(value, ScAddrArray):
+    return value.ToList()
+
+  raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def EncodeJson(obj) -> str:
+  return json.dumps(obj, default=_jsonDefault)
+
+
+def EncodeBinary(obj) -> bytes:
+  blobs = []
+  offset = 0
+
+  def add_blob(blob, fmt, shape):
+    nonlocal offset
+    desc = {
+        'offset': offset,
+        'size': len(blob),
+        'format': fmt,
+        'shape': shape
+    }
+    blobs.append(blob)
+    offset += len(blob)
+    return {'$bin': desc}
+
+  def replace(value):
+    if isinstance(value, ScAddrArray):
+      return add_blob(value.ToBytes(), 'Q', value.shape)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+      blob = bytes(value)
+      return add_blob(blob, 'B', [len(blob)])
+    if isinstance(value, dict):
+      return {k: replace(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+      return [replace(v) for v in value]
+
+    return value
+
+  header = json.dumps(replace(obj)).encode('utf-8')
+  return _header_size.pack(len(header)) + header + b''.join(blobs)
+
+
+def DecodeBinary(data):
+  """Decodes binary frame. Packed `Q` values are decoded into lists of int,
+  `B` values - into bytes
+  """
+  data = memoryview(data)
+  header_size = _header_size.unpack_from(data)[0]
+  data_start = _header_size.size + header_size
+
+  header = json.loads(bytes(data[_header_size.size:data_start]).decode('utf-8'))
+
+  def restore(value):
+    if isinstance(value, dict):
+      desc = value.get('$bin')
+      if desc is None:
+        return {k: restore(v) for k, v in value.items()}
+
+      start = data_start + desc['offset']
+      blob = bytes(data[start:start + desc['size']])
+      if desc['format'] == 'B':
+        return blob
+
+      values = array.array('Q', blob)
+      if sys.byteorder != 'little':
+        values.byteswap()
+      return ScAddrArray(values, desc['shape']).ToList()
+
+    if isinstance(value, list):
+      return [restore(v) for v in value]
+
+    return value
+
+  return restore(header)
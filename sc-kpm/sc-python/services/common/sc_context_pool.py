@@ -0,0 +1,62 @@
+from sc import *
+
+import threading
+
+
+class ScMemoryContextPool:
+  """Bounded pool of ScMemoryContext instances, that can be shared
+  between several owners (for example websocket connections).
+  Released contexts are stored for reuse until pool contains `max_size`
+  free contexts. All other released contexts are destroyed.
+
+  This class is thread safe
+  """
+
+  def __init__(self, name, max_size=32):
+    self.name = name
+    self.max_size = max_size
+
+    self.__lock = threading.Lock()
+    self.__free = []
+
+    # counters
+    self.allocated = 0
+    self.reused = 0
+    self.destroyed = 0
+    self.in_use = 0
+
+  def Acquire(self) -> ScMemoryContext:
+    """Returns free context from a pool. If there are no free contexts,
+    then new one will be created
+    """
+    with self.__lock:
+      self.in_use += 1
+      if len(self.__free) > 0:
+        self.reused += 1
+        return self.__free.pop()
+
+      self.allocated += 1
+      name = '{}_{}'.format(self.name, self.allocated)
+
+    return ScMemoryContext.Create(name)
+
+  def Release(self, ctx: ScMemoryContext):
+    """Returns context back to a pool
+    """
+    with self.__lock:
+      self.in_use -= 1
+      if len(self.__free) < self.max_size:
+        self.__free.append(ctx)
+        return
+
+      self.destroyed += 1
+
+  def Stats(self) -> dict:
+    with self.__lock:
+      return {
+          'allocated': self.allocated,
+          'reused': self.reused,
+          'destroyed': self.destroyed,
+          'in_use': self.in_use,
+          'free': len(self.__free)
+      }
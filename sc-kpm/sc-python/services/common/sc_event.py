@@ -14,6 +14,36 @@ class ScEventParams:
     self.other_addr = other_addr
 
 
+class _ScBatchEventParams(ScEventParams):
+  """Parameters of event, that is a row of `ScPythonEventBatch.ToArray()`.
+  ScAddr values are created on the first access
+  """
+
+  def __init__(self, rows, idx):
+    self.id = rows[idx, 0]
+    self.__rows = rows
+    self.__idx = idx
+    self.__addrs = [None, None, None]
+
+  def __getAddr(self, col):
+    addr = self.__addrs[col - 1]
+    if addr is None:
+      addr = self.__addrs[col - 1] = ScAddrFromHash(self.__rows[self.__idx, col])
+    return addr
+
+  @property
+  def addr(self):
+    return self.__getAddr(1)
+
+  @property
+  def edge_addr(self):
+    return self.__getAddr(2)
+
+  @property
+  def other_addr(self):
+    return self.__getAddr(3)
+
+
 class ScEvent:
 
   def __init__(self, evt, callback):
@@ -80,3 +110,92 @@ class ScEventManager:
       evt.Emit(evt_params)
     except KeyError:
       print("Can't find event: {}".format(evt_params.id))
+
+  def EmitEventBatch(self, batch):
+    """Emits events from `ScPythonEventBatch`. Batch is read as an array of
+    rows, so parameters are created just for events, that still have subscribers,
+    and their addrs - when callback requests them
+    """
+    rows = batch.ToArray()
+    for idx in range(len(batch)):
+      eid = rows[idx, 0]
+      evt = self.events.get(eid)
+      if evt is None:
+        print("Can't find event: {}".format(eid))
+        continue
+
+      evt.Emit(_ScBatchEventParams(rows, idx))
+
+
+class _SharedEvent:
+
+  def __init__(self, key):
+    self.key = key
+    self.evt = None
+    # subscriber id -> callback
+    self.subscribers = {}
+
+  def Emit(self, evt_params):
+    for sid, callback in list(self.subscribers.items()):
+      try:
+        callback(sid, evt_params)
+      except Exception as ex:
+        print("Error in subscriber {}: {}".format(sid, ex))
+
+
+class ScEventSubscriptions:
+  """Keeps one native event for each pair (addr, event type) and emits it
+  to all subscribers. Native event is destroyed, when the last subscriber
+  unsubscribes.
+
+  This class is thread safe
+  """
+
+  def __init__(self, evt_manager):
+    self.event_manager = evt_manager
+    self.lock = threading.Lock()
+    # (addr hash, event type) -> _SharedEvent
+    self.shared = {}
+    # subscriber id -> _SharedEvent
+    self.subscribers = {}
+    self.last_id = 0
+
+  def Subscribe(self, addr: ScAddr, evt_type, callback) -> int:
+    """Subscribes `callback(subscriber_id, evt_params)` for events of specified type.
+    Returns id of subscriber or 0, if event can't be created
+    """
+    key = (addr.ToInt(), evt_type)
+    with self.lock:
+      shared = self.shared.get(key)
+      if shared is None:
+        shared = _SharedEvent(key)
+        shared.evt = self.event_manager.CreateEventInternal(addr, evt_type, shared.Emit)
+        if shared.evt is None:
+          return 0
+        self.shared[key] = shared
+
+      self.last_id += 1
+      shared.subscribers[self.last_id] = callback
+      self.subscribers[self.last_id] = shared
+
+      return self.last_id
+
+  def Unsubscribe(self, sid: int) -> bool:
+    with self.lock:
+      shared = self.subscribers.pop(sid, None)
+      if shared is None:
+        return False
+
+      del shared.subscribers[sid]
+      if len(shared.subscribers) == 0:
+        del self.shared[shared.key]
+        self.event_manager.DestroyEvent(shared.evt)
+
+      return True
+
+  def Stats(self) -> dict:
+    with self.lock:
+      return {
+          'native_events': len(self.shared),
+          'subscribers': len(self.subscribers)
+      }
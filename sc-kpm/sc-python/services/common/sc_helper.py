@@ -1,10 +1,28 @@
 from sc import *
 
+import collections
+
 
 class ScHelper:
 
-  def __init__(self, ctx):
+  def __init__(self, ctx, content_cache=None):
+    """
+    content_cache - optional ScLinkContentCache, that used to read and set contents of sc-links
+    """
     self.ctx = ctx
+    self.content_cache = content_cache
+
+  def getLinkContent(self, linkAddr: ScAddr) -> ScLinkContent:
+    if self.content_cache:
+      return self.content_cache.GetLinkContent(self.ctx, linkAddr)
+
+    return self.ctx.GetLinkContent(linkAddr)
+
+  def setLinkContent(self, linkAddr: ScAddr, value: any) -> bool:
+    if self.content_cache:
+      return self.content_cache.SetLinkContent(self.ctx, linkAddr, value)
+
+    return self.ctx.SetLinkContent(linkAddr, value)
 
   def kbGetBinaryRelationLinkAddr(self, _addr: ScAddr, _relAddr: ScAddr) -> ScAddr:
     """Find ScLink connected to `_addr` by relation `_relAddr`.
@@ -36,10 +54,10 @@ class ScHelper:
 
     # generate new relation if not found
     if linkAddr:
-      self.ctx.SetLinkContent(linkAddr, _value)
+      self.setLinkContent(linkAddr, _value)
     else:
       linkAddr = self.ctx.CreateLink()
-      self.ctx.SetLinkContent(linkAddr, _value)
+      self.setLinkContent(linkAddr, _value)
 
       edge = self.ctx.CreateEdge(ScType.EdgeDCommonConst, _addr, linkAddr)
       self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, _relAddr, edge)
@@ -53,7 +71,7 @@ class ScHelper:
     """  
     linkAddr = self.kbGetBinaryRelationLinkAddr(_addr, _relAddr)
     if linkAddr:
-      return self.ctx.GetLinkContent(linkAddr)
+      return self.getLinkContent(linkAddr)
 
     return None
 
@@ -94,6 +112,74 @@ class ScHelper:
         ...
     
     If value with a specified `rel_addr` doesn't exist, then it would be created. If value exists,
-    then this function will change content of sc-link.
+    then this function will change content of sc-link. Content is changed just for sc-link, that
+    is owned by structure (there are no other incoming arcs to it), otherwise new sc-link is created
+    and old one is just excluded from structure.
+
+    Existing values are found by one scan of structure. All new elements are created
+    by one `CreateElementsBatch` call.
+    """
+    values = collections.OrderedDict()
+    for relAddr, value in _values:
+      values[relAddr] = value
+
+    # relation -> list of (edge, value) for existing values
+    existing = collections.defaultdict(list)
+    it = self.ctx.Iterator5(
+        _addr,
+        ScType.EdgeAccessConstPosPerm,
+        ScType.Unknown,
+        ScType.EdgeAccessConstPosPerm,
+        ScType.Unknown)
+    for _, edge, trg, _, relAddr in it:
+      if relAddr in values:
+        existing[relAddr].append((edge, trg))
+
+    spec = []
+    for relAddr, value in values.items():
+      current = existing.get(relAddr, [])
+
+      if isinstance(value, ScAddr):
+        if any(trg == value for _, trg in current):
+          current = [(edge, trg) for edge, trg in current if trg != value]
+          self.__removeValues(current)
+          continue
+
+        self.__removeValues(current)
+        spec.append(('edge', ScType.EdgeAccessConstPosPerm, _addr, value))
+      else:
+        link = next((trg for edge, trg in current if self.__isOwnedLink(edge, trg)), None)
+        if link is not None:
+          self.__removeValues([(edge, trg) for edge, trg in current if trg != link])
+          self.setLinkContent(link, value)
+          continue
+
+        self.__removeValues(current)
+        spec.append(('link', ScType.LinkConst, value))
+        spec.append(('edge', ScType.EdgeAccessConstPosPerm, _addr, len(spec) - 1))
+
+      spec.append(('edge', ScType.EdgeAccessConstPosPerm, relAddr, len(spec) - 1))
+
+    if len(spec) > 0:
+      self.ctx.CreateElementsBatch(spec)
+
+  def __removeValues(self, values):
+    """Removes values of structure. Links, that owned by structure, are removed
+    with edges, for other elements just edges are removed
     """
-  pass
+    for edge, trg in values:
+      if self.__isOwnedLink(edge, trg):
+        self.ctx.DeleteElement(trg)
+      else:
+        self.ctx.DeleteElement(edge)
+
+  def __isOwnedLink(self, edge, trg) -> bool:
+    """Link is owned by structure, if `edge` from structure is the only incoming arc of it"""
+    if not self.ctx.GetElementType(trg).IsLink():
+      return False
+
+    for _, in_edge, _ in self.ctx.Iterator3(ScType.Unknown, ScType.Unknown, trg):
+      if in_edge != edge:
+        return False
+
+    return True
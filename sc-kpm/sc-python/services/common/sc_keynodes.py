@@ -1,21 +1,157 @@
 from sc import *
 
+import collections
+import threading
+import time
+
+
+class ScKeynodesCache:
+  """Process-wide cache of keynodes. It stores found keynodes and a bounded
+  number of system identifiers, that weren't found (negative cache).
+  Not found identifiers are stored for `missed_ttl` seconds.
+
+  Whole cache is cleared, when version of system identifiers in sc-memory changes.
+  Version changes immediately on any `HelperSetSystemIdtf` call (from Python, C++
+  or C code) and soon after deletion of element with system identifier.
+
+  This class is thread safe
+  """
+
+  def __init__(self, max_missed=1024, missed_ttl=10.0):
+    self.max_missed = max_missed
+    self.missed_ttl = missed_ttl
+
+    self.__lock = threading.Lock()
+    self.__found = {}
+    self.__missed = collections.OrderedDict()
+    # increments on each invalidation, to skip storing of outdated results
+    self.__generation = 0
+    # version of system identifiers in sc-memory, that cached values correspond to
+    self.__version = None
+
+    # statistics
+    self.hits = 0
+    self.negative_hits = 0
+    self.misses = 0
+
+  def Get(self, ctx: ScMemoryContext, sys_idtf: str, el_type: ScType = None) -> ScAddr:
+    return self.GetMany(ctx, [sys_idtf], el_type)[0]
+
+  def GetMany(self, ctx: ScMemoryContext, sys_idtfs: [str], el_type: ScType = None) -> [ScAddr]:
+    """Returns list of ScAddr for specified system identifiers. All identifiers,
+    that are not cached, are resolved by one call to sc-memory.
+    If `el_type` is not None, then not existing elements will be created with this type
+    """
+    result = [None] * len(sys_idtfs)
+    request = []
+
+    now = time.monotonic()
+    version = ctx.HelperGetSystemIdtfsVersion()
+    with self.__lock:
+      self.__checkVersion(version)
+      generation = self.__generation
+      for idx, idtf in enumerate(sys_idtfs):
+        addr = self.__found.get(idtf)
+        if addr is not None:
+          self.hits += 1
+          result[idx] = addr
+        elif el_type is None and self.__isMissed(idtf, now):
+          self.negative_hits += 1
+          result[idx] = ScAddr()
+        else:
+          self.misses += 1
+          request.append(idx)
+
+    if len(request) == 0:
+      return result
+
+    addrs = ctx.HelperResolveSystemIdtfs([sys_idtfs[idx] for idx in request], el_type)
+
+    version = ctx.HelperGetSystemIdtfsVersion()
+    with self.__lock:
+      self.__checkVersion(version)
+      is_actual = (generation == self.__generation)
+      for idx, addr in zip(request, addrs):
+        result[idx] = addr
+        if not is_actual:
+          continue
+
+        idtf = sys_idtfs[idx]
+        if addr.IsValid():
+          self.__missed.pop(idtf, None)
+          self.__found[idtf] = addr
+        else:
+          self.__addMissed(idtf, now)
+
+    return result
+
+  def Invalidate(self, sys_idtf: str = None):
+    """Removes cached value for specified system identifier.
+    If `sys_idtf` is None, then whole cache will be cleared
+    """
+    with self.__lock:
+      self.__generation += 1
+      if sys_idtf is None:
+        self.__found.clear()
+        self.__missed.clear()
+      else:
+        self.__found.pop(sys_idtf, None)
+        self.__missed.pop(sys_idtf, None)
+
+  def Stats(self) -> dict:
+    with self.__lock:
+      return {
+          'hits': self.hits,
+          'negative_hits': self.negative_hits,
+          'misses': self.misses,
+          'found': len(self.__found),
+          'missed': len(self.__missed)
+      }
+
+  # --- internal functions (should be called under lock) ---
+  def __checkVersion(self, version):
+    if version == self.__version:
+      return
+
+    self.__version = version
+    self.__generation += 1
+    self.__found.clear()
+    self.__missed.clear()
+
+  def __isMissed(self, sys_idtf, now):
+    time_added = self.__missed.get(sys_idtf)
+    if time_added is None:
+      return False
+
+    if now - time_added > self.missed_ttl:
+      del self.__missed[sys_idtf]
+      return False
+
+    return True
+
+  def __addMissed(self, sys_idtf, now):
+    self.__missed.pop(sys_idtf, None)
+    self.__missed[sys_idtf] = now
+    while len(self.__missed) > self.max_missed:
+      self.__missed.popitem(last=False)
+
 
 class ScKeynodes:
 
+  # keynodes cache shared between all instances
+  cache = ScKeynodesCache()
+
   def __init__(self, context):
     self.context = context
-    self.resolved = {}
 
   def __getitem__(self, sys_idtf):
-    if sys_idtf in self.resolved:
-      return self.resolved[sys_idtf]
-
-    addr = self.context.HelperResolveSystemIdtf(sys_idtf, ScType.Unknown)
-    if addr:
-      self.resolved[sys_idtf] = addr
+    return ScKeynodes.cache.Get(self.context, sys_idtf)
 
-    return addr
+  def Resolve(self, sys_idtfs: [str]) -> [ScAddr]:
+    """Returns list of ScAddr for specified list of system identifiers.
+    All not cached keynodes are resolved by one call to sc-memory
+    """
+    return ScKeynodes.cache.GetMany(self.context, sys_idtfs)
 
   @staticmethod
   def GetResultCodeAddr(res: ScResult) -> ScAddr:
@@ -0,0 +1,161 @@
+from sc import *
+from scb import ScPythonEventType
+
+import collections
+import threading
+
+
+class ScLinkContentCache:
+  """LRU cache of sc-link contents. Cache is bounded by total size of cached
+  contents in bytes. Item is removed, when content of sc-link changes or
+  sc-link is deleted (events are processed by module thread, so content changed
+  by another thread can be returned until event is emitted).
+
+  Returned `ScLinkContent` objects are shared, so don't change them.
+
+  This class is thread safe
+  """
+
+  def __init__(self, subscriptions, max_bytes=16 * 1024 * 1024):
+    """
+    subscriptions - ScEventSubscriptions, that used to watch sc-links
+    max_bytes - maximum total size of cached contents
+    """
+    self.subscriptions = subscriptions
+    self.max_bytes = max_bytes
+
+    self.__lock = threading.Lock()
+    # addr hash -> (content, size in bytes)
+    self.__items = collections.OrderedDict()
+    # addr hash -> (token, ids of event subscribers)
+    self.__watched = {}
+    self.__bytes = 0
+
+    # statistics
+    self.hits = 0
+    self.misses = 0
+    self.invalidations = 0
+    self.evictions = 0
+
+  def GetLinkContent(self, ctx: ScMemoryContext, addr: ScAddr) -> ScLinkContent:
+    """Returns content of sc-link, like `ctx.GetLinkContent`. If it isn't cached,
+    then content is read from memory and stored in cache
+    """
+    key = addr.ToInt()
+    with self.__lock:
+      item = self.__items.get(key)
+      if item is not None:
+        self.__items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+      self.misses += 1
+
+    # subscribe before reading, so changes made during reading aren't lost
+    token = self.__watch(addr)
+    content = ctx.GetLinkContent(addr)
+    if content is None or token is None:
+      self.__remove(key)
+      return content
+
+    size = len(content.AsBinary())
+    if size > self.max_bytes:
+      self.__remove(key)
+    else:
+      self.__put(key, content, size, token)
+
+    return content
+
+  def SetLinkContent(self, ctx: ScMemoryContext, addr: ScAddr, value) -> bool:
+    """Sets content of sc-link with `ctx.SetLinkContent` and removes it from cache"""
+    result = ctx.SetLinkContent(addr, value)
+    self.Invalidate(addr)
+    return result
+
+  def Invalidate(self, addr: ScAddr = None):
+    """Removes content of specified sc-link from cache. If `addr` is None,
+    then whole cache will be cleared
+    """
+    if addr is not None:
+      self.__remove(addr.ToInt())
+      return
+
+    with self.__lock:
+      keys = list(self.__watched.keys())
+
+    for key in keys:
+      self.__remove(key)
+
+  def Stats(self) -> dict:
+    with self.__lock:
+      requests = self.hits + self.misses
+      return {
+          'size': len(self.__items),
+          'bytes': self.__bytes,
+          'max_bytes': self.max_bytes,
+          'hits': self.hits,
+          'misses': self.misses,
+          'invalidations': self.invalidations,
+          'evictions': self.evictions,
+          'hit_rate': (self.hits / requests) if requests > 0 else 0.0
+      }
+
+  def onChanged(self, sid, evt):
+    with self.__lock:
+      self.invalidations += 1
+    self.__remove(evt.addr.ToInt())
+
+  # --- internal functions ---
+  def __watch(self, addr):
+    """Returns token, that should be passed to `__put`. Returns None, if sc-link
+    can't be watched
+    """
+    key = addr.ToInt()
+    with self.__lock:
+      watched = self.__watched.get(key)
+      if watched is not None:
+        return watched[0]
+
+      token = object()
+      sids = [
+          self.subscriptions.Subscribe(addr, ScPythonEventType.ContentChanged, self.onChanged),
+          self.subscriptions.Subscribe(addr, ScPythonEventType.EraseElement, self.onChanged)
+      ]
+      self.__watched[key] = (token, sids)
+
+      return token if 0 not in sids else None
+
+  def __put(self, key, content, size, token):
+    """Stores content, if sc-link wasn't changed since `__watch` call"""
+    evicted = []
+    with self.__lock:
+      watched = self.__watched.get(key)
+      if watched is None or watched[0] is not token:
+        return
+
+      old = self.__items.pop(key, None)
+      if old is not None:
+        self.__bytes -= old[1]
+
+      self.__items[key] = (content, size)
+      self.__bytes += size
+
+      while self.__bytes > self.max_bytes:
+        old_key, (_, old_size) = self.__items.popitem(last=False)
+        self.__bytes -= old_size
+        self.evictions += 1
+        evicted.append(old_key)
+
+    for old_key in evicted:
+      self.__remove(old_key)
+
+  def __remove(self, key):
+    with self.__lock:
+      item = self.__items.pop(key, None)
+      if item is not None:
+        self.__bytes -= item[1]
+      _, sids = self.__watched.pop(key, (None, []))
+
+    for sid in sids:
+      if sid != 0:
+        self.subscriptions.Unsubscribe(sid)
@@ -35,7 +35,23 @@ class ScModule:
   def events(self) -> ScEventManager:
     return self.__events
 
-  def __init__(self, ctx, cpp_bridge, keynodes=[]):
+  # legacy period of `OnUpdate` calls
+  DEFAULT_UPDATE_PERIOD = 0.01
+
+  def __init__(self, ctx, cpp_bridge, keynodes=[], update_period=None, max_tasks_batch=64,
+               event_batch_size=0, event_batch_latency=0.001, event_queue_size=65536):
+    """
+    update_period - period of `OnUpdate` calls in seconds. By default it's called
+      each 0.01 seconds if `OnUpdate` was overloaded, otherwise it isn't called at all.
+      Use 0 to disable `OnUpdate` calls
+    max_tasks_batch - maximum number of queued tasks, that processed between `OnUpdate` calls
+    event_batch_size - maximum number of sc-events, that C++ bridge passes to module by one call.
+      By default (0) each event is passed separately
+    event_batch_latency - maximum time (in seconds), that sc-event can wait in C++ bridge
+      for other events to make a batch
+    event_queue_size - maximum number of sc-events, that wait for a batch in C++ bridge.
+      When queue is full, the oldest events are dropped
+    """
     self.__sc_context = ctx
     self.keynodes = ScKeynodes(self.__sc_context)
 
@@ -49,9 +65,22 @@ class ScModule:
     self.task_queue = queue.Queue()
     self.log = Log(self.__class__.__name__)
 
+    if update_period is None:
+      is_overloaded = type(self).OnUpdate is not ScModule.OnUpdate
+      update_period = ScModule.DEFAULT_UPDATE_PERIOD if is_overloaded else 0
+    self.update_period = update_period
+    self.max_tasks_batch = max_tasks_batch
+    self.event_batch_size = event_batch_size
+    self.event_batch_latency = event_batch_latency
+    self.event_queue_size = event_queue_size
+
+    # counters of main loop
+    self.processed_tasks = 0
+    self.emitted_events = 0
+
   def KeynodesCheck(self, keynodes_list):
-    for idtf in keynodes_list:
-      addr = self.keynodes[idtf]
+    addrs = self.keynodes.Resolve(keynodes_list)
+    for idtf, addr in zip(keynodes_list, addrs):
       if not addr:
         raise ScKeynodeException(idtf)
 
@@ -63,10 +92,18 @@ class ScModule:
     params = ScEventParams(eid, addr, edge_addr, other_addr)
     self.CallLater(self.DoEmitEvent, params)
 
+  def HandleOnEventBatch(self, batch):
+    self.CallLater(self.DoEmitEventBatch, batch)
+
   # --- tasks ---
   def DoEmitEvent(self, evt_params):
+    self.emitted_events += 1
     self.__events.EmitEvent(evt_params)
 
+  def DoEmitEventBatch(self, batch):
+    self.emitted_events += len(batch)
+    self.__events.EmitEventBatch(batch)
+
   def CallLater(self, func, *args):
     self.task_queue.put(Task(func, *args))
 
@@ -85,11 +122,16 @@ class ScModule:
 
   def Stop(self):
     self.is_running = False
+    # wake up main loop, that waits for tasks
+    self.CallLater(lambda: None)
 
   # --- common state functions ---
   def Initialize(self):
     self.cpp.onClose = self.HandleOnClose
     self.cpp.onEvent = self.HandleOnEvent
+    self.cpp.onEventBatch = self.HandleOnEventBatch
+    self.cpp.SetEventBatching(self.event_batch_size, int(self.event_batch_latency * 1000000),
+                              self.event_queue_size)
     # notify c++ code that bridge is ready for work
     self.cpp.Ready()
 
@@ -99,25 +141,65 @@ class ScModule:
     self.OnShutdown()
     self.cpp.onClose = None
     self.cpp.onEvent = None
+    self.cpp.onEventBatch = None
     self.cpp.Finish()
 
-  def EmitEvents(self):
+  def EmitEvents(self, timeout=0.01):
+    """Waits `timeout` seconds (forever if it's `None`) for a task, then processes it
+    and all other already queued tasks (not more than `max_tasks_batch`).
+    Returns number of processed tasks
+    """
     try:
-      task = self.task_queue.get(block=True, timeout=0.01)
-      task.do()
+      task = self.task_queue.get(block=True, timeout=timeout)
     except queue.Empty:
-      pass
+      return 0
+
+    task.do()
+    processed = 1
+    while processed < self.max_tasks_batch:
+      try:
+        task = self.task_queue.get_nowait()
+      except queue.Empty:
+        break
+
+      task.do()
+      processed += 1
+
+    self.processed_tasks += processed
+    return processed
 
   def Run(self):
     if self.cpp:
       # wait until cpp bridge will be initialized
       self.Initialize()
+
+      next_update = None
+      if self.update_period > 0:
+        next_update = time.monotonic() + self.update_period
+
       while self.is_running:
-        self.EmitEvents()
-        self.OnUpdate()
+        # sleep until new task or next update
+        timeout = None
+        if next_update is not None:
+          timeout = max(0.0, next_update - time.monotonic())
+
+        self.EmitEvents(timeout)
+
+        if next_update is not None and time.monotonic() >= next_update:
+          self.OnUpdate()
+          next_update = time.monotonic() + self.update_period
 
       self.Shutdown()
 
+  def Stats(self) -> dict:
+    """Returns counters of main loop. Can be called from any thread"""
+    return {
+        'queued_tasks': self.task_queue.qsize(),
+        'processed_tasks': self.processed_tasks,
+        'emitted_events': self.emitted_events,
+        'dropped_events': self.cpp.DroppedEvents()
+    }
+
   # Set of usefull functions
   @staticmethod
   def GetDataByUrl(url):
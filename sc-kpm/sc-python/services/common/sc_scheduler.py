@@ -0,0 +1,253 @@
+from enum import Enum
+
+from common.sc_context_pool import ScMemoryContextPool
+
+import collections
+import threading
+import time
+import traceback
+
+
+class ScOverflowPolicy(Enum):
+  """What to do with a new event, when queue of agent is full"""
+  # new event is dropped
+  Drop = 0
+  # caller waits until there is a free place in queue. Caller is a module
+  # main loop, so all other events of module wait too
+  Block = 1
+  # new event replaces queued event for the same element,
+  # if there are no such event, then the oldest queued event is dropped
+  Coalesce = 2
+
+
+class ScAgentSettings:
+
+  def __init__(self, max_concurrency=1, queue_length=1024, overflow=ScOverflowPolicy.Drop, ordered=False):
+    """
+    max_concurrency - maximum number of events of agent, that processed at the same time
+    queue_length - maximum number of events, that wait processing
+    overflow - ScOverflowPolicy value
+    ordered - if it's True, then events for the same element (`other_addr` of event)
+      are processed one by one in emit order
+    """
+    self.max_concurrency = max_concurrency
+    self.queue_length = queue_length
+    self.overflow = overflow
+    self.ordered = ordered
+
+
+class _AgentQueue:
+
+  def __init__(self, agent, settings):
+    self.agent = agent
+    self.settings = settings
+    # items: [key, event, submit time]
+    self.events = collections.deque()
+    self.running = 0
+    self.running_keys = collections.Counter()
+
+    # counters
+    self.submitted = 0
+    self.processed = 0
+    self.dropped = 0
+    self.coalesced = 0
+    self.errors = 0
+    self.max_depth = 0
+    self.wait_time = 0.0
+    self.max_wait_time = 0.0
+    self.run_time = 0.0
+
+  def TakeNext(self):
+    if self.running >= self.settings.max_concurrency:
+      return None
+
+    for idx, item in enumerate(self.events):
+      if self.settings.ordered and self.running_keys[item[0]] > 0:
+        continue
+
+      del self.events[idx]
+      self.running += 1
+      self.running_keys[item[0]] += 1
+      return item
+
+    return None
+
+  def Stats(self):
+    finished = max(self.processed, 1)
+    return {
+        'queued': len(self.events),
+        'max_queued': self.max_depth,
+        'running': self.running,
+        'submitted': self.submitted,
+        'processed': self.processed,
+        'dropped': self.dropped,
+        'coalesced': self.coalesced,
+        'errors': self.errors,
+        'avg_wait_time': self.wait_time / finished,
+        'max_wait_time': self.max_wait_time,
+        'avg_run_time': self.run_time / finished
+    }
+
+
+class ScAgentScheduler:
+  """Runs agents in a pool of worker threads. Each worker has its own
+  memory context, that is available for agent as `ScAgent.ctx`.
+  Use `ScAgent.RunIn` to process events of agent by scheduler.
+
+  This class is thread safe
+  """
+
+  __local = threading.local()
+
+  def __init__(self, workers=4, name='ScAgentScheduler'):
+    self.__cond = threading.Condition()
+    self.__queues = collections.OrderedDict()
+    self.__running = True
+    self.__ctx_pool = ScMemoryContextPool(name, max_size=workers)
+
+    self.__workers = []
+    for i in range(workers):
+      worker = threading.Thread(target=self.__workerLoop, name='{}_{}'.format(name, i), daemon=True)
+      worker.start()
+      self.__workers.append(worker)
+
+  @staticmethod
+  def Context():
+    """Returns memory context of current worker thread. If it's called
+    not from a worker thread, then returns None
+    """
+    return getattr(ScAgentScheduler.__local, 'ctx', None)
+
+  def Add(self, agent, settings=None):
+    with self.__cond:
+      self.__queues[id(agent)] = _AgentQueue(agent, settings if settings else ScAgentSettings())
+
+  def Remove(self, agent):
+    """Removes agent from scheduler. All queued events of agent are dropped"""
+    with self.__cond:
+      queue = self.__queues.pop(id(agent), None)
+      if queue:
+        queue.dropped += len(queue.events)
+        queue.events.clear()
+      self.__cond.notify_all()
+
+  def Submit(self, agent, evt) -> bool:
+    """Adds event to queue of agent. Returns False, if event was dropped"""
+    with self.__cond:
+      queue = self.__queues.get(id(agent))
+      if queue is None or not self.__running:
+        return False
+
+      key = evt.other_addr.ToInt()
+      queue.submitted += 1
+      settings = queue.settings
+
+      if len(queue.events) >= settings.queue_length:
+        if settings.overflow == ScOverflowPolicy.Drop:
+          queue.dropped += 1
+          return False
+
+        if settings.overflow == ScOverflowPolicy.Coalesce:
+          for item in queue.events:
+            if item[0] == key:
+              item[1] = evt
+              queue.coalesced += 1
+              return True
+
+          queue.events.popleft()
+          queue.dropped += 1
+
+        elif settings.overflow == ScOverflowPolicy.Block:
+          while len(queue.events) >= settings.queue_length and self.__running and id(agent) in self.__queues:
+            self.__cond.wait()
+
+          if not self.__running or id(agent) not in self.__queues:
+            queue.dropped += 1
+            return False
+
+      queue.events.append([key, evt, time.monotonic()])
+      queue.max_depth = max(queue.max_depth, len(queue.events))
+      self.__cond.notify_all()
+
+    return True
+
+  def Stats(self, agent=None) -> dict:
+    """Returns statistics of specified agent. If agent isn't specified, then returns
+    dictionary with statistics of all agents, where key is a name of agent class
+    """
+    with self.__cond:
+      if agent is not None:
+        queue = self.__queues.get(id(agent))
+        return queue.Stats() if queue else None
+
+      result = {}
+      for queue in self.__queues.values():
+        name = queue.agent.__class__.__name__
+        if name in result:
+          name = '{}_{}'.format(name, id(queue.agent))
+        result[name] = queue.Stats()
+
+      return result
+
+  def Shutdown(self, wait=True):
+    """Stops workers. Already queued events are processed before stop"""
+    with self.__cond:
+      self.__running = False
+      self.__cond.notify_all()
+
+    if wait:
+      for worker in self.__workers:
+        worker.join()
+
+  def __takeNext(self):
+    for queue in self.__queues.values():
+      item = queue.TakeNext()
+      if item:
+        # move agent to the end, to process agents in round-robin order
+        self.__queues.move_to_end(id(queue.agent))
+        return queue, item
+
+    return None
+
+  def __workerLoop(self):
+    ctx = self.__ctx_pool.Acquire()
+    ScAgentScheduler.__local.ctx = ctx
+
+    while True:
+      with self.__cond:
+        task = self.__takeNext()
+        while task is None and self.__running:
+          self.__cond.wait()
+          task = self.__takeNext()
+
+        if task is None:
+          break
+
+      queue, (key, evt, submit_time) = task
+      start_time = time.monotonic()
+      is_error = False
+      try:
+        queue.agent._run(evt)
+      except Exception:
+        is_error = True
+        traceback.print_exc()
+
+      with self.__cond:
+        finish_time = time.monotonic()
+        queue.running -= 1
+        queue.running_keys[key] -= 1
+        if queue.running_keys[key] == 0:
+          del queue.running_keys[key]
+
+        queue.processed += 1
+        if is_error:
+          queue.errors += 1
+        wait_time = start_time - submit_time
+        queue.wait_time += wait_time
+        queue.max_wait_time = max(queue.max_wait_time, wait_time)
+        queue.run_time += finish_time - start_time
+
+        self.__cond.notify_all()
+
+    ScAgentScheduler.__local.ctx = None
+    self.__ctx_pool.Release(ctx)
@@ -1,18 +1,24 @@
+from common.sc_binary import ScAddrArray
 from sc import *
 
+import operator
 
-class Iterator:
-  def __init__(self, it):
-    self.iter = it
 
-  def __next__(self):
-    return self.next()
+def _packAddrs(elAddrs):
+  """Returns value, that can be passed to native set functions"""
+  if isinstance(elAddrs, ScAddrArray):
+    return elAddrs.data
 
-  def next(self):
-    if self.iter.Next():
-      return self.iter.Get(2)
+  return elAddrs
 
-    raise StopIteration
+
+def _setsOperation(operation, sets, target):
+  """Runs native operation over sets. Result is added into target set, if it's specified"""
+  result = operation([_set.Spec() for _set in sets])
+  if target is not None:
+    target.AddMany(result)
+
+  return result
 
 
 class ScSet:
@@ -58,13 +64,62 @@ class ScSet:
   def Clear(self):
     """Remove all elements from a set
     """
-    it = self.ctx.Iterator3(
-        self.addr,
-        ScType.EdgeAccessConstPosPerm,
-        ScType.Unknown)
+    self.RemoveMany(self.ToArray())
 
-    while it.Next():
-      self.ctx.DeleteElement(it.Get(1))
+  def HasMany(self, elAddrs) -> memoryview:
+    """Check which of specified elements exist in set. Elements can be specified
+    by list of ScAddr (or int values), ScAddrArray or buffer of uint64 values.
+    Returns bool array with the same length
+    """
+    return self.ctx.HelperSetHasMany(self.addr, ScAddr(), _packAddrs(elAddrs))
+
+  def AddMany(self, elAddrs) -> memoryview:
+    """Add elements into set by one native call. Returns bool array,
+    where True means that element was added
+    """
+    return self.ctx.HelperSetAddMany(self.addr, ScAddr(), _packAddrs(elAddrs))
+
+  def RemoveMany(self, elAddrs) -> memoryview:
+    """Remove elements from a set by one native call. Returns bool array,
+    where True means that element was removed
+    """
+    return self.ctx.HelperSetRemoveMany(self.addr, ScAddr(), _packAddrs(elAddrs))
+
+  def Size(self) -> int:
+    """Returns number of elements in set
+    """
+    return self.ctx.HelperSetSize(self.addr, ScAddr())
+
+  def ToArray(self) -> memoryview:
+    """Returns hashes of all elements as a uint64 array
+    """
+    return self.ctx.HelperSetMembers(self.addr, ScAddr())
+
+  def ToList(self) -> list:
+    """Returns list of ScAddr of all elements
+    """
+    return [ScAddrFromHash(value) for value in self.ToArray()]
+
+  def Spec(self) -> tuple:
+    """Returns description of set for native functions: (addr, relAddr)
+    """
+    return (self.addr, ScAddr())
+
+  def Union(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this or any of other sets.
+    If target set is specified, then result is added into it
+    """
+    return _setsOperation(self.ctx.HelperSetsUnion, (self,) + others, target)
+
+  def Intersect(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this and all other sets
+    """
+    return _setsOperation(self.ctx.HelperSetsIntersect, (self,) + others, target)
+
+  def Difference(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this set and don't exist in other sets
+    """
+    return _setsOperation(self.ctx.HelperSetsDifference, (self,) + others, target)
 
   def __iter__(self):
     """Create iterator for iterate all elements of set
@@ -77,7 +132,8 @@ class ScSet:
         ScType.EdgeAccessConstPosPerm,
         ScType.Unknown)
 
-    return Iterator(it)
+    # elements are taken from chunks without python frame per element
+    return map(operator.itemgetter(2), it)
 
 
 # ---------------------------------------
@@ -144,15 +200,62 @@ class ScRelationSet:
   def Clear(self):
     """Remove all elements from a set
     """
-    it = self.ctx.Iterator5(
-        self.addr,
-        ScType.EdgeDCommonConst,
-        ScType.Unknown,
-        ScType.EdgeAccessConstPosPerm,
-        self.relAddr)
+    self.RemoveMany(self.ToArray())
 
-    while it.Next():
-      self.ctx.DeleteElement(it.Get(1))
+  def HasMany(self, elAddrs) -> memoryview:
+    """Check which of specified elements exist in set. Elements can be specified
+    by list of ScAddr (or int values), ScAddrArray or buffer of uint64 values.
+    Returns bool array with the same length
+    """
+    return self.ctx.HelperSetHasMany(self.addr, self.relAddr, _packAddrs(elAddrs))
+
+  def AddMany(self, elAddrs) -> memoryview:
+    """Add elements into set by one native call. Returns bool array,
+    where True means that element was added
+    """
+    return self.ctx.HelperSetAddMany(self.addr, self.relAddr, _packAddrs(elAddrs))
+
+  def RemoveMany(self, elAddrs) -> memoryview:
+    """Remove elements from a set by one native call. Returns bool array,
+    where True means that element was removed
+    """
+    return self.ctx.HelperSetRemoveMany(self.addr, self.relAddr, _packAddrs(elAddrs))
+
+  def Size(self) -> int:
+    """Returns number of elements in set
+    """
+    return self.ctx.HelperSetSize(self.addr, self.relAddr)
+
+  def ToArray(self) -> memoryview:
+    """Returns hashes of all elements as a uint64 array
+    """
+    return self.ctx.HelperSetMembers(self.addr, self.relAddr)
+
+  def ToList(self) -> list:
+    """Returns list of ScAddr of all elements
+    """
+    return [ScAddrFromHash(value) for value in self.ToArray()]
+
+  def Spec(self) -> tuple:
+    """Returns description of set for native functions: (addr, relAddr)
+    """
+    return (self.addr, self.relAddr)
+
+  def Union(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this or any of other sets.
+    If target set is specified, then result is added into it
+    """
+    return _setsOperation(self.ctx.HelperSetsUnion, (self,) + others, target)
+
+  def Intersect(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this and all other sets
+    """
+    return _setsOperation(self.ctx.HelperSetsIntersect, (self,) + others, target)
+
+  def Difference(self, *others, target=None) -> memoryview:
+    """Returns sorted uint64 array of elements, that exist in this set and don't exist in other sets
+    """
+    return _setsOperation(self.ctx.HelperSetsDifference, (self,) + others, target)
 
   def __iter__(self):
     """Create iterator for iterate all elements of set
@@ -167,4 +270,5 @@ class ScRelationSet:
         ScType.EdgeAccessConstPosPerm,
         self.relAddr)
 
-    return Iterator(it)
+    # elements are taken from chunks without python frame per element
+    return map(operator.itemgetter(2), it)
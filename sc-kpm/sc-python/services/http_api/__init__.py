@@ -1 +1 @@
-__all__ = ['ws_sc_json']
\ No newline at end of file
+__all__ = ['content_range', 'ws_sc_json']
\ No newline at end of file
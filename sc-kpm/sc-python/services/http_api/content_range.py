@@ -0,0 +1,39 @@
+"""Parsing of Range header for content requests
+"""
+import re
+
+range_re = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# result of `parseRange` for Range header, that should be ignored
+ignore_range = 'ignore'
+
+
+def parseRange(value, size):
+  """Returns range [start, end) or None, if range can't be satisfied.
+  Invalid and multiple ranges aren't supported, so `ignore_range` is returned
+  for them and whole content should be sent
+  """
+  match = range_re.match(value.strip())
+  if match is None:
+    return ignore_range
+
+  first, last = match.group(1), match.group(2)
+  if not first and not last:
+    return ignore_range
+
+  if not first:
+    # suffix range: last N bytes
+    length = int(last)
+    if length == 0:
+      return None
+    return max(size - length, 0), size
+
+  start = int(first)
+  # last byte position less than first one makes range syntactically invalid
+  if last and int(last) < start:
+    return ignore_range
+
+  if start >= size:
+    return None
+
+  return start, min(int(last) + 1, size) if last else size
@@ -1,19 +1,32 @@
 """This module implements http API for SmartHome
 """
 import asyncio
+import collections
+import hashlib
 import os
 import threading
 import tornado
 
-from ws_sc_json import ScJsonSocketHandler
-from common import ScModule
+from concurrent.futures import ThreadPoolExecutor
+from tornado import gen
+
+from content_range import ignore_range, parseRange
+from ws_sc_json import EventOverflow, ScJsonSocketHandler, TemplateCache, eventQueuesStats, getEventSubscriptions, \
+    requestMetrics
+from common import ScLinkContentCache, ScMemoryContextPool, ScModule
 from keynodes import Keynodes
 
 from sc import *
+from scb import ScPythonEventType
 
 self_path = os.path.dirname(__file__)
 
 
+def getConfigInt(group, key, default):
+  value = getScConfigValue(group, key)
+  return int(value) if value else default
+
+
 class DebugStaticFileHandler(tornado.web.StaticFileHandler):
   def set_extra_headers(self, path):
     # Disable cache
@@ -29,12 +42,206 @@ class MainHandler(tornado.web.RequestHandler):
                              "client/assets/templates/index.html"))
 
 
-class ContentHandler(tornado.web.RequestHandler):
+class ContentInfo:
+
+  def __init__(self, mime, etag, size):
+    self.mime = mime
+    self.etag = etag
+    self.size = size
+
+
+class ContentInfoCache:
+  """LRU cache of mime types and ETags of sc-links. Item is removed, when
+  content of sc-link changes, output edge of sc-link (so its `nrel_format`
+  relation) is added or removed, or sc-link is deleted.
+
+  This class is thread safe
+  """
+
+  def __init__(self, subscriptions, max_size=10000):
+    self.lock = threading.Lock()
+    self.subscriptions = subscriptions
+    self.max_size = max_size
+    # addr hash -> ContentInfo
+    self.items = collections.OrderedDict()
+    # addr hash -> (token, ids of event subscribers)
+    self.watched = {}
+
+    # counters
+    self.hits = 0
+    self.misses = 0
+    self.invalidations = 0
+
+  def Get(self, addr):
+    with self.lock:
+      info = self.items.get(addr.ToInt())
+      if info is None:
+        self.misses += 1
+        return None
+
+      self.items.move_to_end(addr.ToInt())
+      self.hits += 1
+      return info
+
+  def Watch(self, addr):
+    """Subscribes for changes of sc-link. It should be called before reading of
+    content info. Returns token, that should be passed to `Put`, or None, if
+    changes can't be watched, so content info shouldn't be cached
+    """
+    key = addr.ToInt()
+    with self.lock:
+      if key in self.watched:
+        return self.watched[key][0]
+
+      sids = [
+          self.subscriptions.Subscribe(addr, ScPythonEventType.ContentChanged, self.onChanged),
+          self.subscriptions.Subscribe(addr, ScPythonEventType.AddOutputEdge, self.onChanged),
+          self.subscriptions.Subscribe(addr, ScPythonEventType.RemoveOutputEdge, self.onChanged),
+          self.subscriptions.Subscribe(addr, ScPythonEventType.EraseElement, self.onChanged)
+      ]
+      if 0 in sids:
+        for sid in sids:
+          if sid != 0:
+            self.subscriptions.Unsubscribe(sid)
+        return None
+
+      token = object()
+      self.watched[key] = (token, sids)
+
+      return token
+
+  def Put(self, addr, info, token):
+    """Stores content info, if sc-link wasn't changed since `Watch` call"""
+    key = addr.ToInt()
+    evicted = []
+    with self.lock:
+      watched = self.watched.get(key)
+      if token is None or watched is None or watched[0] is not token:
+        return
+
+      self.items[key] = info
+      self.items.move_to_end(key)
+
+      while len(self.items) > self.max_size:
+        old_key, _ = self.items.popitem(last=False)
+        evicted.append(old_key)
+
+    for old_key in evicted:
+      self.remove(old_key)
+
+  def Unwatch(self, addr):
+    self.remove(addr.ToInt())
+
+  def Stats(self) -> dict:
+    with self.lock:
+      return {
+          'size': len(self.items),
+          'hits': self.hits,
+          'misses': self.misses,
+          'invalidations': self.invalidations
+      }
+
+  def onChanged(self, sid, evt):
+    with self.lock:
+      self.invalidations += 1
+    self.remove(evt.addr.ToInt())
+
+  def remove(self, key):
+    with self.lock:
+      self.items.pop(key, None)
+      _, sids = self.watched.pop(key, (None, []))
+
+    for sid in sids:
+      if sid != 0:
+        self.subscriptions.Unsubscribe(sid)
 
+
+class ContentHandler(tornado.web.RequestHandler):
+  """Sends content of sc-link by chunks. Supports single range requests
+  and conditional requests by ETag
+  """
+
+  ctx_pool = ScMemoryContextPool('ContentHandler')
+
+  def initialize(self, content_cache, chunk_size=64 * 1024, link_cache=None, executor=None):
+    """executor - `concurrent.futures.Executor`, that reads content info (ETag is a checksum
+    of the whole content). By default executor of IOLoop is used
+    """
+    self.content_cache = content_cache
+    self.chunk_size = chunk_size
+    self.link_cache = link_cache
+    self.executor = executor
+
+  @gen.coroutine
   def get(self, addr):
-    ctx = ScMemoryContext.Create('ContentHandler_{}'.format(addr))
     link_addr = ScAddr(int(addr))
-    # try to find mime and get content
+
+    ctx = ContentHandler.ctx_pool.Acquire()
+    try:
+      info = self.content_cache.Get(link_addr)
+      if info is None:
+        version = self.content_cache.Watch(link_addr)
+        info = yield tornado.ioloop.IOLoop.current().run_in_executor(
+            self.executor, self.readContentInfo, ctx, link_addr)
+        if info is None:
+          self.content_cache.Unwatch(link_addr)
+        else:
+          self.content_cache.Put(link_addr, info, version)
+
+      stream = ctx.GetLinkStream(link_addr) if info else None
+    finally:
+      ContentHandler.ctx_pool.Release(ctx)
+
+    if stream is None:
+      raise tornado.web.HTTPError(404)
+
+    self.set_header('Content-Type', info.mime)
+    self.set_header('ETag', info.etag)
+    self.set_header('Accept-Ranges', 'bytes')
+
+    if self.isNotModified(info.etag):
+      self.set_status(304)
+      self.finish()
+      return
+
+    size = stream.Size()
+    start, end = 0, size
+    range_header = self.request.headers.get('Range')
+    if range_header:
+      requested = parseRange(range_header, size)
+      if requested is None:
+        self.set_status(416)
+        self.set_header('Content-Range', 'bytes */{}'.format(size))
+        self.finish()
+        return
+
+      if requested is not ignore_range:
+        start, end = requested
+        self.set_status(206)
+        self.set_header('Content-Range', 'bytes {}-{}/{}'.format(start, end - 1, size))
+
+    self.set_header('Content-Length', end - start)
+    stream.Seek(start)
+
+    # next chunk is read, when previous one was sent
+    remaining = end - start
+    while remaining > 0:
+      chunk = stream.Read(min(self.chunk_size, remaining))
+      if len(chunk) == 0:
+        break
+
+      remaining -= len(chunk)
+      self.write(chunk)
+      yield self.flush()
+
+    self.finish()
+
+  def readContentInfo(self, ctx, link_addr):
+    stream = ctx.GetLinkStream(link_addr)
+    if stream is None:
+      return None
+
+    # try to find mime
     templ = ScTemplate()
 
     templ.TripleWithRelation(
@@ -42,26 +249,175 @@ class ContentHandler(tornado.web.RequestHandler):
         ScType.EdgeDCommonVar,
         ScType.NodeVar >> '_format',
         ScType.EdgeAccessVarPosPerm,
-        Keynodes.Get(Keynodes.NrelFormat))
+        Keynodes.Get(ctx, Keynodes.NrelFormat))
 
     templ.TripleWithRelation(
         '_format',
         ScType.EdgeDCommonVar,
         ScType.Link >> '_mime',
         ScType.EdgeAccessVarPosPerm,
-        Keynodes.Get(Keynodes.NrelMimeType))
+        Keynodes.Get(ctx, Keynodes.NrelMimeType))
 
     searchRes = ctx.HelperSearchTemplate(templ)
     mime = ''
     if searchRes.Size() > 0:
-      mime = ctx.GetLinkContent(searchRes[0]['_mime']).AsString()
+      mime_addr = searchRes[0]['_mime']
+      if self.link_cache:
+        mime = self.link_cache.GetLinkContent(ctx, mime_addr).AsString()
+      else:
+        mime = ctx.GetLinkContent(mime_addr).AsString()
 
-    data = ctx.GetLinkContent(link_addr)
-    bdata = data.AsBinary().tobytes()
+    checksum = hashlib.sha256()
+    chunk = stream.Read(self.chunk_size)
+    while len(chunk) > 0:
+      checksum.update(chunk)
+      chunk = stream.Read(self.chunk_size)
 
-    self.set_header('Content-Type', mime)
-    self.write(bdata)
-    self.finish()
+    return ContentInfo(mime, '"{}"'.format(checksum.hexdigest()), stream.Size())
+
+  def isNotModified(self, etag):
+    value = self.request.headers.get('If-None-Match')
+    if not value:
+      return False
+
+    tags = [tag.strip() for tag in value.split(',')]
+    return '*' in tags or etag in tags or 'W/' + etag in tags
+
+
+class IOLoopLagMonitor:
+  """Measures lag of IOLoop: timer is scheduled each `period` seconds and lag
+  is a difference between actual and scheduled time of its call
+  """
+
+  def __init__(self, ioloop, period=0.5):
+    self.ioloop = ioloop
+    self.period = period
+    self.expected = None
+    self.timeout = None
+
+    self.lag = 0.0
+    self.max_lag = 0.0
+
+  def Start(self):
+    self.expected = self.ioloop.time() + self.period
+    self.timeout = self.ioloop.call_at(self.expected, self.onTimer)
+
+  def Stop(self):
+    if self.timeout is not None:
+      self.ioloop.remove_timeout(self.timeout)
+      self.timeout = None
+
+  def Stats(self) -> dict:
+    return {
+        'lag': self.lag,
+        'max_lag': self.max_lag
+    }
+
+  def onTimer(self):
+    self.lag = max(0.0, self.ioloop.time() - self.expected)
+    self.max_lag = max(self.max_lag, self.lag)
+    self.Start()
+
+
+class MetricsWriter:
+  """Formats metrics in Prometheus text format"""
+
+  def __init__(self):
+    self.lines = []
+
+  def Add(self, name, metric_type, description, samples):
+    """samples - list of (labels dict, value) or just a value"""
+    if not isinstance(samples, list):
+      samples = [({}, samples)]
+
+    self.lines.append('# HELP {} {}'.format(name, description))
+    self.lines.append('# TYPE {} {}'.format(name, metric_type))
+    for labels, value in samples:
+      self.addSample(name, labels, value)
+
+  def AddHistograms(self, name, description, histograms):
+    """histograms - list of (labels dict, stats), where stats is an item of `RequestMetrics.Stats`"""
+    self.lines.append('# HELP {} {}'.format(name, description))
+    self.lines.append('# TYPE {} histogram'.format(name))
+    for labels, stats in histograms:
+      for bound, count in stats['buckets']:
+        self.addSample(name + '_bucket', dict(labels, le=self.formatValue(bound)), count)
+      self.addSample(name + '_sum', labels, stats['sum'])
+      self.addSample(name + '_count', labels, stats['count'])
+
+  def Text(self) -> str:
+    return '\n'.join(self.lines) + '\n'
+
+  def addSample(self, name, labels, value):
+    if len(labels) > 0:
+      name += '{' + ','.join('{}="{}"'.format(k, v) for k, v in sorted(labels.items())) + '}'
+    self.lines.append('{} {}'.format(name, self.formatValue(value)))
+
+  @staticmethod
+  def formatValue(value):
+    if value == float('inf'):
+      return '+Inf'
+    return repr(value)
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+  """Returns runtime metrics of HTTP module in Prometheus text format"""
+
+  def initialize(self, module, lag_monitor, caches=None):
+    """caches - name -> cache, that has `Stats` method (`hits`, `misses` and `size` are used)"""
+    self.module = module
+    self.lag_monitor = lag_monitor
+    self.caches = caches if caches else {}
+
+  def get(self):
+    writer = MetricsWriter()
+
+    requests = requestMetrics.Stats()
+    writer.Add('sc_ws_requests_total', 'counter', 'Number of processed websocket requests',
+               [({'type': t, 'status': 'ok'}, v['count'] - v['errors']) for t, v in sorted(requests.items())] +
+               [({'type': t, 'status': 'error'}, v['errors']) for t, v in sorted(requests.items())])
+    writer.AddHistograms('sc_ws_request_duration_seconds', 'Processing time of websocket requests',
+                         [({'type': t}, v) for t, v in sorted(requests.items())])
+
+    queues = eventQueuesStats()
+    writer.Add('sc_ws_connections', 'gauge', 'Number of open websockets', queues['clients'])
+    writer.Add('sc_ws_connections_total', 'counter', 'Number of opened websockets', requestMetrics.connections)
+
+    subscriptions = getEventSubscriptions(self.module.events).Stats()
+    writer.Add('sc_events_native', 'gauge', 'Number of native sc-event subscriptions', subscriptions['native_events'])
+    writer.Add('sc_events_subscribers', 'gauge', 'Number of sc-event subscribers', subscriptions['subscribers'])
+
+    # counters of closed websockets are lost, so all values are gauges
+    writer.Add('sc_ws_event_queue_size', 'gauge', 'Number of events in outbound queues', queues['queued'])
+    writer.Add('sc_ws_event_queue_max_size', 'gauge', 'Maximum size of outbound queue of open websockets',
+               queues['max_queued'])
+    writer.Add('sc_ws_events_dropped', 'gauge', 'Number of events dropped by open websockets', queues['dropped'])
+    writer.Add('sc_ws_events_coalesced', 'gauge', 'Number of events coalesced by open websockets', queues['coalesced'])
+    writer.Add('sc_ws_events_sent', 'gauge', 'Number of events sent to open websockets', queues['sent_events'])
+    writer.Add('sc_ws_event_frames_sent', 'gauge', 'Number of event frames sent to open websockets',
+               queues['sent_frames'])
+
+    lag = self.lag_monitor.Stats()
+    writer.Add('sc_ioloop_lag_seconds', 'gauge', 'The last measured lag of IOLoop', lag['lag'])
+    writer.Add('sc_ioloop_lag_max_seconds', 'gauge', 'Maximum measured lag of IOLoop', lag['max_lag'])
+
+    module = self.module.Stats()
+    writer.Add('sc_module_task_queue_size', 'gauge', 'Number of tasks in module queue', module['queued_tasks'])
+    writer.Add('sc_module_tasks_total', 'counter', 'Number of tasks processed by module', module['processed_tasks'])
+    writer.Add('sc_module_events_total', 'counter', 'Number of sc-events emitted by module', module['emitted_events'])
+    writer.Add('sc_module_events_dropped_total', 'counter', 'Number of sc-events dropped before module queue',
+               module['dropped_events'])
+
+    caches = [(name, cache.Stats()) for name, cache in sorted(self.caches.items()) if cache is not None]
+    writer.Add('sc_cache_hits_total', 'counter', 'Number of cache hits',
+               [({'cache': name}, stats['hits']) for name, stats in caches])
+    writer.Add('sc_cache_misses_total', 'counter', 'Number of cache misses',
+               [({'cache': name}, stats['misses']) for name, stats in caches])
+    writer.Add('sc_cache_size', 'gauge', 'Number of cached items',
+               [({'cache': name}, stats['size']) for name, stats in caches])
+
+    self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+    self.write(writer.Text())
 
 
 class ServerThread(threading.Thread):
@@ -79,15 +435,71 @@ class ServerThread(threading.Thread):
     self.port = port
     self.app = None
     self.module = module
+
+    # requests execution mode: `inline` - in IOLoop thread, `thread` - in a thread pool
+    self.exec_mode = getScConfigValue('web', 'exec_mode') or 'inline'
+    self.executor = None
+
+    self.events_overflow = getScConfigValue('web', 'events_overflow') or EventOverflow.Coalesce
+    if self.events_overflow not in EventOverflow.All():
+      raise RuntimeError('Unsupported events overflow policy: {}. Possible values: {}'.format(
+          self.events_overflow, ', '.join(EventOverflow.All())))
     
   def run(self):
     
     asyncio.set_event_loop(asyncio.new_event_loop())
     ioloop = tornado.ioloop.IOLoop.instance()
 
+    if self.exec_mode == 'thread':
+      self.executor = ThreadPoolExecutor(
+          max_workers=getConfigInt('web', 'exec_workers', 4))
+    elif self.exec_mode != 'inline':
+      print('Unsupported requests execution mode: {}. Use inline mode'.format(self.exec_mode))
+
+    # contents of sc-links are cached only if budget is specified
+    link_cache = None
+    link_cache_size = getConfigInt('web', 'link_content_cache_mb', 0)
+    if link_cache_size > 0:
+      link_cache = ScLinkContentCache(getEventSubscriptions(self.module.events), link_cache_size * 1024 * 1024)
+
+    ws_params = {
+        'evt_manager': self.module.events,
+        'ioloop': ioloop,
+        'executor': self.executor,
+        'max_in_flight': getConfigInt('web', 'max_requests_in_flight', 16),
+        'events_flush_period': getConfigInt('web', 'events_flush_period_ms', 10) / 1000.0,
+        'events_queue_limit': getConfigInt('web', 'events_queue_limit', 0),
+        'events_overflow': self.events_overflow,
+        'template_cache': TemplateCache(getConfigInt('web', 'template_cache_size', 1000)),
+        'content_cache': link_cache
+    }
+
+    content_params = {
+        'content_cache': ContentInfoCache(
+            getEventSubscriptions(self.module.events),
+            getConfigInt('web', 'content_cache_size', 10000)),
+        'chunk_size': getConfigInt('web', 'content_chunk_size_kb', 64) * 1024,
+        'link_cache': link_cache,
+        'executor': self.executor
+    }
+
+    lag_monitor = IOLoopLagMonitor(ioloop, getConfigInt('web', 'ioloop_lag_period_ms', 500) / 1000.0)
+    lag_monitor.Start()
+
+    metrics_params = {
+        'module': self.module,
+        'lag_monitor': lag_monitor,
+        'caches': {
+            'template': ws_params['template_cache'],
+            'content_info': content_params['content_cache'],
+            'link_content': link_cache
+        }
+    }
+
     self.app = tornado.web.Application([
-        (r"/ws_json", ScJsonSocketHandler, { 'evt_manager': self.module.events, 'ioloop': ioloop }),
-        (r"/content/([0-9]+)", ContentHandler),
+        (r"/ws_json", ScJsonSocketHandler, ws_params),
+        (r"/content/([0-9]+)", ContentHandler, content_params),
+        (r"/metrics", MetricsHandler, metrics_params),
         (r'/assets/(.*)', self.staticHandler, {'path': self.assets_path}),
 
         # should be a last
@@ -101,6 +513,10 @@ class ServerThread(threading.Thread):
 
     tornado.ioloop.IOLoop.instance().start()
 
+    lag_monitor.Stop()
+    if self.executor:
+      self.executor.shutdown()
+
   def stop(self):
     tornado.ioloop.IOLoop.instance().stop()
 
@@ -130,7 +546,8 @@ class HttpModule(ScModule):
 
   def OnShutdown(self):
     print('Shutting down HTTP module')
-    self.server.stop()
+    if self.server:
+      self.server.stop()
     # self.server.join()
 
 
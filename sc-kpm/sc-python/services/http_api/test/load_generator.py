@@ -0,0 +1,390 @@
+"""Load generator for websocket API. It opens concurrent clients, that replay
+a mix of requests, and measures throughput, latency of requests and delay of
+events fan-out
+"""
+from tornado import gen, websocket
+from tornado.concurrent import Future
+
+from common import sc_binary
+from sc import *
+
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# types of requests, that can be used in mix
+REQUEST_TYPES = ['create_elements', 'search_template', 'content', 'events']
+
+
+def parseMix(value) -> dict:
+  """Parses mix of requests in format `type:weight,type:weight`"""
+  mix = {}
+  for item in value.split(','):
+    item = item.strip()
+    if len(item) == 0:
+      continue
+
+    name, _, weight = item.partition(':')
+    name = name.strip()
+    if name not in REQUEST_TYPES:
+      raise ValueError("Unknown request type in mix: {}".format(name))
+
+    mix[name] = float(weight) if weight else 1.0
+    if mix[name] < 0:
+      raise ValueError("Negative weight of request type: {}".format(name))
+
+  if sum(mix.values()) <= 0:
+    raise ValueError("Mix of requests is empty: {}".format(value))
+
+  return mix
+
+
+def latencyStats(latencies) -> dict:
+  """Returns statistics (in seconds) of latencies list"""
+  values = sorted(latencies)
+  count = len(values)
+
+  def percentile(p):
+    if count == 0:
+      return 0.0
+    return values[max(0, min(count - 1, int(round(p / 100.0 * count)) - 1))]
+
+  return {
+      'count': count,
+      'mean': (sum(values) / count) if count > 0 else 0.0,
+      'p50': percentile(50),
+      'p90': percentile(90),
+      'p99': percentile(99),
+      'max': values[-1] if count > 0 else 0.0
+  }
+
+
+class LoadConfig:
+  """Parameters of load. They can be read from environment variables:
+    SC_LOAD_CLIENTS - number of concurrent clients (10 by default)
+    SC_LOAD_REQUESTS - number of requests, that sent by each client (100 by default)
+    SC_LOAD_MIX - mix of requests (`create_elements:4,search_template:3,content:2,events:1` by default)
+    SC_LOAD_SUBSCRIBERS - number of clients, that receive events of created edges (all clients by default)
+    SC_LOAD_PROTOCOL - `json` or `binary` frames (`json` by default)
+    SC_LOAD_SEED - seed of requests order (0 by default)
+  """
+
+  DEFAULT_MIX = 'create_elements:4,search_template:3,content:2,events:1'
+
+  def __init__(self, clients=10, requests=100, mix=DEFAULT_MIX, subscribers=None, protocol='json', seed=0):
+    self.clients = clients
+    self.requests = requests
+    self.mix = parseMix(mix) if isinstance(mix, str) else dict(mix)
+    self.subscribers = clients if subscribers is None else min(subscribers, clients)
+    self.protocol = protocol
+    self.seed = seed
+
+    if self.clients <= 0:
+      raise ValueError("Number of clients should be positive: {}".format(self.clients))
+    if self.protocol not in ['json', 'binary']:
+      raise ValueError("Unsupported protocol: {}".format(self.protocol))
+
+  @staticmethod
+  def FromEnv():
+    subscribers = os.environ.get('SC_LOAD_SUBSCRIBERS')
+    return LoadConfig(
+        clients=int(os.environ.get('SC_LOAD_CLIENTS', 10)),
+        requests=int(os.environ.get('SC_LOAD_REQUESTS', 100)),
+        mix=os.environ.get('SC_LOAD_MIX', LoadConfig.DEFAULT_MIX),
+        subscribers=int(subscribers) if subscribers else None,
+        protocol=os.environ.get('SC_LOAD_PROTOCOL', 'json'),
+        seed=int(os.environ.get('SC_LOAD_SEED', 0)))
+
+  def ToDict(self) -> dict:
+    return {
+        'clients': self.clients,
+        'requests': self.requests,
+        'mix': self.mix,
+        'subscribers': self.subscribers,
+        'protocol': self.protocol,
+        'seed': self.seed
+    }
+
+
+class FanoutTracker:
+  """Measures delay between sending of request, that creates edge, and
+  receiving of event about this edge by each subscriber
+  """
+
+  def __init__(self):
+    # edge addr -> time of request sending
+    self.sent = {}
+    # edge addr -> receive times of events, that came before response
+    self.early = {}
+    self.delays = []
+    self.triggers = 0
+
+  def Sent(self, edge_addr, start):
+    self.triggers += 1
+    self.sent[edge_addr] = start
+    for recv in self.early.pop(edge_addr, []):
+      self.delays.append(recv - start)
+
+  def Received(self, edge_addr, recv):
+    start = self.sent.get(edge_addr)
+    if start is None:
+      self.early.setdefault(edge_addr, []).append(recv)
+    else:
+      self.delays.append(recv - start)
+
+  def Delivered(self) -> int:
+    return len(self.delays)
+
+
+class LoadClient:
+  """Websocket client, that matches responses to requests by id.
+  Events are passed to `FanoutTracker`
+  """
+
+  def __init__(self, url, tracker, binary=False):
+    self.url = url
+    self.tracker = tracker
+    self.binary = binary
+    self.conn = None
+    self.last_id = 0
+    # request id -> Future
+    self.waiting = {}
+
+  @gen.coroutine
+  def Connect(self):
+    subprotocols = [sc_binary.PROTOCOL_BINARY if self.binary else sc_binary.PROTOCOL_JSON]
+    self.conn = yield websocket.websocket_connect(self.url, subprotocols=subprotocols)
+    self.readMessages()
+
+  def Close(self):
+    if self.conn:
+      self.conn.close()
+
+  @gen.coroutine
+  def Request(self, req_type, payload):
+    """Returns response and tuple (time of sending, time of receiving)"""
+    self.last_id += 1
+    future = Future()
+    self.waiting[self.last_id] = future
+
+    request = {'id': self.last_id, 'type': req_type, 'payload': payload}
+    start = time.perf_counter()
+    if self.binary:
+      self.conn.write_message(sc_binary.EncodeBinary(request), binary=True)
+    else:
+      self.conn.write_message(json.dumps(request))
+
+    response, recv = yield future
+    return response, (start, recv)
+
+  @gen.coroutine
+  def readMessages(self):
+    while True:
+      msg = yield self.conn.read_message()
+      if msg is None:
+        break
+
+      recv = time.perf_counter()
+      obj = sc_binary.DecodeBinary(msg) if isinstance(msg, bytes) else json.loads(msg)
+
+      if obj['event']:
+        self.onEvent(obj, recv)
+        continue
+
+      future = self.waiting.pop(obj['id'], None)
+      if future is not None:
+        future.set_result((obj, recv))
+
+    # connection was closed
+    for future in self.waiting.values():
+      future.set_exception(websocket.WebSocketClosedError())
+    self.waiting.clear()
+
+  def onEvent(self, obj, recv):
+    if obj.get('batch', False):
+      # row of batch: [event id, addr, edge_addr, other_addr]
+      for row in obj['payload']:
+        self.tracker.Received(row[2], recv)
+    else:
+      self.tracker.Received(obj['payload'][1], recv)
+
+
+class LoadGenerator:
+  """Opens `config.clients` concurrent clients. Each of them sends `config.requests`
+  requests one by one (next request is sent after response). Types of requests
+  are selected randomly according to weights of `config.mix`:
+    create_elements - creates node and edge to it from shared node. Subscribers
+      receive event about this edge, so delay of events fan-out is measured
+    search_template - searches `hub _-> _x` template with 100 results
+    content - reads content of sc-link
+    events - subscribes to event (or unsubscribes from previous one)
+  """
+
+  HUB_SIZE = 100
+
+  def __init__(self, url, config: LoadConfig, drain_timeout=5.0):
+    self.url = url
+    self.config = config
+    self.drain_timeout = drain_timeout
+
+    self.tracker = FanoutTracker()
+    self.clients = []
+    self.latencies = {name: [] for name in REQUEST_TYPES}
+    self.errors = 0
+
+    self.fanout_node = None
+    self.hub_node = None
+    self.link = None
+
+  @gen.coroutine
+  def Run(self) -> dict:
+    """Runs load and returns report"""
+    try:
+      yield self.setup()
+
+      start = time.perf_counter()
+      yield [self.runClient(client, i) for i, client in enumerate(self.clients)]
+      duration = time.perf_counter() - start
+
+      # wait for the last events
+      expected = self.tracker.triggers * self.config.subscribers
+      deadline = time.monotonic() + self.drain_timeout
+      while self.tracker.Delivered() < expected and time.monotonic() < deadline:
+        yield gen.sleep(0.01)
+    finally:
+      for client in self.clients:
+        client.Close()
+
+    return self.makeReport(duration)
+
+  @gen.coroutine
+  def setup(self):
+    for _ in range(self.config.clients):
+      client = LoadClient(self.url, self.tracker, self.config.protocol == 'binary')
+      yield client.Connect()
+      self.clients.append(client)
+
+    # shared elements, that used by requests
+    payload = [
+        {'el': 'node', 'type': ScType.NodeConst.ToInt()},
+        {'el': 'node', 'type': ScType.NodeConst.ToInt()},
+        {'el': 'link', 'type': ScType.LinkConst.ToInt(), 'content': 'load generator content'}
+    ]
+    for i in range(LoadGenerator.HUB_SIZE):
+      payload.append({'el': 'node', 'type': ScType.NodeConst.ToInt()})
+      payload.append({
+          'el': 'edge',
+          'src': {'type': 'ref', 'value': 1},
+          'trg': {'type': 'ref', 'value': len(payload) - 1},
+          'type': ScType.EdgeAccessConstPosPerm.ToInt()
+      })
+
+    response, _ = yield self.clients[0].Request('create_elements', payload)
+    self.checkResponse(response)
+    self.fanout_node, self.hub_node, self.link = response['payload'][:3]
+
+    for client in self.clients[:self.config.subscribers]:
+      response, _ = yield client.Request('events', {
+          'create': [{'type': 'add_outgoing_edge', 'addr': self.fanout_node}],
+          'batch': True
+      })
+      self.checkResponse(response)
+
+  def checkResponse(self, response):
+    if not response['status']:
+      raise RuntimeError("Request failed: {}".format(response['payload']))
+
+  @gen.coroutine
+  def runClient(self, client, index):
+    rand = random.Random(self.config.seed + index)
+    names = list(self.config.mix.keys())
+    weights = [self.config.mix[name] for name in names]
+    churn_sid = None
+
+    for _ in range(self.config.requests):
+      name = rand.choices(names, weights)[0]
+
+      if name == 'create_elements':
+        payload = [
+            {'el': 'node', 'type': ScType.NodeConst.ToInt()},
+            {
+                'el': 'edge',
+                'src': {'type': 'addr', 'value': self.fanout_node},
+                'trg': {'type': 'ref', 'value': 0},
+                'type': ScType.EdgeAccessConstPosPerm.ToInt()
+            }
+        ]
+      elif name == 'search_template':
+        payload = [[
+            {'type': 'addr', 'value': self.hub_node},
+            {'type': 'type', 'value': ScType.EdgeAccessVarPosPerm.ToInt()},
+            {'type': 'type', 'value': ScType.NodeVar.ToInt(), 'alias': '_x'}
+        ]]
+      elif name == 'content':
+        payload = [{'command': 'get', 'addr': self.link}]
+      else:
+        if churn_sid is None:
+          payload = {'create': [{'type': 'add_outgoing_edge', 'addr': self.hub_node}]}
+        else:
+          payload = {'delete': [churn_sid]}
+
+      response, (start, recv) = yield client.Request(name, payload)
+      if not response['status']:
+        self.errors += 1
+        continue
+
+      self.latencies[name].append(recv - start)
+
+      if name == 'create_elements':
+        self.tracker.Sent(response['payload'][1], start)
+      elif name == 'events':
+        churn_sid = response['payload'][0] if churn_sid is None else None
+
+  def makeReport(self, duration) -> dict:
+    all_latencies = []
+    for values in self.latencies.values():
+      all_latencies.extend(values)
+
+    requests = len(all_latencies) + self.errors
+    expected = self.tracker.triggers * self.config.subscribers
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'config': self.config.ToDict(),
+        'duration': duration,
+        'requests': requests,
+        'errors': self.errors,
+        'throughput': (requests / duration) if duration > 0 else 0.0,
+        'latency': dict(
+            [('all', latencyStats(all_latencies))] +
+            [(name, latencyStats(values)) for name, values in self.latencies.items() if len(values) > 0]),
+        'fanout': {
+            'triggers': self.tracker.triggers,
+            'expected': expected,
+            'delivered': self.tracker.Delivered(),
+            'delay': latencyStats(self.tracker.delays)
+        }
+    }
+
+
+def PrintReport(report, log=print):
+  log('{} requests by {} clients in {:.2f} sec: {:.1f} req/sec, {} errors'.format(
+      report['requests'], report['config']['clients'], report['duration'], report['throughput'], report['errors']))
+
+  for name, stats in report['latency'].items():
+    log('{:<16} {:>8} req  p50 {:>9.2f} ms  p99 {:>9.2f} ms'.format(
+        name, stats['count'], stats['p50'] * 1e3, stats['p99'] * 1e3))
+
+  fanout = report['fanout']
+  log('{:<16} {:>8}/{} events  p50 {:>9.2f} ms  p99 {:>9.2f} ms'.format(
+      'fanout', fanout['delivered'], fanout['expected'], fanout['delay']['p50'] * 1e3, fanout['delay']['p99'] * 1e3))
+
+
+def SaveReport(report, path):
+  with open(path, 'w') as f:
+    json.dump(report, f, indent=2, sort_keys=True)
@@ -0,0 +1,119 @@
+from tornado import httpserver, testing, web
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+import os
+import sys
+import threading
+import tornado
+import traceback
+import http_api.ws_sc_json as wsh
+
+from common import ScModule
+from http_api.test.load_generator import LoadConfig, LoadGenerator, PrintReport, SaveReport
+
+from sc import *
+
+sys.stdout = sys.__stdout__
+sys.stderr = sys.__stderr__
+
+
+class ServerThread(threading.Thread):
+  """Runs websocket API on unused port in own IOLoop, like http_api module does"""
+
+  def __init__(self, module, exec_mode='inline'):
+    threading.Thread.__init__(self)
+    self.module = module
+    self.exec_mode = exec_mode
+    self.ioloop = None
+    self.port = None
+    self.started = threading.Event()
+
+  def run(self):
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    self.ioloop = tornado.ioloop.IOLoop.current()
+
+    executor = None
+    if self.exec_mode == 'thread':
+      executor = ThreadPoolExecutor(max_workers=4)
+
+    app = web.Application([
+        (r"/ws_json", wsh.ScJsonSocketHandler, {
+            'evt_manager': self.module.events,
+            'ioloop': self.ioloop,
+            'executor': executor
+        }),
+    ])
+    server = httpserver.HTTPServer(app)
+    socket, self.port = testing.bind_unused_port()
+    server.add_socket(socket)
+    self.started.set()
+
+    self.ioloop.start()
+
+    server.stop()
+    if executor:
+      executor.shutdown()
+
+  def stop(self):
+    self.ioloop.add_callback(self.ioloop.stop)
+
+
+class LoadThread(threading.Thread):
+  """Runs load generator and stops module, when it finishes.
+  Module thread emits events meanwhile
+  """
+
+  def __init__(self, module):
+    threading.Thread.__init__(self)
+    self.module = module
+
+  def run(self):
+    server = None
+    try:
+      config = LoadConfig.FromEnv()
+      output = os.environ.get('SC_LOAD_OUTPUT', 'load_results.json')
+
+      # external server can be loaded too
+      url = os.environ.get('SC_LOAD_URL')
+      if not url:
+        server = ServerThread(self.module, os.environ.get('SC_LOAD_EXEC_MODE', 'inline'))
+        server.start()
+        server.started.wait()
+        url = 'ws://localhost:{}/ws_json'.format(server.port)
+
+      asyncio.set_event_loop(asyncio.new_event_loop())
+      generator = LoadGenerator(url, config)
+      report = tornado.ioloop.IOLoop.current().run_sync(generator.Run)
+
+      PrintReport(report)
+      SaveReport(report, output)
+      print('Load results are saved to {}'.format(output))
+    except Exception:
+      traceback.print_exc()
+    finally:
+      if server:
+        server.stop()
+        server.join()
+      self.module.Stop()
+
+
+class LoadModule(ScModule):
+  def __init__(self):
+    ScModule.__init__(self,
+                      ctx=__ctx__,
+                      cpp_bridge=__cpp_bridge__,
+                      keynodes=[
+                      ])
+    self.load = None
+
+  def OnInitialize(self, params):
+    self.load = LoadThread(self)
+    self.load.start()
+
+  def OnShutdown(self):
+    self.load.join()
+
+
+module = LoadModule()
+module.Run()
@@ -1,12 +1,15 @@
 from tornado import httpserver, testing, web, websocket, gen
 from unittest import TestLoader, TestCase, TextTestRunner
+from concurrent.futures import ThreadPoolExecutor
 
 import json
 import types
 import tornado
 import http_api.ws_sc_json as wsh
+import http_api.content_range as content_range
 
-from common import ScModule
+from common import ScEventParams, ScModule, sc_binary
+from http_api.test.load_generator import LoadConfig, LoadGenerator, parseMix
 
 from sc import *
 
@@ -21,17 +24,24 @@ class WsJsonApiTest(testing.AsyncTestCase):
     ioloop = tornado.ioloop.IOLoop.instance()
 
     app = web.Application([
-        (r"/", wsh.ScJsonSocketHandler, {'evt_manager': module.events, 'ioloop': ioloop}),
+        (r"/", wsh.ScJsonSocketHandler, self.makeHandlerParams(ioloop)),
     ])
     server = httpserver.HTTPServer(app)
     socket, self.port = testing.bind_unused_port()
     server.add_socket(socket)
 
+  def makeHandlerParams(self, ioloop):
+    return {'evt_manager': module.events, 'ioloop': ioloop}
+
   def make_connection(self):
     return websocket.websocket_connect(
         'ws://localhost:{}/'.format(self.port)
     )
 
+  def parseResponse(self, response):
+    self.assertIsInstance(response, str)
+    return json.loads(response)
+
   @gen.coroutine
   def cmd_create_elements(self, client, params):
 
@@ -76,19 +86,19 @@ class WsJsonApiTest(testing.AsyncTestCase):
     # check response
     response = yield client.read_message()
 
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
   def cmd_check_elements(self, client, params):
     client.write_message(self.makeRequest(1, 'check_elements', params))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
   def cmd_delete_elements(self, client, params):
     client.write_message(self.makeRequest(1, 'delete_elements', params))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
   def cmd_search_template(self, client, params):
@@ -132,7 +142,7 @@ class WsJsonApiTest(testing.AsyncTestCase):
 
     client.write_message(self.makeRequest(1, 'search_template', payload))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
   def cmd_generate_template(self, client, params, repl):
@@ -174,21 +184,23 @@ class WsJsonApiTest(testing.AsyncTestCase):
         'templ': triples, 'params': repl
     }))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
-  def cmd_events(self, client, create, delete):
-    client.write_message(self.makeRequest(1, 'events', {
-        'create': create, 'delete': delete
-    }))
+  def cmd_events(self, client, create, delete, batch=None):
+    payload = {'create': create, 'delete': delete}
+    if batch is not None:
+      payload['batch'] = batch
+
+    client.write_message(self.makeRequest(1, 'events', payload))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @gen.coroutine
   def cmd_content(self, client, commands):
     client.write_message(self.makeRequest(1, 'content', commands))
     response = yield client.read_message()
-    return json.loads(response)
+    return self.parseResponse(response)
 
   @testing.gen_test
   def test_connect(self):
@@ -229,7 +241,7 @@ class WsJsonApiTest(testing.AsyncTestCase):
     client.write_message(self.makeRequest(requestID, 'keynodes', payload))
     response = yield client.read_message()
 
-    resObj = json.loads(response)
+    resObj = self.parseResponse(response)
     resPayload = resObj['payload']
 
     self.assertEqual(resObj['id'], requestID)
@@ -253,10 +265,25 @@ class WsJsonApiTest(testing.AsyncTestCase):
     client.write_message(self.makeRequest(1, 'keyndes', payload))
     response = yield client.read_message()
 
-    resObj = json.loads(response)
+    resObj = self.parseResponse(response)
     self.assertEqual(resObj['id'], 1)
     self.assertFalse(resObj['status'])
 
+  @testing.gen_test
+  def test_requests_order(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    requests_num = 5
+    for i in range(requests_num):
+      client.write_message(self.makeRequest(i, 'check_elements', [0]))
+
+    for i in range(requests_num):
+      response = yield client.read_message()
+      resObj = self.parseResponse(response)
+      self.assertEqual(resObj['id'], i)
+      self.assertTrue(resObj['status'])
+
   @testing.gen_test
   def test_unsupported_command(self):
     client = yield self.make_connection()
@@ -265,7 +292,7 @@ class WsJsonApiTest(testing.AsyncTestCase):
     client.write_message(self.makeRequest(1, 'unknown', {}))
 
     response = yield client.read_message()
-    resObj = json.loads(response)
+    resObj = self.parseResponse(response)
 
     self.assertEqual(resObj['id'], 1)
     self.assertFalse(resObj['status'])
@@ -284,7 +311,7 @@ class WsJsonApiTest(testing.AsyncTestCase):
         }]))
 
     response = yield client.read_message()
-    resObj = json.loads(response)
+    resObj = self.parseResponse(response)
 
     keynode = resObj['payload'][0]
     self.assertTrue(resObj['status'])
@@ -467,6 +494,37 @@ class WsJsonApiTest(testing.AsyncTestCase):
     self.assertTrue(elements[4] in _edges_list)
     self.assertTrue(elements[5] in _edges_list)
 
+  @testing.gen_test
+  def test_template_cache(self):
+    client = yield self.make_connection()
+
+    elements = yield self.cmd_create_elements(client, [
+        {'type': ScType.NodeConst},
+        {'type': ScType.NodeConst},
+        {'type': ScType.EdgeAccessConstPosPerm, 'src': 0, 'trg': 1}])
+    elements = elements['payload']
+
+    templ = [
+        [
+            ScAddr(elements[0]),
+            ScType.EdgeAccessVarPosPerm,
+            [ScType.NodeVar, '_node']
+        ]
+    ]
+
+    stats = wsh.templateCache.Stats()
+    for _ in range(3):
+      result = yield self.cmd_search_template(client, templ)
+      self.assertTrue(result['status'])
+
+      result = result['payload']
+      self.assertEqual(len(result['addrs']), 1)
+      self.assertEqual(result['addrs'][0][result['aliases']['_node']], elements[1])
+
+    # template is built just for the first request
+    self.assertEqual(wsh.templateCache.Stats()['misses'], stats['misses'] + 1)
+    self.assertEqual(wsh.templateCache.Stats()['hits'], stats['hits'] + 2)
+
   @testing.gen_test
   def test_template_search_optional(self):
     client = yield self.make_connection()
@@ -533,6 +591,74 @@ class WsJsonApiTest(testing.AsyncTestCase):
     result = result['payload']
     self.assertEqual(len(result['addrs']), 1)
 
+  @testing.gen_test
+  def test_template_search_stream(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    # create test construction: node with 5 output edges
+    targets_num = 5
+    params = [{'type': ScType.NodeConst}]
+    for i in range(targets_num):
+      params.append({'type': ScType.NodeConst})
+    for i in range(targets_num):
+      params.append({
+          'type': ScType.EdgeAccessConstPosTemp,
+          'src': 0,
+          'trg': i + 1
+      })
+
+    elements = yield self.cmd_create_elements(client, params)
+    elements = elements['payload']
+    self.assertEqual(len(elements), len(params))
+
+    client.write_message(self.makeRequest(1, 'search_template', {
+        'templ': [[
+            {'type': 'addr', 'value': elements[0]},
+            {'type': 'type', 'value': ScType.EdgeAccessVarPosTemp.ToInt()},
+            {'type': 'type', 'value': ScType.NodeVar.ToInt(), 'alias': '_trg'}
+        ]],
+        'page_size': 2
+    }))
+
+    response = yield client.read_message()
+    resObj = self.parseResponse(response)
+    self.assertEqual(resObj['id'], 1)
+    self.assertTrue(resObj['status'])
+
+    result = resObj['payload']
+    self.assertEqual(result['count'], targets_num)
+    cursor = result['cursor']
+    trg = result['aliases']['_trg']
+
+    found = []
+    offsets = []
+    last = False
+    while not last:
+      response = yield client.read_message()
+      page = self.parseResponse(response)
+      self.assertEqual(page['id'], 1)
+      self.assertTrue(page['status'])
+
+      page = page['payload']
+      self.assertEqual(page['cursor'], cursor)
+      self.assertLessEqual(len(page['addrs']), 2)
+
+      offsets.append(page['offset'])
+      found.extend([row[trg] for row in page['addrs']])
+      last = page['last']
+
+    self.assertEqual(offsets, [0, 2, 4])
+    self.assertEqual(sorted(found), sorted(elements[1:targets_num + 1]))
+
+    # cursor was finished
+    client.write_message(self.makeRequest(2, 'search_cancel', cursor))
+    response = yield client.read_message()
+    resObj = self.parseResponse(response)
+    self.assertEqual(resObj['id'], 2)
+    self.assertTrue(resObj['status'])
+    self.assertFalse(resObj['payload'])
+
   @testing.gen_test
   def test_template_generate(self):
     client = yield self.make_connection()
@@ -608,25 +734,133 @@ class WsJsonApiTest(testing.AsyncTestCase):
     })
     self.assertFalse(result['status'])
 
-  # @testing.gen_test
-  # def test_events(self):
-  #     client = yield self.make_connection()
-  #     self.assertIsNotNone(client)
+  @testing.gen_test
+  def test_events(self):
+    client1 = yield self.make_connection()
+    client2 = yield self.make_connection()
+
+    elements = yield self.cmd_create_elements(client1, [
+        {'type': ScType.NodeConst},
+        {'type': ScType.NodeConst}])
+    elements = elements['payload']
+    self.assertNotEqual(elements[0], 0)
+    self.assertNotEqual(elements[1], 0)
+
+    subscriptions = wsh.getEventSubscriptions(module.events)
+    stats = subscriptions.Stats()
+
+    create = [{'type': 'add_outgoing_edge', 'addr': elements[0]}]
+    result1 = yield self.cmd_events(client1, create, [])
+    result2 = yield self.cmd_events(client2, create, [])
+    self.assertTrue(result1['status'])
+    self.assertTrue(result2['status'])
+
+    sid1 = result1['payload'][0]
+    sid2 = result2['payload'][0]
+    self.assertNotEqual(sid1, sid2)
+
+    # both clients share one native event
+    self.assertEqual(subscriptions.Stats()['native_events'], stats['native_events'] + 1)
+    self.assertEqual(subscriptions.Stats()['subscribers'], stats['subscribers'] + 2)
 
-  #     elements = yield self.cmd_create_elements(client, [
-  #         {
-  #             'type': ScType.Node
-  #         },
-  #         {
-  #             'type': ScType.Link,
-  #             'data': 'test data'
-  #         }])
+    edge = yield self.cmd_create_elements(client1, [
+        {'type': ScType.EdgeAccessConstPosPerm, 'src': ScAddr(elements[0]), 'trg': ScAddr(elements[1])}])
+    edge = edge['payload'][0]
 
-  #     elements = elements['payload']
-  #     self.assertNotEqual(elements[0], 0)
-  #     self.assertNotEqual(elements[1], 0)
+    # events are emitted by module thread, that runs tests
+    for _ in range(10):
+      if module.EmitEvents(0.1) > 0:
+        break
 
-  #     # TODO: implement events testing
+    for client, sid in [(client1, sid1), (client2, sid2)]:
+      response = yield client.read_message()
+      evt = self.parseResponse(response)
+
+      self.assertTrue(evt['event'])
+      self.assertEqual(evt['id'], sid)
+      self.assertEqual(evt['payload'], [elements[0], edge, elements[1]])
+
+    result = yield self.cmd_events(client1, [], [sid1])
+    self.assertTrue(result['status'])
+    self.assertEqual(subscriptions.Stats()['native_events'], stats['native_events'] + 1)
+
+    # native event is destroyed with the last subscriber
+    client2.close()
+    yield gen.sleep(0.1)
+    self.assertEqual(subscriptions.Stats(), stats)
+
+  @gen.coroutine
+  def createEdgesWithEvents(self, client, targets_num, batch):
+    """Subscribes to output edges of new node and creates `targets_num` edges from it.
+    Returns subscriber id and addrs of edges
+    """
+    elements = yield self.cmd_create_elements(client, [{'type': ScType.NodeConst}])
+    addr = elements['payload'][0]
+
+    result = yield self.cmd_events(client, [{'type': 'add_outgoing_edge', 'addr': addr}], [], batch)
+    sid = result['payload'][0]
+
+    params = [{'type': ScType.NodeConst} for _ in range(targets_num)]
+    params.extend([{'type': ScType.EdgeAccessConstPosPerm, 'src': ScAddr(addr), 'trg': i}
+                   for i in range(targets_num)])
+    elements = yield self.cmd_create_elements(client, params)
+    return sid, elements['payload'][targets_num:]
+
+  @testing.gen_test
+  def test_events_batch(self):
+    client = yield self.make_connection()
+
+    targets_num = 20
+    sid, edges = yield self.createEdgesWithEvents(client, targets_num, True)
+
+    received = []
+    frames = 0
+    while len(received) < targets_num:
+      module.EmitEvents(0.1)
+
+      response = yield client.read_message()
+      evt = self.parseResponse(response)
+      self.assertTrue(evt['event'])
+      frames += 1
+
+      if evt.get('batch', False):
+        for row in evt['payload']:
+          self.assertEqual(row[0], sid)
+          received.append(row[2])
+      else:
+        self.assertEqual(evt['id'], sid)
+        received.append(evt['payload'][1])
+
+    self.assertEqual(sorted(received), sorted(edges))
+    self.assertLess(frames, targets_num)
+
+  @testing.gen_test
+  def test_events_no_batch(self):
+    client = yield self.make_connection()
+
+    # batch frames are sent only by request
+    targets_num = 20
+    sid, edges = yield self.createEdgesWithEvents(client, targets_num, None)
+
+    received = []
+    while len(received) < targets_num:
+      module.EmitEvents(0.1)
+
+      response = yield client.read_message()
+      evt = self.parseResponse(response)
+      self.assertTrue(evt['event'])
+      self.assertNotIn('batch', evt)
+      self.assertEqual(evt['id'], sid)
+      received.append(evt['payload'][1])
+
+    self.assertEqual(sorted(received), sorted(edges))
+
+  @testing.gen_test
+  def test_events_unknown_type(self):
+    client = yield self.make_connection()
+
+    result = yield self.cmd_events(client, [{'type': 'unknown', 'addr': 1}], [])
+    self.assertFalse(result['status'])
 
   @testing.gen_test
   def test_content(self):
@@ -660,6 +894,372 @@ class WsJsonApiTest(testing.AsyncTestCase):
     self.assertEqual(result[1]['value'], 45)
     self.assertEqual(result[1]['type'], 'int')
 
+  @testing.gen_test
+  def test_numeric_content(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    elements = yield self.cmd_create_elements(client, [
+        {
+            'type': ScType.Link,
+            'data': 2.5
+        },
+        {
+            'type': ScType.Link,
+            'data': 'text'
+        }])
+
+    elements = elements['payload']
+    self.assertNotEqual(elements[0], 0)
+    self.assertNotEqual(elements[1], 0)
+
+    result = yield self.cmd_content(client, [{'command': 'get', 'addr': elements[0]}])
+    self.assertTrue(result['status'])
+    self.assertEqual(result['payload'][0]['type'], 'float')
+    self.assertAlmostEqual(result['payload'][0]['value'], 2.5)
+
+    result = yield self.cmd_content(client, [
+        {'command': 'set', 'addr': elements[0], 'type': 'int', 'data': 12},
+        {'command': 'set', 'addr': elements[1], 'type': 'float', 'data': 7.5}
+    ])
+    self.assertTrue(result['status'])
+    self.assertEqual(result['payload'], [True, True])
+
+    result = yield self.cmd_content(client, [
+        {'command': 'get', 'addr': elements[0]},
+        {'command': 'get', 'addr': elements[1]}
+    ])
+    self.assertTrue(result['status'])
+    result = result['payload']
+
+    self.assertEqual(result[0]['type'], 'int')
+    self.assertEqual(result[0]['value'], 12)
+    self.assertEqual(result[1]['type'], 'float')
+    self.assertAlmostEqual(result[1]['value'], 7.5)
+
+
+class WsBinaryApiTest(WsJsonApiTest):
+
+  def make_connection(self):
+    return websocket.websocket_connect(
+        'ws://localhost:{}/'.format(self.port),
+        subprotocols=[sc_binary.PROTOCOL_BINARY]
+    )
+
+  def parseResponse(self, response):
+    self.assertIsInstance(response, bytes)
+    return sc_binary.DecodeBinary(response)
+
+  @testing.gen_test
+  def test_content_search(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    # index is disabled by default
+    result = yield self.cmd_content(client, [{'command': 'search', 'data': 'ws_search_first'}])
+    self.assertFalse(result['status'])
+
+    __ctx__.SetLinkContentIndexEnabled(True)
+    self.addCleanup(__ctx__.SetLinkContentIndexEnabled, False)
+
+    elements = yield self.cmd_create_elements(client, [
+        {
+            'type': ScType.Link,
+            'data': 'ws_search_first'
+        },
+        {
+            'type': ScType.Link,
+            'data': 'ws_search_second'
+        }])
+
+    elements = elements['payload']
+
+    commands = [
+        {'command': 'search', 'data': 'ws_search_first'},
+        {'command': 'search', 'data': 'ws_search_', 'mode': 'prefix'},
+        {'command': 'search', 'data': 'search_sec', 'mode': 'substring'},
+        {'command': 'search', 'data': 'ws_search_', 'mode': 'prefix', 'limit': 1}
+    ]
+
+    result = yield self.cmd_content(client, commands)
+    self.assertTrue(result['status'])
+    result = result['payload']
+
+    self.assertEqual(list(result[0]), [elements[0]])
+    self.assertEqual(list(result[1]), [elements[0], elements[1]])
+    self.assertEqual(list(result[2]), [elements[1]])
+    self.assertEqual(len(result[3]), 1)
+
+    result = yield self.cmd_content(client, [{'command': 'search', 'data': 'ws', 'mode': 'unknown'}])
+    self.assertFalse(result['status'])
+
+  @testing.gen_test
+  def test_binary_request(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    client.write_message(sc_binary.EncodeBinary({
+        'id': 1,
+        'type': 'check_elements',
+        'payload': sc_binary.ScAddrArray.FromList([0, 0])
+    }), binary=True)
+
+    response = yield client.read_message()
+    resObj = self.parseResponse(response)
+
+    self.assertEqual(resObj['id'], 1)
+    self.assertTrue(resObj['status'])
+    self.assertEqual(resObj['payload'], [0, 0])
+
+  @testing.gen_test
+  def test_string_content(self):
+    client = yield self.make_connection()
+    self.assertIsNotNone(client)
+
+    elements = yield self.cmd_create_elements(client, [
+        {
+            'type': ScType.Link,
+            'data': 'binary content'
+        }])
+
+    elements = elements['payload']
+    self.assertNotEqual(elements[0], 0)
+
+    result = yield self.cmd_content(client, [{'command': 'get', 'addr': elements[0]}])
+    self.assertTrue(result['status'])
+    result = result['payload']
+
+    self.assertEqual(result[0]['value'], b'binary content')
+    self.assertEqual(result[0]['type'], 'string')
+
+
+class WsJsonApiThreadTest(WsJsonApiTest):
+
+  executor = ThreadPoolExecutor(max_workers=2)
+
+  def makeHandlerParams(self, ioloop):
+    params = super(WsJsonApiThreadTest, self).makeHandlerParams(ioloop)
+    params['executor'] = WsJsonApiThreadTest.executor
+    return params
+
+
+class EventQueueTest(TestCase):
+
+  def makeEvent(self, addr, edge_addr):
+    return ScEventParams(0, ScAddrFromHash(addr), ScAddrFromHash(edge_addr), ScAddrFromHash(addr + 1))
+
+  def test_flush(self):
+    queue = wsh.EventQueue(10, wsh.EventOverflow.Coalesce)
+
+    self.assertTrue(queue.ScheduleFlush())
+    self.assertFalse(queue.ScheduleFlush())
+
+    self.assertTrue(queue.Push(1, self.makeEvent(10, 11)))
+    self.assertTrue(queue.Push(2, self.makeEvent(20, 21)))
+    self.assertEqual(queue.TakeAll(), [[1, 10, 11, 11], [2, 20, 21, 21]])
+
+    # empty queue finishes flush
+    self.assertEqual(queue.TakeAll(), [])
+    self.assertTrue(queue.ScheduleFlush())
+
+    stats = queue.Stats()
+    self.assertEqual(stats['sent_events'], 2)
+    self.assertEqual(stats['sent_frames'], 1)
+    self.assertEqual(stats['max_queued'], 2)
+
+    # each event is sent by its own frame
+    queue.Push(1, self.makeEvent(10, 11))
+    queue.Push(2, self.makeEvent(20, 21))
+    self.assertEqual(len(queue.TakeAll(False)), 2)
+    self.assertEqual(queue.Stats()['sent_frames'], 3)
+
+  def test_unlimited(self):
+    queue = wsh.EventQueue(0, wsh.EventOverflow.Disconnect)
+
+    for i in range(100):
+      self.assertTrue(queue.Push(1, self.makeEvent(10, 11 + i)))
+
+    self.assertEqual(queue.Size(), 100)
+    self.assertEqual(queue.Stats()['dropped'], 0)
+
+  def test_unknown_overflow(self):
+    with self.assertRaises(ValueError):
+      wsh.EventQueue(10, 'unknown')
+
+  def test_overflow_coalesce(self):
+    queue = wsh.EventQueue(2, wsh.EventOverflow.Coalesce)
+
+    queue.Push(1, self.makeEvent(10, 11))
+    queue.Push(1, self.makeEvent(20, 21))
+    # replaces the first event
+    self.assertTrue(queue.Push(1, self.makeEvent(10, 12)))
+    # drops the oldest event
+    self.assertTrue(queue.Push(1, self.makeEvent(30, 31)))
+
+    self.assertEqual(queue.TakeAll(), [[1, 20, 21, 21], [1, 30, 31, 31]])
+    self.assertEqual(queue.Stats()['coalesced'], 1)
+    self.assertEqual(queue.Stats()['dropped'], 1)
+
+  def test_overflow_drop_oldest(self):
+    queue = wsh.EventQueue(2, wsh.EventOverflow.DropOldest)
+
+    for i in range(4):
+      self.assertTrue(queue.Push(1, self.makeEvent(10, 11 + i)))
+
+    self.assertEqual(queue.TakeAll(), [[1, 10, 13, 11], [1, 10, 14, 11]])
+    self.assertEqual(queue.Stats()['dropped'], 2)
+
+  def test_overflow_disconnect(self):
+    queue = wsh.EventQueue(1, wsh.EventOverflow.Disconnect)
+
+    self.assertTrue(queue.Push(1, self.makeEvent(10, 11)))
+    self.assertFalse(queue.Push(1, self.makeEvent(10, 12)))
+    self.assertEqual(queue.Size(), 1)
+
+
+class TemplateCacheTest(TestCase):
+
+  def test_lru(self):
+    cache = wsh.TemplateCache(max_size=2)
+
+    keys = [cache.MakeKey('templ_{}'.format(i), True) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+      cache.Put(key, i)
+
+    templ = cache.Get(keys[0])
+    self.assertEqual(templ, 0)
+    # template is used by one search at the same time
+    self.assertIsNone(cache.Get(keys[0]))
+    cache.Put(keys[0], templ)
+
+    # the least recently used template is evicted
+    cache.Put(keys[2], 2)
+    self.assertIsNone(cache.Get(keys[1]))
+    self.assertEqual(cache.Get(keys[0]), 0)
+    self.assertEqual(cache.Get(keys[2]), 2)
+
+    stats = cache.Stats()
+    self.assertEqual(stats['size'], 0)
+    self.assertEqual(stats['hits'], 3)
+    self.assertEqual(stats['misses'], 2)
+    self.assertEqual(stats['evictions'], 1)
+    self.assertEqual(stats['hit_rate'], 0.6)
+
+  def test_version(self):
+    cache = wsh.TemplateCache()
+
+    key = cache.MakeKey('templ', True, 1)
+    cache.Put(key, 1)
+    cache.Put(key, 2)
+    self.assertEqual(cache.Stats()['size'], 2)
+
+    # system identifiers were changed, so templates are rebuilt
+    new_key = cache.MakeKey('templ', True, 2)
+    self.assertIsNone(cache.Get(new_key))
+    self.assertEqual(cache.Stats()['size'], 0)
+
+    # template, that was built with old identifiers, isn't cached
+    cache.Put(key, 1)
+    self.assertIsNone(cache.Get(key))
+    self.assertEqual(cache.Stats()['size'], 0)
+
+  def test_keys(self):
+    cache = wsh.TemplateCache(max_key_size=100)
+
+    triples = [[{'type': 'addr', 'value': 1}, {'value': 2, 'type': 'type'}, {'type': 'alias', 'value': '_x'}]]
+    reordered = [[{'value': 1, 'type': 'addr'}, {'type': 'type', 'value': 2}, {'value': '_x', 'type': 'alias'}]]
+
+    self.assertEqual(cache.MakeKey(triples, True), cache.MakeKey(reordered, True))
+    # search and generation templates are cached separately
+    self.assertNotEqual(cache.MakeKey(triples, True), cache.MakeKey(triples, False))
+    # large requests aren't cached
+    self.assertIsNone(cache.MakeKey('x' * 101, True))
+    self.assertIsNone(wsh.TemplateCache(max_size=0).MakeKey(triples, True))
+
+
+class LoadGeneratorTest(testing.AsyncTestCase):
+
+  def setUp(self):
+    super(LoadGeneratorTest, self).setUp()
+
+    app = web.Application([
+        (r"/", wsh.ScJsonSocketHandler, {'evt_manager': module.events, 'ioloop': tornado.ioloop.IOLoop.instance()}),
+    ])
+    server = httpserver.HTTPServer(app)
+    socket, self.port = testing.bind_unused_port()
+    server.add_socket(socket)
+
+  def test_mix(self):
+    self.assertEqual(parseMix('create_elements:2, content'), {'create_elements': 2.0, 'content': 1.0})
+    self.assertRaises(ValueError, parseMix, 'unknown:1')
+    self.assertRaises(ValueError, parseMix, 'events:0')
+
+  @testing.gen_test(timeout=60)
+  def test_load(self):
+    # events are emitted by module thread, that runs tests
+    emitter = tornado.ioloop.PeriodicCallback(lambda: module.EmitEvents(0), 5)
+    emitter.start()
+    try:
+      config = LoadConfig(clients=3, requests=20, subscribers=2)
+      report = yield LoadGenerator('ws://localhost:{}/'.format(self.port), config).Run()
+    finally:
+      emitter.stop()
+
+    self.assertEqual(report['requests'], 60)
+    self.assertEqual(report['errors'], 0)
+    self.assertEqual(report['latency']['all']['count'], 60)
+    self.assertGreater(report['throughput'], 0)
+
+    fanout = report['fanout']
+    self.assertEqual(fanout['expected'], report['latency']['create_elements']['count'] * 2)
+    self.assertEqual(fanout['delivered'], fanout['expected'])
+
+
+class RequestMetricsTest(TestCase):
+
+  def test_histogram(self):
+    metrics = wsh.RequestMetrics(buckets=(0.01, 0.1))
+
+    metrics.Observe('content', 0.005, True)
+    metrics.Observe('content', 0.05, False)
+    metrics.Observe('content', 1.0, True)
+    # unsupported types are counted together
+    metrics.Observe('unsupported', 0.005, False)
+    metrics.Observe(None, 0.005, False)
+
+    stats = metrics.Stats()
+    self.assertEqual(stats['content']['buckets'], [(0.01, 1), (0.1, 2), (float('inf'), 3)])
+    self.assertEqual(stats['content']['count'], 3)
+    self.assertEqual(stats['content']['errors'], 1)
+    self.assertAlmostEqual(stats['content']['sum'], 1.055)
+    self.assertEqual(stats['unknown']['count'], 2)
+    self.assertEqual(stats['unknown']['errors'], 2)
+
+
+class ContentRangeTest(TestCase):
+
+  def test_satisfiable(self):
+    self.assertEqual(content_range.parseRange('bytes=0-4', 10), (0, 5))
+    self.assertEqual(content_range.parseRange('bytes=5-', 10), (5, 10))
+    self.assertEqual(content_range.parseRange('bytes=5-100', 10), (5, 10))
+    self.assertEqual(content_range.parseRange('bytes=3-3', 10), (3, 4))
+    self.assertEqual(content_range.parseRange('bytes=-3', 10), (7, 10))
+    self.assertEqual(content_range.parseRange('bytes=-100', 10), (0, 10))
+
+  def test_not_satisfiable(self):
+    self.assertIsNone(content_range.parseRange('bytes=10-', 10))
+    self.assertIsNone(content_range.parseRange('bytes=10-20', 10))
+    self.assertIsNone(content_range.parseRange('bytes=-0', 10))
+
+  def test_ignored(self):
+    ignore = content_range.ignore_range
+    # last position is less than first one
+    self.assertIs(content_range.parseRange('bytes=5-3', 10), ignore)
+    self.assertIs(content_range.parseRange('bytes=20-3', 10), ignore)
+    self.assertIs(content_range.parseRange('bytes=-', 10), ignore)
+    self.assertIs(content_range.parseRange('bytes=0-1,3-4', 10), ignore)
+    self.assertIs(content_range.parseRange('items=0-1', 10), ignore)
+
 
 def RunTest(test):
   global TestLoader, TextTestRunner
@@ -680,7 +1280,14 @@ class TestModule(ScModule):
 
   def DoTests(self):
     try:
+      RunTest(EventQueueTest)
+      RunTest(TemplateCacheTest)
+      RunTest(RequestMetricsTest)
+      RunTest(ContentRangeTest)
       RunTest(WsJsonApiTest)
+      RunTest(WsBinaryApiTest)
+      RunTest(WsJsonApiThreadTest)
+      RunTest(LoadGeneratorTest)
     except Exception as ex:
       raise ex
     except:
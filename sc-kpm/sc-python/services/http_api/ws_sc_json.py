@@ -1,62 +1,554 @@
 
 import tornado
 
-from tornado import websocket
+from tornado import gen, websocket
+from common import ScAddrArray, ScEventSubscriptions, ScKeynodes, ScMemoryContextPool, sc_binary
 from sc import *
+from scb import ScPythonEventType
 
+import bisect
+import collections
 import json
 import sys
+import time
 import traceback
 import threading
 
 clients = []
+contextPool = ScMemoryContextPool('ScJsonSocketHandler')
+
+# event manager -> ScEventSubscriptions, that shared by all clients
+eventSubscriptions = {}
+eventSubscriptionsLock = threading.Lock()
+
+eventTypes = {
+    'add_outgoing_edge': ScPythonEventType.AddOutputEdge,
+    'add_ingoing_edge': ScPythonEventType.AddInputEdge,
+    'remove_outgoing_edge': ScPythonEventType.RemoveOutputEdge,
+    'remove_ingoing_edge': ScPythonEventType.RemoveInputEdge,
+    'content_change': ScPythonEventType.ContentChanged,
+    'delete_element': ScPythonEventType.EraseElement
+}
+
+# types of requests, that have own metrics. Other types are counted as `unknown`
+requestTypes = ('keynodes', 'create_elements', 'check_elements', 'delete_elements', 'search_template',
+                'search_cancel', 'generate_template', 'content', 'events')
+
+linkSearchModes = {
+    'exact': ScLinkSearchMode.Exact,
+    'prefix': ScLinkSearchMode.Prefix,
+    'substring': ScLinkSearchMode.Substring
+}
+
+
+def getEventSubscriptions(evt_manager) -> ScEventSubscriptions:
+  with eventSubscriptionsLock:
+    subscriptions = eventSubscriptions.get(evt_manager)
+    if subscriptions is None:
+      subscriptions = ScEventSubscriptions(evt_manager)
+      eventSubscriptions[evt_manager] = subscriptions
+
+    return subscriptions
+
+
+class TemplateCache:
+  """LRU cache of built templates, that shared by all clients.
+
+  Search caches processing order inside of template, so template can't be used
+  by concurrent searches. `Get` takes template from cache and caller returns it
+  by `Put` after use. So several templates can be cached for the same request.
+
+  System identifiers are resolved, when template is built, so key contains version
+  of system identifiers and cache is cleared, when it changes.
+
+  This class is thread safe
+  """
+
+  def __init__(self, max_size=1000, max_key_size=65536):
+    """
+    max_size - maximum number of templates in cache. Use 0 to disable cache
+    max_key_size - templates with longer normalized request aren't cached
+    """
+    self.lock = threading.Lock()
+    self.max_size = max_size
+    self.max_key_size = max_key_size
+    # key -> list of free templates
+    self.templates = collections.OrderedDict()
+    self.size = 0
+    self.version = 0
+
+    # counters
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def MakeKey(self, payload, is_search, version=0):
+    """Returns normalized request or None, if template shouldn't be cached.
+    version - version of system identifiers (`HelperGetSystemIdtfsVersion`)
+    """
+    if self.max_size <= 0:
+      return None
+
+    if isinstance(payload, str):
+      value = payload
+    else:
+      value = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+
+    if len(value) > self.max_key_size:
+      return None
+
+    return (version, is_search, value)
+
+  def Get(self, key):
+    """Takes template from cache. Returns None, if there are no free template for key"""
+    with self.lock:
+      templates = self.templates.get(key) if self.checkVersion(key) else None
+      if not templates:
+        self.misses += 1
+        return None
+
+      self.templates.move_to_end(key)
+      self.size -= 1
+      self.hits += 1
+      return templates.pop()
+
+  def Put(self, key, templ):
+    """Adds template, that was built or taken by `Get`, into cache"""
+    with self.lock:
+      if not self.checkVersion(key):
+        return
+
+      self.templates.setdefault(key, []).append(templ)
+      self.templates.move_to_end(key)
+      self.size += 1
+
+      while self.size > self.max_size:
+        old_key, templates = next(iter(self.templates.items()))
+        templates.pop(0)
+        if len(templates) == 0:
+          del self.templates[old_key]
+        self.size -= 1
+        self.evictions += 1
+
+  def Clear(self):
+    with self.lock:
+      self.templates.clear()
+      self.size = 0
+
+  def checkVersion(self, key) -> bool:
+    """Clears cache, if key has newer version of system identifiers.
+    Returns False for key with outdated version
+    """
+    if key[0] > self.version:
+      self.templates.clear()
+      self.size = 0
+      self.version = key[0]
+
+    return key[0] == self.version
+
+  def Stats(self) -> dict:
+    with self.lock:
+      requests = self.hits + self.misses
+      return {
+          'size': self.size,
+          'max_size': self.max_size,
+          'hits': self.hits,
+          'misses': self.misses,
+          'evictions': self.evictions,
+          'hit_rate': self.hits / requests if requests > 0 else 0.0
+      }
+
+
+templateCache = TemplateCache()
+
+
+class RequestMetrics:
+  """Counters and latency histograms of requests by type.
+
+  This class is thread safe
+  """
+
+  # upper bounds (in seconds) of latency histogram buckets
+  BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+  def __init__(self, buckets=BUCKETS):
+    self.lock = threading.Lock()
+    self.buckets = tuple(buckets)
+    # request type -> counts of buckets (the last is +Inf), sum of latencies, count and errors
+    self.types = {}
+    self.connections = 0
+
+  def Observe(self, request_type, duration, status):
+    if request_type not in requestTypes:
+      request_type = 'unknown'
+
+    idx = bisect.bisect_left(self.buckets, duration)
+    with self.lock:
+      item = self.types.get(request_type)
+      if item is None:
+        item = {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0, 'errors': 0}
+        self.types[request_type] = item
+
+      item['buckets'][idx] += 1
+      item['sum'] += duration
+      item['count'] += 1
+      if not status:
+        item['errors'] += 1
+
+  def OnConnect(self):
+    with self.lock:
+      self.connections += 1
+
+  def Stats(self) -> dict:
+    """Returns metrics of each request type. Buckets are cumulative
+    list of (upper bound, count). The last bound is `inf`
+    """
+    bounds = list(self.buckets) + [float('inf')]
+    with self.lock:
+      result = {}
+      for request_type, item in self.types.items():
+        total = 0
+        buckets = []
+        for bound, count in zip(bounds, item['buckets']):
+          total += count
+          buckets.append((bound, total))
+
+        result[request_type] = {
+            'buckets': buckets,
+            'sum': item['sum'],
+            'count': item['count'],
+            'errors': item['errors']
+        }
+
+      return result
+
+
+requestMetrics = RequestMetrics()
+
 
+def eventQueuesStats() -> dict:
+  """Returns summary statistics of outbound event queues of all clients"""
+  result = {
+      'clients': len(clients),
+      'queued': 0,
+      'max_queued': 0,
+      'dropped': 0,
+      'coalesced': 0,
+      'sent_events': 0,
+      'sent_frames': 0
+  }
+
+  for client in list(clients):
+    for key, value in client.event_queue.Stats().items():
+      if key == 'max_queued':
+        result[key] = max(result[key], value)
+      else:
+        result[key] += value
+
+  return result
+
+
+def readSearchResult(search_result, start, end) -> ScAddrArray:
+  """Returns addrs of search result rows in range [start, end)"""
+  data = search_result.ToArray(start, end - start)
+  columns = data.shape[1] if data.ndim == 2 else 0
+
+  return ScAddrArray(data, [end - start, columns])
 
-class EventHandler:
 
-  def __init__(self):
-    self.evt_native = None
-    self.send_func = None
+class SearchCursor:
+  """Search result, that is sent to client by pages"""
 
-  def Set(self, evt, func):
-    self.evt_native = evt
-    self.send_func = func
+  def __init__(self, cursor_id, request_id, search_result, page_size):
+    self.id = cursor_id
+    self.request_id = request_id
+    self.search_result = search_result
+    self.size = search_result.Size()
+    self.page_size = page_size
+    self.offset = 0
+    self.started = False
+    self.cancelled = False
 
-  def OnEmit(self, evt):
-    self.send_func(evt)
+  def IsFinished(self):
+    return self.cancelled or self.offset >= self.size
+
+  def NextPage(self):
+    end = min(self.offset + self.page_size, self.size)
+    page = {
+        'cursor': self.id,
+        'offset': self.offset,
+        'addrs': readSearchResult(self.search_result, self.offset, end),
+        'last': end >= self.size
+    }
+    self.offset = end
+
+    return page
+
+
+class EventOverflow:
+  """What to do with a new event, when outbound queue of client is full"""
+  # new event replaces queued event with the same subscriber and elements,
+  # if there are no such event, then the oldest one is dropped
+  Coalesce = 'coalesce'
+  DropOldest = 'drop_oldest'
+  # client is disconnected
+  Disconnect = 'disconnect'
+
+  @staticmethod
+  def All() -> list:
+    return [EventOverflow.Coalesce, EventOverflow.DropOldest, EventOverflow.Disconnect]
+
+
+class EventQueue:
+  """Outbound queue of events for one client. Events are pushed by module thread
+  and taken by IOLoop thread, so all methods are thread safe
+  """
+
+  def __init__(self, limit, overflow):
+    """limit - maximum number of queued events, 0 means unlimited queue"""
+    if overflow not in EventOverflow.All():
+      raise ValueError("Unknown events overflow policy: {}".format(overflow))
+
+    self.lock = threading.Lock()
+    self.limit = limit
+    self.overflow = overflow
+    # items: [key, row], where row is [subscriber id, addr, edge_addr, other_addr]
+    self.items = collections.deque()
+    # key -> the latest queued item with this key (just for coalesce policy)
+    self.keys = {}
+    self.flush_scheduled = False
+
+    # counters
+    self.max_queued = 0
+    self.dropped = 0
+    self.coalesced = 0
+    self.sent_events = 0
+    self.sent_frames = 0
+
+  def Push(self, sid, evt) -> bool:
+    """Adds event to queue. Returns False, if queue is full and client should be disconnected"""
+    row = [sid, evt.addr.ToInt(), evt.edge_addr.ToInt(), evt.other_addr.ToInt()]
+    key = (sid, row[1], row[3])
+
+    with self.lock:
+      if 0 < self.limit <= len(self.items):
+        if self.overflow == EventOverflow.Disconnect:
+          self.dropped += 1
+          return False
+
+        if self.overflow == EventOverflow.Coalesce:
+          item = self.keys.get(key)
+          if item is not None:
+            item[1] = row
+            self.coalesced += 1
+            return True
+
+        self.popOldest()
+        self.dropped += 1
+
+      item = [key, row]
+      self.items.append(item)
+      if self.overflow == EventOverflow.Coalesce:
+        self.keys[key] = item
+      self.max_queued = max(self.max_queued, len(self.items))
+
+    return True
+
+  def popOldest(self):
+    item = self.items.popleft()
+    if self.keys.get(item[0]) is item:
+      del self.keys[item[0]]
+
+    return item
+
+  def ScheduleFlush(self) -> bool:
+    """Returns True, if flush should be scheduled by caller"""
+    with self.lock:
+      if self.flush_scheduled:
+        return False
+
+      self.flush_scheduled = True
+      return True
+
+  def TakeAll(self, batch=True) -> list:
+    """Returns rows of all queued events. If queue is empty, then
+    flush is finished and next event should schedule it again.
+    `batch` tells if rows are sent by one frame or each row by its own frame
+    """
+    with self.lock:
+      if len(self.items) == 0:
+        self.flush_scheduled = False
+        return []
+
+      rows = [item[1] for item in self.items]
+      self.items.clear()
+      self.keys.clear()
+
+      self.sent_events += len(rows)
+      self.sent_frames += 1 if batch else len(rows)
+
+      return rows
+
+  def Size(self) -> int:
+    with self.lock:
+      return len(self.items)
+
+  def Stats(self) -> dict:
+    with self.lock:
+      return {
+          'queued': len(self.items),
+          'max_queued': self.max_queued,
+          'dropped': self.dropped,
+          'coalesced': self.coalesced,
+          'sent_events': self.sent_events,
+          'sent_frames': self.sent_frames
+      }
 
 
 class ScJsonSocketHandler(websocket.WebSocketHandler):
 
-  def initialize(self, evt_manager, ioloop):
-    self.events = {}
-    self.event_manager = evt_manager
+  def initialize(self, evt_manager, ioloop, ctx_pool=None, executor=None, max_in_flight=16,
+                 events_flush_period=0.01, events_queue_limit=0, events_overflow=EventOverflow.Coalesce,
+                 template_cache=None, content_cache=None, request_metrics=None):
+    """
+    executor - optional `concurrent.futures.Executor`. If it specified, then requests
+      will be processed by it instead of IOLoop thread.
+    max_in_flight - maximum number of requests per client, that wait processing in executor
+    events_flush_period - time (in seconds), that event waits in outbound queue for other events
+    events_queue_limit - maximum number of events in outbound queue of client. By default queue is unlimited
+    events_overflow - `EventOverflow` policy, that applied when outbound queue is full
+    template_cache - `TemplateCache` for built templates. By default module cache is used
+    content_cache - optional `ScLinkContentCache`, that used by `content` requests
+    request_metrics - `RequestMetrics`, that counts requests. By default module metrics are used
+    """
+    # ids of event subscribers
+    self.events = set()
+    self.subscriptions = getEventSubscriptions(evt_manager)
     self.alive = False
     self.ioloop = ioloop
+    self.ctx_pool = ctx_pool if ctx_pool else contextPool
+    self.ctx = None
+    self.executor = executor
+    self.max_in_flight = max_in_flight
+    self.pending = collections.deque()
+    self.binary = False
+    # client receives events by batch frames, if it requested them
+    self.batch_events = False
+    self.cursors = {}
+    self.last_cursor_id = 0
+    self.events_flush_period = events_flush_period
+    self.event_queue = EventQueue(events_queue_limit, events_overflow)
+    self.template_cache = template_cache if template_cache else templateCache
+    self.content_cache = content_cache
+    self.request_metrics = request_metrics if request_metrics else requestMetrics
 
   def check_origin(self, origin):
     return True
 
+  def select_subprotocol(self, subprotocols):
+    """Clients, that request `sc-binary` subprotocol, receive binary frames.
+    All other clients use JSON text frames
+    """
+    if sc_binary.PROTOCOL_BINARY in subprotocols:
+      self.binary = True
+      return sc_binary.PROTOCOL_BINARY
+
+    if sc_binary.PROTOCOL_JSON in subprotocols:
+      return sc_binary.PROTOCOL_JSON
+
+    return None
+
   def open(self):
     if self not in clients:
       clients.append(self)
+    self.request_metrics.OnConnect()
     self.alive = True
+    self.ctx = self.ctx_pool.Acquire()
 
   def on_close(self):
     if self in clients:
       clients.remove(self)
     self.alive = False
 
-    # remove all events
-    for eid, evt in self.events.items():
-      self.event_manager.DestroyEvent(evt.evt_native)
+    self.unsubscribeEvents()
+
+    # stop all streams
+    for cursor in list(self.cursors.values()):
+      cursor.cancelled = True
+    self.cursors.clear()
+
+    # context is still used by request, that processing in executor,
+    # so it would be released on request finish
+    while len(self.pending) > 1:
+      self.pending.pop()
+
+    if len(self.pending) == 0:
+      self.releaseContext()
+
+  def unsubscribeEvents(self):
+    for sid in self.events:
+      self.subscriptions.Unsubscribe(sid)
     self.events.clear()
 
+  def releaseContext(self):
+    if self.ctx:
+      self.ctx_pool.Release(self.ctx)
+      self.ctx = None
+
   def on_message(self, msg):
-    params = json.loads(msg)
+    # binary frames are accepted in both modes
+    if isinstance(msg, bytes):
+      params = sc_binary.DecodeBinary(msg)
+    else:
+      params = json.loads(msg)
+
+    if self.executor is None:
+      self.sendMessage(self.processRequest(params))
+      self.startStreams()
+      return
+
+    if len(self.pending) >= self.max_in_flight:
+      self.sendMessage(self.makeResponse(
+          params['id'], False, "Too many requests in flight: {}".format(self.max_in_flight)))
+      return
+
+    # requests of one client are processed one by one to keep responses order
+    self.pending.append(params)
+    if len(self.pending) == 1:
+      self.runNextRequest()
+
+  def runNextRequest(self):
+    future = self.executor.submit(self.processRequest, self.pending[0])
+    future.add_done_callback(
+        lambda f: self.ioloop.add_callback(self.onRequestDone, f))
+
+  def onRequestDone(self, future):
+    params = self.pending.popleft()
+
+    if not self.alive:
+      # request could subscribe to events after close
+      self.unsubscribeEvents()
+      self.releaseContext()
+      return
+
+    try:
+      response = future.result()
+    except Exception as ex:
+      response = self.makeResponse(params['id'], False, str(ex))
+      print("Unexpected error:", ex)
+
+    self.sendMessage(response)
+    self.startStreams()
+
+    if len(self.pending) > 0:
+      self.runNextRequest()
+
+  def processRequest(self, params):
     status = False
+    request_type = None
+    start = time.perf_counter()
 
-    ctx = ScMemoryContext.Create(str(self))
+    ctx = self.ctx
     try:
       request_type = params['type']
       request_payload = params['payload']
@@ -71,7 +563,9 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
       elif request_type == 'delete_elements':
         response_payload = self.handleDeleteElements(ctx, request_payload)
       elif request_type == 'search_template':
-        response_payload = self.handleTemplateSearch(ctx, request_payload)
+        response_payload = self.handleTemplateSearch(ctx, request_payload, params['id'])
+      elif request_type == 'search_cancel':
+        response_payload = self.handleSearchCancel(ctx, request_payload)
       elif request_type == 'generate_template':
         response_payload = self.handleTemplateGenerate(ctx, request_payload)
       elif request_type == 'content':
@@ -87,75 +581,86 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
       response_payload = str(ex).split('File')[0]
       print("Unexpected error:", response_payload)
     finally:
-      pass
+      self.request_metrics.Observe(request_type, time.perf_counter() - start, status)
+
+    return self.makeResponse(params['id'], status, response_payload)
 
-    # make and send response
+  def makeResponse(self, request_id, status, payload):
     response = {
-        'id': params['id'],
+        'id': request_id,
         'event': False,
         'status': status,
-        'payload': response_payload
+        'payload': payload
     }
 
-    self.sendMessage(json.dumps(response))
+    return self.encodeMessage(response)
+
+  def encodeMessage(self, obj):
+    if self.binary:
+      return sc_binary.EncodeBinary(obj)
+
+    return sc_binary.EncodeJson(obj)
 
   def sendMessage(self, msg):
-    self.write_message(msg)
+    self.write_message(msg, binary=isinstance(msg, bytes))
 
   def handleKeynodes(self, ctx, payload):
     result = [0] * len(payload)
 
+    # group commands by element type, to resolve each group with one call
+    groups = {}
     idx = 0
     for cmd in payload:
       cmdType = cmd['command']
       idtf = cmd['idtf']
 
-      if cmdType == 'find':
-        result[idx] = ctx.HelperResolveSystemIdtf(idtf, ScType.Unknown).ToInt()
-      elif cmdType == 'resolve':
-        elType = ScType(cmd['elType'])
-        result[idx] = ctx.HelperResolveSystemIdtf(idtf, elType).ToInt()
+      elType = None
+      if cmdType == 'resolve':
+        elType = cmd['elType']
+      elif cmdType != 'find':
+        idx += 1
+        continue
+
+      indices, idtfs = groups.setdefault(elType, ([], []))
+      indices.append(idx)
+      idtfs.append(idtf)
 
       idx += 1
 
-    return result
+    for elType, (indices, idtfs) in groups.items():
+      rawType = None if elType is None else ScType(elType)
+      addrs = ScKeynodes.cache.GetMany(ctx, idtfs, rawType)
+      for i, addr in zip(indices, addrs):
+        result[i] = addr.ToInt()
+
+    return ScAddrArray.FromList(result)
 
   def handleCreateElements(self, ctx, payload):
 
-    result = [0] * len(payload)
+    def resolveAdjAddr(obj):
+      value = obj['value']
+      if obj['type'] == 'ref':
+        return int(value)
 
-    idx = 0
+      return ScAddr(value)
+
+    # all elements are created by one native call
+    spec = []
     for cmd in payload:
       el = cmd['el']
       elType = ScType(cmd['type'])
 
       if el == 'node':
-        result[idx] = ctx.CreateNode(elType).ToInt()
-
+        spec.append(('node', elType))
       elif el == 'edge':
-
-        def resolveAdjAddr(obj):
-          value = obj['value']
-          if obj['type'] == 'ref':
-            return ScAddr(result[value])
-
-          return ScAddr(value)
-
-        src = resolveAdjAddr(cmd['src'])
-        trg = resolveAdjAddr(cmd['trg'])
-
-        result[idx] = ctx.CreateEdge(elType, src, trg).ToInt()
-
+        spec.append(('edge', elType, resolveAdjAddr(cmd['src']), resolveAdjAddr(cmd['trg'])))
       elif el == 'link':
         # TODO: support link type
-        addr = ctx.CreateLink()
-        if addr.IsValid():
-          ctx.SetLinkContent(addr, cmd['content'])
-        result[idx] = addr.ToInt()
-
-      idx += 1
+        spec.append(('link', ScType.LinkConst, self.decodeContent(cmd['content'])))
+      else:
+        raise RuntimeError("Unknown element: {}".format(el))
 
-    return result
+    return ScAddrArray(ctx.CreateElementsBatch(spec), [len(spec)])
 
   def handleCheckElements(self, ctx, payload):
     result = [0] * len(payload)
@@ -218,40 +723,104 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
 
     return templ
 
-  def handleTemplateSearch(self, ctx, payload):
+  def getTemplate(self, ctx, payload, is_search):
+    """Returns template and cache key. Template should be returned into cache
+    by key after use. Key is None, if template shouldn't be cached
+    """
+    key = self.template_cache.MakeKey(payload, is_search, ctx.HelperGetSystemIdtfsVersion())
+    if key is not None:
+      templ = self.template_cache.Get(key)
+      if templ is not None:
+        return templ, key
 
-    templ = None
     if isinstance(payload, str):
       templ = ctx.HelperBuildTemplate(payload)
     else:
-      templ = self.makeTemplate(payload, True)
+      templ = self.makeTemplate(payload, is_search)
+
+    if templ is None:
+      raise RuntimeError("Can't build template")
+
+    return templ, key
+
+  def handleTemplateSearch(self, ctx, payload, request_id):
+
+    # streaming mode: {"templ": ..., "page_size": 1000}
+    page_size = None
+    if isinstance(payload, dict):
+      page_size = int(payload['page_size'])
+      if page_size <= 0:
+        raise RuntimeError("Invalid page size: {}".format(page_size))
+      payload = payload['templ']
+
+    templ, key = self.getTemplate(ctx, payload, True)
 
     # run search
     search_result = ctx.HelperSearchTemplate(templ)
     aliases = search_result.Aliases()
-    
-    addrs = []
-    for idx in range(search_result.Size()):
-      result_item = search_result[idx]
-      items = [0] * result_item.Size()
-      for it in range(len(items)):
-        items[it] = search_result[idx][it].ToInt()
-      addrs.append(items)
+
+    if key is not None:
+      self.template_cache.Put(key, templ)
+
+    if page_size is None:
+      return {
+          'aliases': aliases,
+          'addrs': readSearchResult(search_result, 0, search_result.Size())
+      }
+
+    # pages are sent after response
+    self.last_cursor_id += 1
+    cursor = SearchCursor(self.last_cursor_id, request_id, search_result, page_size)
+    self.cursors[cursor.id] = cursor
 
     return {
         'aliases': aliases,
-        'addrs': addrs
+        'cursor': cursor.id,
+        'count': cursor.size
     }
 
+  def handleSearchCancel(self, ctx, payload):
+    cursor = self.cursors.pop(int(payload), None)
+    if cursor is None:
+      return False
+
+    cursor.cancelled = True
+    return True
+
+  def startStreams(self):
+    for cursor in list(self.cursors.values()):
+      if not cursor.started:
+        cursor.started = True
+        self.ioloop.add_callback(self.streamSearchResult, cursor)
+
+  @gen.coroutine
+  def streamSearchResult(self, cursor):
+    """Sends pages of search result one by one. Next page is read
+    when previous one was written, so just one page is kept in memory
+    """
+    try:
+      while self.alive and not cursor.IsFinished():
+        page = cursor.NextPage()
+        if cursor.IsFinished():
+          # last page can't be cancelled
+          self.cursors.pop(cursor.id, None)
+
+        msg = self.makeResponse(cursor.request_id, True, page)
+        yield self.write_message(msg, binary=isinstance(msg, bytes))
+    except websocket.WebSocketClosedError:
+      pass
+    finally:
+      self.cursors.pop(cursor.id, None)
+      cursor.search_result = None
+
   def handleTemplateGenerate(self, ctx, payload):
     
-    templ = None
     params = {}
-    if isinstance(payload, str):
-      templ = ctx.HelperBuildTemplate(payload)
-    else:
-      templ = self.makeTemplate(payload["templ"], False)
+    if not isinstance(payload, str):
       params = payload['params']
+      payload = payload['templ']
+
+    templ, key = self.getTemplate(ctx, payload, False)
 
     templ_params = ScTemplateParams()
     for alias, value in params.items():
@@ -259,6 +828,8 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
 
     # run search
     gen_result = ctx.HelperGenTemplate(templ, templ_params)
+    if key is not None:
+      self.template_cache.Put(key, templ)
     if not gen_result:
       return None
 
@@ -268,7 +839,7 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
 
     return {
       "aliases": gen_result.Aliases(),
-      "addrs": addrs
+      "addrs": ScAddrArray.FromList(addrs)
     }
 
   def handleContent(self, ctx, payload):
@@ -286,13 +857,19 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
         elif contentType == 'int':
           value = int(value)
         elif contentType == 'string':
-          value = str(value)
+          value = str(self.decodeContent(value))
 
-        result.append(ctx.SetLinkContent(a, value))
+        if self.content_cache:
+          result.append(self.content_cache.SetLinkContent(ctx, a, value))
+        else:
+          result.append(ctx.SetLinkContent(a, value))
         
       elif t == 'get':
         a = ScAddr(cmd['addr'])
-        content = ctx.GetLinkContent(a)
+        if self.content_cache:
+          content = self.content_cache.GetLinkContent(ctx, a)
+        else:
+          content = ctx.GetLinkContent(a)
         value = None
         ctype = None
         if content:
@@ -305,7 +882,9 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
             value = content.AsFloat()
             ctype = 'float'
           elif ctype == ScLinkContent.String:
-            value = content.AsString()
+            # binary clients receive raw bytes of content. Memory view is copied,
+            # because it refers to content buffer
+            value = bytes(content.AsBinary()) if self.binary else content.AsString()
             ctype = 'string'
 
         result.append({
@@ -316,55 +895,107 @@ class ScJsonSocketHandler(websocket.WebSocketHandler):
       elif t == 'find':
         value = cmd['data']
         addrs = ctx.FindLinksByContent(value)
-        result.append([addr.ToInt() for addr in addrs])
+        result.append(ScAddrArray.FromList([addr.ToInt() for addr in addrs]))
+
+      elif t == 'search':
+        value = str(self.decodeContent(cmd['data']))
+        mode = linkSearchModes.get(cmd.get('mode', 'exact'))
+        if mode is None:
+          raise RuntimeError("Unknown search mode: {}".format(cmd['mode']))
+
+        addrs = ctx.FindLinksByContentIndex(value, mode, int(cmd.get('limit', 0)))
+        result.append(ScAddrArray.FromList([addr.ToInt() for addr in addrs]))
 
     return result
 
-  def onEmitEvent(self, evt):
-    response = {
-        'id': evt.id,
+  def decodeContent(self, value):
+    """Content of links, that received in binary frame, is a raw UTF-8 bytes.
+    Numeric content is returned as is
+    """
+    if isinstance(value, bytes):
+      return value.decode('utf-8')
+
+    return value
+
+  def onEmitEvent(self, sid, evt):
+    """Called by module thread. Events are sent by IOLoop thread after flush period"""
+    if not self.alive:
+      return
+
+    if not self.event_queue.Push(sid, evt):
+      self.ioloop.add_callback(self.closeOverflowed)
+    elif self.event_queue.ScheduleFlush():
+      self.ioloop.add_callback(self.ioloop.call_later, self.events_flush_period, self.flushEvents)
+
+  def closeOverflowed(self):
+    if self.alive:
+      self.close(1008, 'Events queue overflow')
+
+  @gen.coroutine
+  def flushEvents(self):
+    """Sends queued events. Next frames are made when previous ones were written,
+    so events of slow client are accumulated in queue
+    """
+    try:
+      while self.alive:
+        batch = self.batch_events
+        rows = self.event_queue.TakeAll(batch)
+        if len(rows) == 0:
+          break
+
+        if batch and len(rows) > 1:
+          msg = self.makeEventsMessage(rows)
+          yield self.write_message(msg, binary=isinstance(msg, bytes))
+          continue
+
+        future = None
+        for row in rows:
+          msg = self.makeEventMessage(row)
+          future = self.write_message(msg, binary=isinstance(msg, bytes))
+        yield future
+    except websocket.WebSocketClosedError:
+      pass
+
+  def makeEventMessage(self, row):
+    sid, addr, edge_addr, other_addr = row
+    return self.encodeMessage({
+        'id': sid,
         'event': True,
         'status': True,
-        'payload': [evt.addr.ToInt(), evt.edge_addr.ToInt(), evt.other_addr.ToInt()]
-    }
-    data = json.dumps(response)
-    self.ioloop.add_callback(self.sendMessage, data)
+        'payload': [addr, edge_addr, other_addr]
+    })
+
+  def makeEventsMessage(self, rows):
+    # row of batch: [event id, addr, edge_addr, other_addr]
+    return self.encodeMessage({
+        'id': 0,
+        'event': True,
+        'batch': True,
+        'status': True,
+        'payload': ScAddrArray.FromRows(rows, 4)
+    })
 
   def handleEvents(self, ctx, payload):
     result = []
-    createEvents = None
-    try:
-      createEvents = payload['create']
-    except KeyError:
-      pass
 
-    if createEvents:
-      for evt in createEvents:
-        # determine function that will be create events
-        evtType = evt['type']
-        createFunc = None
-        if evtType == 'add_outgoing_edge':
-          createFunc = self.event_manager.CreateEventAddOutputEdge
-        elif evtType == 'add_ingoing_edge':
-          createFunc = self.event_manager.CreateEventAddInputEdge
-        elif evtType == 'remove_outgoing_edge':
-          createFunc = self.event_manager.CreateEventRemoveOutputEdge
-        elif evtType == 'remove_ingoing_edge':
-          createFunc = self.event_manager.CreateEventRemoveInputEdge
-        elif evtType == 'content_change':
-          createFunc = self.event_manager.CreateEventContentChanged
-        elif evtType == 'delete_element':
-          createFunc = self.event_manager.CreateEventEraseElement
-
-        assert createFunc != None
-
-        addr = ScAddr(evt['addr'])
-
-        evt_handler = EventHandler()
-        evt = createFunc(addr, evt_handler.OnEmit)
-        evt_handler.Set(evt, self.onEmitEvent)
-
-        self.events[evt.GetID()] = evt_handler
-        result.append(evt.GetID())
+    # client, that can parse batch frames, requests them explicitly
+    if 'batch' in payload:
+      self.batch_events = bool(payload['batch'])
+
+    # clients, that subscribed to the same element, share one native event
+    for evt in payload.get('create', []):
+      evtType = eventTypes.get(evt['type'])
+      if evtType is None:
+        raise RuntimeError("Unknown event type: {}".format(evt['type']))
+
+      sid = self.subscriptions.Subscribe(ScAddr(evt['addr']), evtType, self.onEmitEvent)
+      if sid != 0:
+        self.events.add(sid)
+      result.append(sid)
+
+    for sid in payload.get('delete', []):
+      if sid in self.events:
+        self.events.remove(sid)
+        self.subscriptions.Unsubscribe(sid)
 
     return result
@@ -0,0 +1,34 @@
+from common import *
+from sc import *
+
+from sc_tests.benchmark import RunBenchmarks
+
+import sys
+import traceback
+
+sys.stdout = sys.__stdout__
+sys.stderr = sys.__stderr__
+
+
+class BenchModule(ScModule):
+  def __init__(self):
+    ScModule.__init__(self,
+                      ctx=__ctx__,
+                      cpp_bridge=__cpp_bridge__,
+                      keynodes=[
+                      ])
+
+  def OnInitialize(self, params):
+    try:
+      RunBenchmarks(__ctx__, self)
+    except Exception:
+      traceback.print_exc()
+    finally:
+      self.Stop()
+
+  def OnShutdown(self):
+    pass
+
+
+module = BenchModule()
+module.Run()
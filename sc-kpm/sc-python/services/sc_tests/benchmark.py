@@ -0,0 +1,245 @@
+from common import *
+from sc import *
+
+import json
+import os
+import platform
+import sys
+import time
+
+
+class BenchResult:
+  """Measured latencies (in seconds) of one benchmark"""
+
+  def __init__(self, name, latencies, items_per_op=1):
+    self.name = name
+    self.latencies = sorted(latencies)
+    self.items_per_op = items_per_op
+
+  def Percentile(self, p):
+    """Returns `p`-th percentile of latencies (nearest rank)"""
+    if len(self.latencies) == 0:
+      return 0.0
+
+    idx = max(0, min(len(self.latencies) - 1, int(round(p / 100.0 * len(self.latencies))) - 1))
+    return self.latencies[idx]
+
+  def ToDict(self) -> dict:
+    total = sum(self.latencies)
+    ops = len(self.latencies)
+    return {
+        'ops': ops,
+        'items_per_op': self.items_per_op,
+        'total_time': total,
+        'ops_per_sec': (ops / total) if total > 0 else 0.0,
+        'items_per_sec': (ops * self.items_per_op / total) if total > 0 else 0.0,
+        'latency': {
+            'mean': (total / ops) if ops > 0 else 0.0,
+            'p50': self.Percentile(50),
+            'p90': self.Percentile(90),
+            'p99': self.Percentile(99),
+            'max': self.latencies[-1] if ops > 0 else 0.0
+        }
+    }
+
+
+def Measure(name, func, count, items_per_op=1) -> BenchResult:
+  """Calls `func(i)` `count` times and measures latency of each call"""
+  latencies = []
+  for i in range(count):
+    start = time.perf_counter()
+    func(i)
+    latencies.append(time.perf_counter() - start)
+
+  return BenchResult(name, latencies, items_per_op)
+
+
+class Benchmarks:
+  """Benchmarks of Python bindings. Each `bench*` method returns `BenchResult`.
+  Synthetic graph contains `size` elements for each benchmark
+  """
+
+  def __init__(self, ctx, module, size=1000):
+    self.ctx = ctx
+    self.module = module
+    self.size = size
+
+  def benchCreateNode(self):
+    return Measure('CreateNode', lambda i: self.ctx.CreateNode(ScType.NodeConst), self.size)
+
+  def benchCreateEdge(self):
+    src = self.ctx.CreateNode(ScType.NodeConst)
+    targets = [self.ctx.CreateNode(ScType.NodeConst) for _ in range(self.size)]
+    return Measure(
+        'CreateEdge',
+        lambda i: self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, src, targets[i]),
+        self.size)
+
+  def benchCreateElementsBatch(self):
+    batch = 100
+    src = self.ctx.CreateNode(ScType.NodeConst)
+    spec = []
+    for _ in range(batch // 2):
+      spec.append(('node', ScType.NodeConst))
+      spec.append(('edge', ScType.EdgeAccessConstPosPerm, src, len(spec) - 1))
+
+    return Measure(
+        'CreateElementsBatch',
+        lambda i: self.ctx.CreateElementsBatch(spec),
+        max(1, self.size // batch), len(spec))
+
+  def benchSetLinkContent(self):
+    links = [self.ctx.CreateLink() for _ in range(self.size)]
+    return Measure(
+        'SetLinkContent',
+        lambda i: self.ctx.SetLinkContent(links[i], 'bench_content_{}'.format(i)),
+        self.size)
+
+  def benchGetLinkContent(self):
+    links = [self.ctx.CreateLink() for _ in range(self.size)]
+    for i, link in enumerate(links):
+      self.ctx.SetLinkContent(link, 'bench_content_{}'.format(i))
+
+    return Measure('GetLinkContent', lambda i: self.ctx.GetLinkContent(links[i]).AsString(), self.size)
+
+  def __makeHub(self):
+    hub = self.ctx.CreateNode(ScType.NodeConst)
+    spec = []
+    for _ in range(self.size):
+      spec.append(('node', ScType.NodeConst))
+      spec.append(('edge', ScType.EdgeAccessConstPosPerm, hub, len(spec) - 1))
+    self.ctx.CreateElementsBatch(spec)
+    return hub
+
+  def benchIterator3(self):
+    """One operation iterates all outgoing edges of node with `size` edges"""
+    hub = self.__makeHub()
+
+    def iterate(i):
+      it = self.ctx.Iterator3(hub, ScType.EdgeAccessConstPosPerm, ScType.Unknown)
+      while it.Next():
+        it.Get(2)
+
+    return Measure('Iterator3', iterate, 10, self.size)
+
+  def benchIterator3Batch(self):
+    """The same as `benchIterator3`, but rows are fetched by `NextBatch`"""
+    hub = self.__makeHub()
+
+    def iterate(i):
+      it = self.ctx.Iterator3(hub, ScType.EdgeAccessConstPosPerm, ScType.Unknown)
+      while len(it.NextBatch(1024)) > 0:
+        pass
+
+    return Measure('Iterator3.NextBatch', iterate, 10, self.size)
+
+  def benchHelperSearchTemplate(self):
+    """Searches one construction `_x => rel: [content]` in graph with `size` such constructions"""
+    rel = self.ctx.CreateNode(ScType.NodeConstNoRole)
+    nodes = []
+    for i in range(self.size):
+      node = self.ctx.CreateNode(ScType.NodeConst)
+      link = self.ctx.CreateLink()
+      self.ctx.SetLinkContent(link, 'bench_value_{}'.format(i))
+      edge = self.ctx.CreateEdge(ScType.EdgeDCommonConst, node, link)
+      self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, rel, edge)
+      nodes.append(node)
+
+    def search(i):
+      templ = ScTemplate()
+      templ.TripleWithRelation(
+          nodes[i],
+          ScType.EdgeDCommonVar,
+          ScType.Link >> '_link',
+          ScType.EdgeAccessVarPosPerm,
+          rel)
+      self.ctx.HelperSearchTemplate(templ)
+
+    return Measure('HelperSearchTemplate', search, self.size)
+
+  def benchScSetAdd(self):
+    scSet = ScSet(self.ctx, self.ctx.CreateNode(ScType.NodeConst))
+    elements = [self.ctx.CreateNode(ScType.NodeConst) for _ in range(self.size)]
+    return Measure('ScSet.Add', lambda i: scSet.Add(elements[i]), self.size)
+
+  def benchScSetAddMany(self):
+    batch = 100
+    scSet = ScSet(self.ctx, self.ctx.CreateNode(ScType.NodeConst))
+    elements = [self.ctx.CreateNode(ScType.NodeConst) for _ in range(self.size)]
+    return Measure(
+        'ScSet.AddMany',
+        lambda i: scSet.AddMany(elements[i * batch:(i + 1) * batch]),
+        max(1, self.size // batch), batch)
+
+  def benchScSetHas(self):
+    scSet = ScSet(self.ctx, self.ctx.CreateNode(ScType.NodeConst))
+    elements = [self.ctx.CreateNode(ScType.NodeConst) for _ in range(self.size)]
+    scSet.AddMany(elements[::2])
+    return Measure('ScSet.Has', lambda i: scSet.Has(elements[i]), self.size)
+
+  def benchEventDelivery(self):
+    """Latency between edge creation and call of event callback in module thread"""
+    src = self.ctx.CreateNode(ScType.NodeConst)
+    trg = self.ctx.CreateNode(ScType.NodeConst)
+    received = []
+    evt = self.module.events.CreateEventAddOutputEdge(src, lambda evt_params: received.append(evt_params))
+
+    def deliver(i):
+      received.clear()
+      self.ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, src, trg)
+      timeout = time.monotonic() + 5.0
+      while len(received) == 0 and time.monotonic() < timeout:
+        self.module.EmitEvents(0.001)
+
+    try:
+      return Measure('EventDelivery', deliver, min(self.size, 1000))
+    finally:
+      self.module.events.DestroyEvent(evt)
+
+  def Run(self, name_filter=None, log=print) -> [BenchResult]:
+    """Runs all benchmarks, which names contain `name_filter`"""
+    results = []
+    for attr in sorted(dir(self)):
+      if not attr.startswith('bench'):
+        continue
+
+      if name_filter and name_filter.lower() not in attr.lower():
+        continue
+
+      result = getattr(self, attr)()
+      stats = result.ToDict()
+      log('{:<24} {:>12.1f} ops/sec  p50 {:>9.1f} us  p99 {:>9.1f} us'.format(
+          result.name, stats['ops_per_sec'], stats['latency']['p50'] * 1e6, stats['latency']['p99'] * 1e6))
+      results.append(result)
+
+    return results
+
+
+def SaveResults(results, path, size):
+  """Writes results into JSON file, that can be used to compare releases"""
+  data = {
+      'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+      'python': sys.version.split()[0],
+      'platform': platform.platform(),
+      'graph_size': size,
+      'results': {result.name: result.ToDict() for result in results}
+  }
+
+  with open(path, 'w') as f:
+    json.dump(data, f, indent=2, sort_keys=True)
+
+
+def RunBenchmarks(ctx, module):
+  """Runs benchmarks with parameters from environment variables:
+    SC_BENCH_SIZE - number of elements in synthetic graphs (1000 by default)
+    SC_BENCH_FILTER - run only benchmarks, which names contain this string
+    SC_BENCH_OUTPUT - path to JSON file with results (`bench_results.json` by default)
+  """
+  size = int(os.environ.get('SC_BENCH_SIZE', 1000))
+  output = os.environ.get('SC_BENCH_OUTPUT', 'bench_results.json')
+
+  results = Benchmarks(ctx, module, size).Run(os.environ.get('SC_BENCH_FILTER'))
+  SaveResults(results, output, size)
+  print('Benchmark results are saved to {}'.format(output))
+
+  return results
@@ -39,6 +39,15 @@ class TestScAddr(TestCase):
 
     self.assertNotEqual(addr2.ToInt(), 0)
 
+  def test_hash(self):
+    ctx = TestScAddr.MemoryCtx()
+    addr1 = ctx.CreateNode(ScType.Const)
+    addr2 = ctx.CreateNode(ScType.Const)
+
+    values = {addr1, addr2, ScAddrFromHash(addr1.ToInt())}
+    self.assertEqual(len(values), 2)
+    self.assertTrue(ScAddr(addr2.ToInt()) in values)
+
 
 class TestScType(TestCase):
 
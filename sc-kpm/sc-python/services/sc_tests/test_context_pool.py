@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from common import *
+from sc import *
+
+from sc_tests.test_utils import *
+
+class TestScMemoryContextPool(TestCase):
+
+  def test_acquire_release(self):
+    pool = ScMemoryContextPool('TestPool', max_size=1)
+
+    ctx1 = pool.Acquire()
+    self.assertTrue(ctx1.CreateNode(ScType.NodeConst).IsValid())
+    ctx2 = pool.Acquire()
+    self.assertTrue(ctx2.CreateNode(ScType.NodeConst).IsValid())
+
+    stats = pool.Stats()
+    self.assertEqual(stats['allocated'], 2)
+    self.assertEqual(stats['reused'], 0)
+    self.assertEqual(stats['in_use'], 2)
+
+    pool.Release(ctx1)
+    pool.Release(ctx2)
+
+    stats = pool.Stats()
+    self.assertEqual(stats['in_use'], 0)
+    self.assertEqual(stats['free'], 1)
+    self.assertEqual(stats['destroyed'], 1)
+
+  def test_reuse(self):
+    pool = ScMemoryContextPool('TestPool')
+
+    ctx = pool.Acquire()
+    pool.Release(ctx)
+
+    self.assertEqual(pool.Acquire(), ctx)
+
+    stats = pool.Stats()
+    self.assertEqual(stats['allocated'], 1)
+    self.assertEqual(stats['reused'], 1)
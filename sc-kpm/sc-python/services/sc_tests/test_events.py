@@ -3,6 +3,7 @@ from datetime import datetime
 
 from common import *
 from sc import *
+from scb import *
 
 from sc_tests.test_utils import *
 
@@ -46,4 +47,145 @@ class TestEvents(TestCase):
     edge1 = ctx.CreateEdge(ScType.EdgeAccess, addr1, addr2)
     waitTimeout(3, check.isPassed)
 
-    self.assertTrue(check.isPassed())
\ No newline at end of file
+    self.assertTrue(check.isPassed())
+
+  def test_events_batch(self):
+    ctx = TestEvents.MemoryCtx()
+    module = TestEvents.module
+    events = module.events
+
+    # batching is disabled by default
+    module.cpp.SetEventBatching(256, 1000, 65536)
+    self.addCleanup(module.cpp.SetEventBatching, 0, 0, 0)
+
+    addr = ctx.CreateNode(ScType.NodeConst)
+    self.assertTrue(addr.IsValid())
+
+    edges = []
+    evt = events.CreateEventAddOutputEdge(addr, lambda evt_params: edges.append(evt_params.edge_addr))
+
+    targets_num = 1000
+    result = ctx.CreateElementsBatch(
+        [('node', ScType.NodeConst) for _ in range(targets_num)] +
+        [('edge', ScType.EdgeAccessConstPosPerm, addr, i) for i in range(targets_num)])
+
+    # events are delivered by batches, so there should be less tasks than events
+    tasks_num = 0
+    start = time.monotonic()
+    while len(edges) < targets_num and time.monotonic() - start < 5:
+      tasks_num += module.EmitEvents(0.1)
+
+    events.DestroyEvent(evt)
+
+    self.assertEqual(len(edges), targets_num)
+    self.assertEqual(sorted(e.ToInt() for e in edges), sorted(result[targets_num:]))
+    self.assertLess(tasks_num, targets_num)
+    self.assertEqual(module.Stats()['dropped_events'], 0)
+
+  def test_events_batch_fallback(self):
+    ctx = TestEvents.MemoryCtx()
+    module = TestEvents.module
+    events = module.events
+
+    # events are delivered one by one, when there is no batch delegate
+    module.cpp.SetEventBatching(256, 1000, 65536)
+    module.cpp.onEventBatch = None
+    self.addCleanup(module.cpp.SetEventBatching, 0, 0, 0)
+    self.addCleanup(setattr, module.cpp, 'onEventBatch', module.HandleOnEventBatch)
+
+    addr = ctx.CreateNode(ScType.NodeConst)
+    edges = []
+    evt = events.CreateEventAddOutputEdge(addr, lambda evt_params: edges.append(evt_params.edge_addr))
+
+    targets_num = 10
+    for _ in range(targets_num):
+      ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, addr, ctx.CreateNode(ScType.NodeConst))
+
+    start = time.monotonic()
+    while len(edges) < targets_num and time.monotonic() - start < 5:
+      module.EmitEvents(0.1)
+
+    events.DestroyEvent(evt)
+
+    self.assertEqual(len(edges), targets_num)
+    self.assertEqual(module.Stats()['dropped_events'], 0)
+
+  def test_event_subscriptions(self):
+    ctx = TestEvents.MemoryCtx()
+    module = TestEvents.module
+    subscriptions = ScEventSubscriptions(module.events)
+
+    addr1 = ctx.CreateNode(ScType.NodeConst)
+    addr2 = ctx.CreateNode(ScType.NodeConst)
+
+    received = []
+    def onEvent(sid, evt_params):
+      received.append((sid, evt_params.edge_addr.ToInt()))
+
+    sid1 = subscriptions.Subscribe(addr1, ScPythonEventType.AddOutputEdge, onEvent)
+    sid2 = subscriptions.Subscribe(addr1, ScPythonEventType.AddOutputEdge, onEvent)
+    sid3 = subscriptions.Subscribe(addr1, ScPythonEventType.AddInputEdge, onEvent)
+    self.assertNotEqual(sid1, 0)
+    self.assertNotEqual(sid1, sid2)
+
+    self.assertEqual(subscriptions.Stats(), {'native_events': 2, 'subscribers': 3})
+
+    edge = ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, addr1, addr2)
+    start = time.monotonic()
+    while len(received) < 2 and time.monotonic() - start < 5:
+      module.EmitEvents(0.1)
+
+    self.assertEqual(sorted(received), [(sid1, edge.ToInt()), (sid2, edge.ToInt())])
+
+    self.assertTrue(subscriptions.Unsubscribe(sid1))
+    self.assertFalse(subscriptions.Unsubscribe(sid1))
+    self.assertEqual(subscriptions.Stats(), {'native_events': 2, 'subscribers': 2})
+
+    self.assertTrue(subscriptions.Unsubscribe(sid2))
+    self.assertTrue(subscriptions.Unsubscribe(sid3))
+    self.assertEqual(subscriptions.Stats(), {'native_events': 0, 'subscribers': 0})
+
+  def test_link_content_cache(self):
+    ctx = TestEvents.MemoryCtx()
+    module = TestEvents.module
+    subscriptions = ScEventSubscriptions(module.events)
+    cache = ScLinkContentCache(subscriptions, max_bytes=10)
+
+    link1 = ctx.CreateLink()
+    link2 = ctx.CreateLink()
+    self.assertTrue(ctx.SetLinkContent(link1, 'first'))
+    self.assertTrue(ctx.SetLinkContent(link2, 'second'))
+
+    self.assertEqual(cache.GetLinkContent(ctx, link1).AsString(), 'first')
+    self.assertEqual(cache.GetLinkContent(ctx, link1).AsString(), 'first')
+
+    stats = cache.Stats()
+    self.assertEqual(stats['hits'], 1)
+    self.assertEqual(stats['misses'], 1)
+    self.assertEqual(stats['bytes'], 5)
+    self.assertEqual(subscriptions.Stats(), {'native_events': 2, 'subscribers': 2})
+
+    # byte budget is exceeded, so the least recently used content is evicted
+    self.assertEqual(cache.GetLinkContent(ctx, link2).AsString(), 'second')
+    stats = cache.Stats()
+    self.assertEqual(stats['size'], 1)
+    self.assertEqual(stats['bytes'], 6)
+    self.assertEqual(stats['evictions'], 1)
+    self.assertEqual(subscriptions.Stats(), {'native_events': 2, 'subscribers': 2})
+
+    # content changed by another code is invalidated by event
+    self.assertTrue(ctx.SetLinkContent(link2, 'other'))
+    start = time.monotonic()
+    while cache.Stats()['invalidations'] == 0 and time.monotonic() - start < 5:
+      module.EmitEvents(0.1)
+
+    self.assertEqual(cache.Stats()['size'], 0)
+    self.assertEqual(cache.GetLinkContent(ctx, link2).AsString(), 'other')
+
+    # content changed through cache is invalidated immediately
+    self.assertTrue(cache.SetLinkContent(ctx, link2, 'new'))
+    self.assertEqual(cache.GetLinkContent(ctx, link2).AsString(), 'new')
+
+    cache.Invalidate()
+    self.assertEqual(cache.Stats()['bytes'], 0)
+    self.assertEqual(subscriptions.Stats(), {'native_events': 0, 'subscribers': 0})
@@ -91,82 +91,115 @@ class TestScHelper(TestCase):
 
     self.assertEqual(value, 'test_data')
 
-  # def test_updateStructureValues(self):
-  #   ctx = TestScHelper.MemoryCtx()
-
-  #   addr = ctx.CreateNode(ScType.NodeConstStruct)
-  #   other_addr = ctx.CreateNode(ScType.NodeConstNoRole)
-
-  #   rrel_name = ctx.CreateNode(ScType.NodeConstRole)
-  #   rrel_mass = ctx.CreateNode(ScType.NodeConstRole)
-  #   rrel_height = ctx.CreateNode(ScType.NodeConstRole)
-  #   rrel_other = ctx.CreateNode(ScType.NodeConstRole)
-  #   rrel_new = ctx.CreateNode(ScType.NodeConstRole)
-
-  #   # empty structure setup
-  #   name = 'name_1'
-  #   mass = 78.9
-  #   height = 178
-
-  #   helper = ScHelper(ctx)
-  #   helper.kbUpdateStructureValues(addr, [
-  #     (rrel_name, name),
-  #     (rrel_mass, mass),
-  #     (rrel_height, height),
-  #     (rrel_other, other_addr)
-  #   ])
-
-  #   templ = ScTemplate()
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_name", ScType.EdgeAccessVarPosPerm, rrel_name)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_mass", ScType.EdgeAccessVarPosPerm, rrel_mass)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_height", ScType.EdgeAccessVarPosPerm, rrel_height)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.NodeVar >> "_other", ScType.EdgeAccessVarPosPerm, rrel_other)
-
-  #   result = ctx.HelperSearchTemplate(templ)
-  #   self.assertEqual(result.Size(), 1)
-
-  #   self.assertEqual(result[0]['_other'], other_addr)
-    
-  #   name_content = ctx.GetLinkContent(result[0]['_name'])
-  #   self.assertEqual(name_content.GetType(), ScLinkContent.String)
-  #   self.assertEqual(name_content.GetValue().AsString(), name)
-
-  #   mass_content = ctx.GetLinkContent(result[0]['_mass'])
-  #   self.assertEqual(mass_content.GetType(), ScLinkContent.Float)
-  #   self.assertEqual(mass_content.GetValue().AsFloat(), mass)
-
-  #   height_content = ctx.GetLinkContent(result[0]['_height'])
-  #   self.assertEqual(height_content.GetType(), ScLinkContent.Int)
-  #   self.assertEqual(height_content.GetValue().AsFloat(), height)
-
-  #   # update existing
-  #   helper.kbUpdateStructureValues(addr, [
-  #     (rrel_name, mass),
-  #     (rrel_other, name),
-  #     (rrel_new, height),
-  #     (rrel_mass, other_addr)
-  #   ])
-
-  #   templ = ScTemplate()
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.NodeVar >> "_mass", ScType.EdgeAccessVarPosPerm, rrel_mass)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_name", ScType.EdgeAccessVarPosPerm, rrel_name)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_height", ScType.EdgeAccessVarPosPerm, rrel_height)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_other", ScType.EdgeAccessVarPosPerm, rrel_other)
-  #   templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_new", ScType.EdgeAccessVarPosPerm, rrel_new)
-
-  #   result = ctx.HelperSearchTemplate(templ)
-  #   self.assertEqual(result.Size(), 1)
-
-  #   self.assertEqual(result[0]['_mass'], other_addr)
-
-  #   name_content = ctx.GetLinkContent(result[0]['_name'])
-  #   self.assertEqual(name_content.GetType(), ScLinkContent.Float)
-  #   self.assertEqual(name_content.GetValue().AsString(), mass)
-
-  #   ohter_content = ctx.GetLinkContent(result[0]['_other'])
-  #   self.assertEqual(ohter_content.GetType(), ScLinkContent.String)
-  #   self.assertEqual(ohter_content.GetValue().AsString(), name)
-
-  #   new_content = ctx.GetLinkContent(result[0]['_new'])
-  #   self.assertEqual(new_content.GetType(), ScLinkContent.Int)
-  #   self.assertEqual(new_content.GetValue().AsString(), height)
\ No newline at end of file
+  def test_updateStructureValues(self):
+    ctx = TestScHelper.MemoryCtx()
+
+    addr = ctx.CreateNode(ScType.NodeConstStruct)
+    other_addr = ctx.CreateNode(ScType.NodeConstNoRole)
+
+    rrel_name = ctx.CreateNode(ScType.NodeConstRole)
+    rrel_mass = ctx.CreateNode(ScType.NodeConstRole)
+    rrel_height = ctx.CreateNode(ScType.NodeConstRole)
+    rrel_other = ctx.CreateNode(ScType.NodeConstRole)
+    rrel_new = ctx.CreateNode(ScType.NodeConstRole)
+
+    # empty structure setup
+    name = 'name_1'
+    mass = 78.9
+    height = 178
+
+    helper = ScHelper(ctx)
+    helper.kbUpdateStructureValues(addr, [
+      (rrel_name, name),
+      (rrel_mass, mass),
+      (rrel_height, height),
+      (rrel_other, other_addr)
+    ])
+
+    templ = ScTemplate()
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_name", ScType.EdgeAccessVarPosPerm, rrel_name)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_mass", ScType.EdgeAccessVarPosPerm, rrel_mass)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_height", ScType.EdgeAccessVarPosPerm, rrel_height)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.NodeVar >> "_other", ScType.EdgeAccessVarPosPerm, rrel_other)
+
+    result = ctx.HelperSearchTemplate(templ)
+    self.assertEqual(result.Size(), 1)
+
+    self.assertEqual(result[0]['_other'], other_addr)
+
+    name_content = ctx.GetLinkContent(result[0]['_name'])
+    self.assertEqual(name_content.GetType(), ScLinkContent.String)
+    self.assertEqual(name_content.AsString(), name)
+
+    mass_content = ctx.GetLinkContent(result[0]['_mass'])
+    self.assertEqual(mass_content.GetType(), ScLinkContent.Float)
+    self.assertAlmostEqual(mass_content.AsFloat(), mass)
+
+    height_content = ctx.GetLinkContent(result[0]['_height'])
+    self.assertEqual(height_content.GetType(), ScLinkContent.Int)
+    self.assertEqual(height_content.AsInt(), height)
+
+    name_link = result[0]['_name']
+
+    # update existing
+    helper.kbUpdateStructureValues(addr, [
+      (rrel_name, mass),
+      (rrel_other, name),
+      (rrel_new, height),
+      (rrel_mass, other_addr)
+    ])
+
+    templ = ScTemplate()
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.NodeVar >> "_mass", ScType.EdgeAccessVarPosPerm, rrel_mass)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_name", ScType.EdgeAccessVarPosPerm, rrel_name)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_height", ScType.EdgeAccessVarPosPerm, rrel_height)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_other", ScType.EdgeAccessVarPosPerm, rrel_other)
+    templ.TripleWithRelation(addr, ScType.EdgeAccessVarPosPerm, ScType.Link >> "_new", ScType.EdgeAccessVarPosPerm, rrel_new)
+
+    result = ctx.HelperSearchTemplate(templ)
+    self.assertEqual(result.Size(), 1)
+
+    self.assertEqual(result[0]['_mass'], other_addr)
+
+    # existing link is reused
+    self.assertEqual(result[0]['_name'], name_link)
+    name_content = ctx.GetLinkContent(result[0]['_name'])
+    self.assertEqual(name_content.GetType(), ScLinkContent.Float)
+    self.assertAlmostEqual(name_content.AsFloat(), mass)
+
+    other_content = ctx.GetLinkContent(result[0]['_other'])
+    self.assertEqual(other_content.GetType(), ScLinkContent.String)
+    self.assertEqual(other_content.AsString(), name)
+
+    new_content = ctx.GetLinkContent(result[0]['_new'])
+    self.assertEqual(new_content.GetType(), ScLinkContent.Int)
+    self.assertEqual(new_content.AsInt(), height)
+
+    # each relation has just one value
+    for rrel in [rrel_name, rrel_mass, rrel_height, rrel_other, rrel_new]:
+      it = ctx.Iterator5(addr, ScType.EdgeAccessConstPosPerm, ScType.Unknown, ScType.EdgeAccessConstPosPerm, rrel)
+      self.assertEqual(len(list(it)), 1)
+
+    # link, that is used by other structure, isn't changed and deleted
+    shared = ctx.CreateLink()
+    self.assertTrue(ctx.SetLinkContent(shared, 'shared'))
+    other_struct = ctx.CreateNode(ScType.NodeConst)
+    ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, other_struct, shared)
+
+    # replace value of `rrel_new` with shared link
+    ctx.DeleteElement(result[0]['_new'])
+    edge = ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, addr, shared)
+    ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, rrel_new, edge)
+
+    helper.kbUpdateStructureValues(addr, [(rrel_new, 'updated')])
+    self.assertEqual(ctx.GetLinkContent(shared).AsString(), 'shared')
+
+    it = ctx.Iterator5(addr, ScType.EdgeAccessConstPosPerm, ScType.Link, ScType.EdgeAccessConstPosPerm, rrel_new)
+    values = [trg for _, _, trg, _, _ in it]
+    self.assertEqual(len(values), 1)
+    self.assertNotEqual(values[0], shared)
+    self.assertEqual(ctx.GetLinkContent(values[0]).AsString(), 'updated')
+
+    helper.kbUpdateStructureValues(addr, [(rrel_new, other_addr)])
+    self.assertTrue(ctx.IsElement(shared))
+    self.assertFalse(ctx.IsElement(values[0]))
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import time
+
+from common import *
+from sc import *
+
+from sc_tests.test_utils import *
+
+class TestScKeynodes(TestCase):
+
+  def test_cache(self):
+    ctx = TestScKeynodes.MemoryCtx()
+    cache = ScKeynodesCache()
+
+    addr = cache.Get(ctx, 'sc_result')
+    self.assertTrue(addr.IsValid())
+    self.assertEqual(cache.Get(ctx, 'sc_result'), addr)
+
+    stats = cache.Stats()
+    self.assertEqual(stats['misses'], 1)
+    self.assertEqual(stats['hits'], 1)
+
+  def test_negative_cache(self):
+    ctx = TestScKeynodes.MemoryCtx()
+    cache = ScKeynodesCache(max_missed=1)
+
+    idtf = 'test_keynodes_cache_missed_1'
+    self.assertFalse(cache.Get(ctx, idtf).IsValid())
+    self.assertFalse(cache.Get(ctx, idtf).IsValid())
+    self.assertEqual(cache.Stats()['negative_hits'], 1)
+
+    # negative cache is bounded
+    self.assertFalse(cache.Get(ctx, 'test_keynodes_cache_missed_2').IsValid())
+    self.assertEqual(cache.Stats()['missed'], 1)
+
+    # set identifier by memory context invalidates negative cache
+    addr = ctx.CreateNode(ScType.NodeConst)
+    self.assertTrue(ctx.HelperSetSystemIdtf('test_keynodes_cache_missed_2', addr))
+    self.assertEqual(cache.Get(ctx, 'test_keynodes_cache_missed_2'), addr)
+
+    # create element on resolve
+    addr = cache.Get(ctx, idtf, ScType.NodeConst)
+    self.assertTrue(addr.IsValid())
+    self.assertEqual(cache.Get(ctx, idtf), addr)
+
+  def test_set_idtf(self):
+    ctx = TestScKeynodes.MemoryCtx()
+    keynodes = ScKeynodes(ctx)
+
+    idtf = 'test_keynodes_idtf_1'
+    self.assertFalse(keynodes[idtf].IsValid())
+
+    addr = CreateNodeWithIdtf(ctx, ScType.NodeConst, idtf)
+    self.assertEqual(keynodes[idtf], addr)
+
+    # identifier is already used
+    self.assertFalse(ctx.HelperSetSystemIdtf(idtf, ctx.CreateNode(ScType.NodeConst)))
+    self.assertEqual(keynodes[idtf], addr)
+
+  def test_delete_element(self):
+    ctx = TestScKeynodes.MemoryCtx()
+    keynodes = ScKeynodes(ctx)
+
+    idtf = 'test_keynodes_idtf_deleted'
+    addr = CreateNodeWithIdtf(ctx, ScType.NodeConst, idtf)
+    self.assertEqual(keynodes[idtf], addr)
+
+    # cache is cleared by sc-event, that emitted asynchronously
+    self.assertTrue(ctx.DeleteElement(addr))
+    for _ in range(100):
+      if not keynodes[idtf].IsValid():
+        break
+      time.sleep(0.01)
+
+    self.assertFalse(keynodes[idtf].IsValid())
+
+  def test_resolve(self):
+    ctx = TestScKeynodes.MemoryCtx()
+    keynodes = ScKeynodes(ctx)
+
+    addrs = keynodes.Resolve(['sc_result', 'test_keynodes_not_exist'])
+    self.assertEqual(len(addrs), 2)
+    self.assertEqual(addrs[0], keynodes['sc_result'])
+    self.assertFalse(addrs[1].IsValid())
@@ -1,11 +1,16 @@
 from unittest import defaultTestLoader, TestCase, TextTestRunner, TestSuite
 
 from sc_tests.test_common import TestScAddr, TestScType
+from sc_tests.test_context_pool import TestScMemoryContextPool
 from sc_tests.test_events import TestEvents
 from sc_tests.test_helper import TestScHelper
+from sc_tests.test_keynodes import TestScKeynodes
 from sc_tests.test_memory_ctx import TestScMemoryContext
+from sc_tests.test_module import TestScModule
+from sc_tests.test_scheduler import TestScAgentScheduler
 from sc_tests.test_set import TestScSet
 from sc_tests.test_templates import TestScTemplate
+from sc_tests.test_threads import TestScThreads
 from sc_tests.test_agent import TestScAgent
 
 from sc_tests.test_utils import CreateNodeWithIdtf
@@ -30,12 +35,17 @@ def RunTests():
   tests = [
     TestScAddr,
     TestScAgent,
+    TestScAgentScheduler,
     TestScType,
     TestScMemoryContext,
+    TestScMemoryContextPool,
+    TestScModule,
     TestScSet,
     TestEvents,
     TestScHelper,
+    TestScKeynodes,
     TestScTemplate,
+    TestScThreads,
     ]
 
   for testItem in tests:
@@ -22,6 +22,50 @@ class TestScMemoryContext(TestCase):
     edge2 = ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, addr2, ScAddr())
     self.assertFalse(edge2.IsValid())
 
+  def test_create_elements_batch(self):
+    ctx = TestScMemoryContext.MemoryCtx()
+
+    node = ctx.CreateNode(ScType.NodeConst)
+    self.assertTrue(node.IsValid())
+
+    result = ctx.CreateElementsBatch([
+        ('node', ScType.NodeConstClass),
+        ('link', ScType.LinkConst, 'batch content'),
+        ('link', ScType.LinkConst, 56),
+        ('edge', ScType.EdgeAccessConstPosPerm, 0, 1),
+        ('edge', ScType.EdgeDCommonConst, node, 3),
+        ('edge', ScType.EdgeAccessConstPosPerm, node, ScAddr())
+    ])
+
+    self.assertEqual(result.format, 'Q')
+    self.assertEqual(len(result), 6)
+
+    addrs = [ScAddrFromHash(v) for v in result]
+    for addr in addrs[:5]:
+      self.assertTrue(addr.IsValid())
+    self.assertEqual(result[5], 0)
+
+    self.assertEqual(ctx.GetElementType(addrs[0]), ScType.NodeConstClass)
+    self.assertEqual(ctx.GetLinkContent(addrs[1]).AsString(), 'batch content')
+    self.assertEqual(ctx.GetLinkContent(addrs[2]).AsInt(), 56)
+
+    src, trg = ctx.GetEdgeInfo(addrs[3])
+    self.assertEqual(src, addrs[0])
+    self.assertEqual(trg, addrs[1])
+
+    src, trg = ctx.GetEdgeInfo(addrs[4])
+    self.assertEqual(src, node)
+    self.assertEqual(trg, addrs[3])
+
+    self.assertEqual(len(ctx.CreateElementsBatch([])), 0)
+
+    # invalid references
+    with self.assertRaises(RuntimeError):
+      ctx.CreateElementsBatch([('edge', ScType.EdgeAccessConstPosPerm, 0, 0)])
+
+    with self.assertRaises(RuntimeError):
+      ctx.CreateElementsBatch([('unknown', ScType.NodeConst)])
+
   def test_is_element(self):
     ctx = TestScMemoryContext.MemoryCtx()
 
@@ -88,6 +132,53 @@ class TestScMemoryContext(TestCase):
     res3 = ctx.FindLinksByContent('test_any_not_found')
     self.assertEqual(len(res3), 0)
 
+  def test_find_links_by_content_index(self):
+    ctx = TestScMemoryContext.MemoryCtx()
+
+    # index is disabled by default
+    with self.assertRaises(RuntimeError):
+      ctx.FindLinksByContentIndex('index_apple')
+
+    ctx.SetLinkContentIndexEnabled(True)
+    self.addCleanup(ctx.SetLinkContentIndexEnabled, False)
+
+    def createLink(content):
+      addr = ctx.CreateLink()
+      self.assertTrue(ctx.SetLinkContent(addr, content))
+      return addr
+
+    apple = createLink('index_apple')
+    applePie = createLink('index_apple_pie')
+    pineapple = createLink('index_pineapple')
+    number = createLink(56)
+
+    res = ctx.FindLinksByContentIndex('index_apple')
+    self.assertEqual(res, [apple])
+
+    res = ctx.FindLinksByContentIndex('index_apple', ScLinkSearchMode.Prefix)
+    self.assertEqual(res, [apple, applePie])
+
+    res = ctx.FindLinksByContentIndex('apple', ScLinkSearchMode.Substring)
+    self.assertEqual(set(res), {apple, applePie, pineapple})
+
+    res = ctx.FindLinksByContentIndex('index_', ScLinkSearchMode.Prefix, 2)
+    self.assertEqual(len(res), 2)
+
+    # content is updated in index
+    self.assertTrue(ctx.SetLinkContent(pineapple, 'index_pear'))
+    res = ctx.FindLinksByContentIndex('apple', ScLinkSearchMode.Substring)
+    self.assertEqual(set(res), {apple, applePie})
+    self.assertEqual(ctx.FindLinksByContentIndex('pear', ScLinkSearchMode.Substring), [pineapple])
+
+    # removed links aren't found
+    self.assertTrue(ctx.DeleteElement(applePie))
+    res = ctx.FindLinksByContentIndex('index_apple', ScLinkSearchMode.Prefix)
+    self.assertEqual(res, [apple])
+
+    # binary content isn't indexed
+    self.assertTrue(number.IsValid())
+    self.assertEqual(ctx.FindLinksByContentIndex('8', ScLinkSearchMode.Substring), [])
+
   def test_link_content(self):
     ctx = TestScMemoryContext.MemoryCtx()
 
@@ -122,6 +213,32 @@ class TestScMemoryContext(TestCase):
     self.assertEqual(value3, "any text")
     self.assertEqual(v3.GetType(), ScLinkContent.String)
 
+  def test_link_stream(self):
+    ctx = TestScMemoryContext.MemoryCtx()
+
+    addr = ctx.CreateLink()
+    content = 'stream content ' * 100
+    self.assertTrue(ctx.SetLinkContent(addr, content))
+
+    stream = ctx.GetLinkStream(addr)
+    self.assertIsNotNone(stream)
+    self.assertEqual(stream.Size(), len(content))
+
+    chunks = []
+    chunk = stream.Read(64)
+    while len(chunk) > 0:
+      self.assertLessEqual(len(chunk), 64)
+      chunks.append(chunk)
+      chunk = stream.Read(64)
+    self.assertEqual(b''.join(chunks), content.encode('utf-8'))
+
+    self.assertTrue(stream.Seek(7))
+    self.assertEqual(stream.Pos(), 7)
+    self.assertEqual(stream.Read(7), b'content')
+    self.assertFalse(stream.Seek(len(content) + 1))
+
+    self.assertIsNone(ctx.GetLinkStream(ctx.CreateNode(ScType.NodeConst)))
+
   def test_iterator3(self):
 
     ctx = TestScMemoryContext.MemoryCtx()
@@ -162,6 +279,52 @@ class TestScMemoryContext(TestCase):
     self.assertTrue(it3.IsValid())
     self.assertFalse(it3.Next())
 
+  def test_iterator_batch(self):
+    ctx = TestScMemoryContext.MemoryCtx()
+
+    targets_num = 600
+    addr = ctx.CreateNode(ScType.NodeConst)
+    rel = ctx.CreateNode(ScType.NodeConstNoRole)
+    spec = [('node', ScType.NodeConst) for _ in range(targets_num)]
+    spec.extend([('edge', ScType.EdgeDCommonConst, addr, i) for i in range(targets_num)])
+    spec.extend([('edge', ScType.EdgeAccessConstPosPerm, rel, targets_num + i) for i in range(targets_num)])
+    created = ctx.CreateElementsBatch(spec)
+
+    targets = sorted(created[:targets_num])
+    edges = sorted(created[targets_num:targets_num * 2])
+
+    # rows are read by chunks
+    it = ctx.Iterator3(addr, ScType.EdgeDCommonConst, ScType.NodeConst)
+    rows = []
+    batch = it.NextBatch(250)
+    while len(batch) > 0:
+      self.assertEqual(batch.shape[1], 3)
+      self.assertLessEqual(len(batch), 250)
+      rows.extend(batch.tolist())
+      batch = it.NextBatch(250)
+
+    self.assertEqual(len(rows), targets_num)
+    self.assertEqual(sorted(row[1] for row in rows), edges)
+    self.assertEqual(sorted(row[2] for row in rows), targets)
+    for row in rows:
+      self.assertEqual(row[0], addr.ToInt())
+
+    it = ctx.Iterator5(addr, ScType.EdgeDCommonConst, ScType.NodeConst, ScType.EdgeAccessConstPosPerm, rel)
+    batch = it.NextBatch(targets_num * 2)
+    self.assertEqual(batch.shape, (targets_num, 5))
+    self.assertEqual(sorted(batch[i, 2] for i in range(targets_num)), targets)
+    self.assertEqual(len(it.NextBatch(10)), 0)
+
+    # python iteration
+    rows = list(ctx.Iterator3(addr, ScType.EdgeDCommonConst, ScType.NodeConst))
+    self.assertEqual(len(rows), targets_num)
+    self.assertEqual(rows[0][0], addr)
+    self.assertEqual(sorted(row[2].ToInt() for row in rows), targets)
+
+    rows = list(ctx.Iterator5(addr, ScType.EdgeDCommonConst, ScType.NodeConst, ScType.EdgeAccessConstPosPerm, rel))
+    self.assertEqual(len(rows), targets_num)
+    self.assertEqual(rows[0][4], rel)
+
   def test_iterator5(self):
     ctx = TestScMemoryContext.MemoryCtx()
 
@@ -271,6 +434,24 @@ class TestScMemoryContext(TestCase):
     # get
     self.assertEqual(ctx.HelperGetSystemIdtf(addr2), "idtf_1_2_test")
 
+  def test_helper_sys_idtfs(self):
+    ctx = TestScMemoryContext.MemoryCtx()
+
+    addrs = ctx.HelperResolveSystemIdtfs(["sc_result", "test_example_value_idtfs"], None)
+    self.assertEqual(len(addrs), 2)
+    self.assertEqual(addrs[0], ctx.HelperResolveSystemIdtf("sc_result", None))
+    self.assertFalse(addrs[1].IsValid())
+
+    # create new
+    addrs = ctx.HelperResolveSystemIdtfs(["test_example_idtfs_1", "test_example_idtfs_2"], ScType.NodeConst)
+    self.assertEqual(len(addrs), 2)
+    for addr in addrs:
+      self.assertTrue(addr.IsValid())
+      self.assertEqual(ScType.NodeConst, ctx.GetElementType(addr))
+    self.assertNotEqual(addrs[0], addrs[1])
+
+    self.assertEqual(len(ctx.HelperResolveSystemIdtfs([], None)), 0)
+
   def test_helper_has_edge(self):
     ctx = TestScMemoryContext.MemoryCtx()
 
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from common import *
+from sc import *
+
+
+class TestScModule(TestCase):
+
+  def setUp(self):
+    self.module = TestScModule.module
+    # process tasks left by other tests
+    while self.module.EmitEvents(0) > 0:
+      pass
+
+  def test_emit_events_empty(self):
+    self.assertEqual(self.module.EmitEvents(0), 0)
+
+  def test_emit_events_batch(self):
+    calls = []
+    for i in range(10):
+      self.module.CallLater(calls.append, i)
+
+    self.assertEqual(self.module.EmitEvents(0), 10)
+    self.assertEqual(calls, list(range(10)))
+
+  def test_emit_events_batch_limit(self):
+    calls = []
+    for i in range(5):
+      self.module.CallLater(calls.append, i)
+
+    max_tasks_batch = self.module.max_tasks_batch
+    self.module.max_tasks_batch = 3
+    try:
+      self.assertEqual(self.module.EmitEvents(0), 3)
+      self.assertEqual(self.module.EmitEvents(0), 2)
+    finally:
+      self.module.max_tasks_batch = max_tasks_batch
+
+    self.assertEqual(calls, list(range(5)))
+
+  def test_update_period(self):
+    # OnUpdate isn't overloaded by test module
+    self.assertEqual(self.module.update_period, 0)
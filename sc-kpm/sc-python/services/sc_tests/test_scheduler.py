@@ -0,0 +1,175 @@
+from unittest import TestCase
+
+from common import *
+from sc import *
+
+import threading
+import time
+
+
+class TestAgent:
+  """Agent stub, that records processed events"""
+
+  def __init__(self, gate=None):
+    self.gate = gate
+    self.lock = threading.Lock()
+    self.events = []
+    self.contexts = []
+    self.running = 0
+    self.max_running = 0
+
+  def _run(self, evt):
+    with self.lock:
+      self.running += 1
+      self.max_running = max(self.max_running, self.running)
+      self.contexts.append(ScAgentScheduler.Context())
+
+    if self.gate:
+      self.gate.wait()
+    else:
+      time.sleep(0.001)
+
+    with self.lock:
+      self.running -= 1
+      self.events.append(evt.id)
+
+
+def MakeEvent(eid, key):
+  return ScEventParams(eid, ScAddr(), ScAddr(), ScAddrFromHash(key))
+
+
+def WaitFor(check, timeout=5.0):
+  start = time.monotonic()
+  while not check() and time.monotonic() - start < timeout:
+    time.sleep(0.001)
+
+
+class TestScAgentScheduler(TestCase):
+
+  def setUp(self):
+    self.scheduler = ScAgentScheduler(workers=4)
+
+  def tearDown(self):
+    self.scheduler.Shutdown()
+
+  def test_process(self):
+    agent = TestAgent()
+    self.scheduler.Add(agent)
+
+    for i in range(10):
+      self.assertTrue(self.scheduler.Submit(agent, MakeEvent(i, i + 1)))
+
+    self.scheduler.Shutdown()
+
+    # max_concurrency is 1 by default
+    self.assertEqual(agent.events, list(range(10)))
+    self.assertEqual(agent.max_running, 1)
+    for ctx in agent.contexts:
+      self.assertIsNotNone(ctx)
+    self.assertIsNone(ScAgentScheduler.Context())
+
+    stats = self.scheduler.Stats(agent)
+    self.assertEqual(stats['submitted'], 10)
+    self.assertEqual(stats['processed'], 10)
+    self.assertEqual(stats['queued'], 0)
+    self.assertEqual(stats['dropped'], 0)
+
+  def test_concurrency(self):
+    agent = TestAgent(threading.Event())
+    self.scheduler.Add(agent, ScAgentSettings(max_concurrency=2))
+
+    for i in range(4):
+      self.scheduler.Submit(agent, MakeEvent(i, i + 1))
+
+    WaitFor(lambda: agent.running == 2)
+    time.sleep(0.01)
+    self.assertEqual(agent.running, 2)
+    self.assertEqual(self.scheduler.Stats(agent)['queued'], 2)
+
+    agent.gate.set()
+    self.scheduler.Shutdown()
+    self.assertEqual(sorted(agent.events), list(range(4)))
+    self.assertEqual(agent.max_running, 2)
+
+  def test_ordered(self):
+    agent = TestAgent()
+    self.scheduler.Add(agent, ScAgentSettings(max_concurrency=4, ordered=True))
+
+    for i in range(20):
+      self.scheduler.Submit(agent, MakeEvent(i, 1))
+
+    self.scheduler.Shutdown()
+    self.assertEqual(agent.events, list(range(20)))
+    self.assertEqual(agent.max_running, 1)
+
+  def test_overflow_drop(self):
+    agent = TestAgent(threading.Event())
+    self.scheduler.Add(agent, ScAgentSettings(queue_length=2, overflow=ScOverflowPolicy.Drop))
+
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(0, 1)))
+    WaitFor(lambda: agent.running == 1)
+
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(1, 1)))
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(2, 2)))
+    self.assertFalse(self.scheduler.Submit(agent, MakeEvent(3, 3)))
+
+    agent.gate.set()
+    self.scheduler.Shutdown()
+    self.assertEqual(agent.events, [0, 1, 2])
+    self.assertEqual(self.scheduler.Stats(agent)['dropped'], 1)
+
+  def test_overflow_coalesce(self):
+    agent = TestAgent(threading.Event())
+    self.scheduler.Add(agent, ScAgentSettings(queue_length=2, overflow=ScOverflowPolicy.Coalesce))
+
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(0, 1)))
+    WaitFor(lambda: agent.running == 1)
+
+    self.scheduler.Submit(agent, MakeEvent(1, 1))
+    self.scheduler.Submit(agent, MakeEvent(2, 2))
+    # replaces event 1
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(3, 1)))
+    # drops the oldest event (3)
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(4, 4)))
+
+    agent.gate.set()
+    self.scheduler.Shutdown()
+    self.assertEqual(agent.events, [0, 2, 4])
+
+    stats = self.scheduler.Stats(agent)
+    self.assertEqual(stats['coalesced'], 1)
+    self.assertEqual(stats['dropped'], 1)
+
+  def test_overflow_block(self):
+    agent = TestAgent(threading.Event())
+    self.scheduler.Add(agent, ScAgentSettings(queue_length=1, overflow=ScOverflowPolicy.Block))
+
+    self.scheduler.Submit(agent, MakeEvent(0, 1))
+    WaitFor(lambda: agent.running == 1)
+    self.scheduler.Submit(agent, MakeEvent(1, 1))
+
+    # release agent after a while, to unblock submit
+    timer = threading.Timer(0.05, agent.gate.set)
+    timer.start()
+
+    self.assertTrue(self.scheduler.Submit(agent, MakeEvent(2, 1)))
+    self.assertTrue(agent.gate.is_set())
+
+    self.scheduler.Shutdown()
+    self.assertEqual(agent.events, [0, 1, 2])
+
+  def test_remove(self):
+    agent = TestAgent(threading.Event())
+    self.scheduler.Add(agent)
+
+    self.scheduler.Submit(agent, MakeEvent(0, 1))
+    WaitFor(lambda: agent.running == 1)
+    self.scheduler.Submit(agent, MakeEvent(1, 1))
+
+    self.scheduler.Remove(agent)
+    self.assertFalse(self.scheduler.Submit(agent, MakeEvent(2, 1)))
+    self.assertIsNone(self.scheduler.Stats(agent))
+
+    agent.gate.set()
+    self.scheduler.Shutdown()
+    self.assertEqual(agent.events, [0])
@@ -100,3 +100,88 @@ class TestScSet(TestCase):
     _set.Clear()
     for a in elements:
       self.assertFalse(_set.Has(a))
+
+  def test_sc_set_bulk(self):
+    ctx = TestScSet.MemoryCtx()
+
+    addrSet = ctx.CreateNode(ScType.Node)
+    elements = [ctx.CreateNode(ScType.NodeConst) for _ in range(10)]
+    other = ctx.CreateNode(ScType.NodeConst)
+
+    _set = ScSet(ctx, addrSet)
+    self.assertEqual(_set.Size(), 0)
+
+    # duplicates are added once
+    added = _set.AddMany(elements + [elements[0]])
+    self.assertEqual(list(added), [True] * len(elements) + [False])
+    self.assertEqual(list(_set.AddMany(elements[:2])), [False, False])
+    self.assertEqual(_set.Size(), len(elements))
+
+    # elements can be passed as packed array
+    values = ScAddrArray.FromList([el.ToInt() for el in elements[:3]] + [other.ToInt()])
+    self.assertEqual(list(_set.HasMany(values)), [True, True, True, False])
+
+    self.assertEqual(sorted(_set.ToArray()), sorted(el.ToInt() for el in elements))
+    for el in _set.ToList():
+      self.assertTrue(el in elements)
+
+    # element, that connected with set by two edges, is counted once
+    ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, addrSet, elements[0])
+    self.assertEqual(_set.Size(), len(elements))
+    self.assertEqual(sorted(_set.ToArray()), sorted(el.ToInt() for el in elements))
+
+    removed = _set.RemoveMany(elements[:5] + [other])
+    self.assertEqual(list(removed), [True] * 5 + [False])
+    self.assertEqual(list(_set.HasMany(elements)), [False] * 5 + [True] * 5)
+    self.assertEqual(_set.Size(), 5)
+
+    _set.Clear()
+    self.assertEqual(_set.Size(), 0)
+
+  def test_sc_set_relation_bulk(self):
+    ctx = TestScSet.MemoryCtx()
+
+    addrSet = ctx.CreateNode(ScType.Node)
+    relAddr = ctx.CreateNode(ScType.NodeConstNoRole)
+    elements = [ctx.CreateNode(ScType.NodeConst) for _ in range(5)]
+
+    _set = ScRelationSet(ctx, addrSet, relAddr)
+    self.assertEqual(list(_set.AddMany(elements)), [True] * len(elements))
+
+    # elements are linked by relation
+    for el in elements:
+      self.assertTrue(_set.Has(el))
+    self.assertFalse(ScSet(ctx, addrSet).Has(elements[0]))
+
+    self.assertEqual(_set.Size(), len(elements))
+    self.assertEqual(list(_set.HasMany([el.ToInt() for el in elements])), [True] * len(elements))
+
+    self.assertEqual(list(_set.RemoveMany(elements[:2])), [True, True])
+    self.assertFalse(_set.Has(elements[0]))
+    self.assertEqual(_set.Size(), 3)
+
+  def test_sc_set_algebra(self):
+    ctx = TestScSet.MemoryCtx()
+
+    elements = [ctx.CreateNode(ScType.NodeConst) for _ in range(6)]
+    values = [el.ToInt() for el in elements]
+
+    set1 = ScSet(ctx, ctx.CreateNode(ScType.Node))
+    set2 = ScSet(ctx, ctx.CreateNode(ScType.Node))
+    set3 = ScRelationSet(ctx, ctx.CreateNode(ScType.Node), ctx.CreateNode(ScType.NodeConstNoRole))
+
+    set1.AddMany(elements[:4])
+    set2.AddMany(elements[2:])
+    set3.AddMany(elements[3:5])
+
+    self.assertEqual(list(set1.Union(set2)), sorted(values))
+    self.assertEqual(list(set1.Intersect(set2)), sorted(values[2:4]))
+    self.assertEqual(list(set1.Intersect(set2, set3)), [values[3]])
+    self.assertEqual(list(set1.Difference(set2)), sorted(values[:2]))
+    self.assertEqual(list(set2.Difference(set1, set3)), [values[5]])
+    self.assertEqual(list(set1.Union()), sorted(values[:4]))
+
+    target = ScSet(ctx, ctx.CreateNode(ScType.Node))
+    result = set3.Union(set1, target=target)
+    self.assertEqual(list(result), sorted(values[:5]))
+    self.assertEqual(sorted(target.ToArray()), sorted(values[:5]))
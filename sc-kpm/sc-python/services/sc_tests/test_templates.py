@@ -61,4 +61,44 @@ class TestScTemplate(TestCase):
     self.assertEqual(searchResult[0]['_class'], classAddr)
     self.assertEqual(searchResult[0]['_inst'], instAddr)
     self.assertEqual(searchResult[0]['_edge'], edgeAddr)
-    
\ No newline at end of file
+    
+  def test_to_array(self):
+    ctx = TestScTemplate.MemoryCtx()
+
+    classAddr = ctx.CreateNode(ScType.NodeConstClass)
+    self.assertTrue(classAddr.IsValid())
+
+    instances = []
+    for i in range(5):
+      instAddr = ctx.CreateNode(ScType.NodeConst)
+      self.assertTrue(instAddr.IsValid())
+      edgeAddr = ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, classAddr, instAddr)
+      self.assertTrue(edgeAddr.IsValid())
+      instances.append(instAddr)
+
+    templ = ScTemplate()
+    templ.Triple(
+      classAddr,
+      ScType.EdgeAccessVarPosPerm,
+      ScType.NodeVar >> '_inst')
+
+    searchResult = ctx.HelperSearchTemplate(templ)
+    self.assertEqual(searchResult.Size(), len(instances))
+
+    data = searchResult.ToArray()
+    self.assertEqual(data.format, 'Q')
+    self.assertEqual(data.shape, (searchResult.Size(), 3))
+
+    inst = searchResult.Aliases()['_inst']
+    for idx in range(searchResult.Size()):
+      for it in range(3):
+        self.assertEqual(data[idx, it], searchResult[idx][it].ToInt())
+    self.assertEqual(sorted(row[inst] for row in data.tolist()), sorted(addr.ToInt() for addr in instances))
+
+    # range
+    data = searchResult.ToArray(3, 10)
+    self.assertEqual(data.shape, (2, 3))
+    self.assertEqual(data.tolist()[0][inst], searchResult[3][inst].ToInt())
+
+    data = searchResult.ToArray(5)
+    self.assertEqual(len(data), 0)
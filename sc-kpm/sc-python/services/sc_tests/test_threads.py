@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from sc import *
+
+import bisect
+import sys
+import threading
+import time
+
+
+class TestScThreads(TestCase):
+
+  instances_num = 10000
+  searches_num = 20
+
+  def setUp(self):
+    ctx = TestScThreads.MemoryCtx()
+
+    self.class_addr = ctx.CreateNode(ScType.NodeConstClass)
+    self.assertTrue(self.class_addr.IsValid())
+
+    for _ in range(self.instances_num):
+      ctx.CreateEdge(ScType.EdgeAccessConstPosPerm, self.class_addr, ctx.CreateNode(ScType.NodeConst))
+
+  def searchWorkload(self):
+    ctx = ScMemoryContext.Create('TestScThreads')
+
+    templ = ScTemplate()
+    templ.Triple(
+      self.class_addr,
+      ScType.EdgeAccessVarPosPerm,
+      ScType.NodeVar >> '_inst')
+
+    for _ in range(self.searches_num):
+      start = time.perf_counter()
+      result = ctx.HelperSearchTemplate(templ)
+      self.intervals.append((start, time.perf_counter()))
+      self.sizes.append(result.Size())
+
+  def test_parallel_search(self):
+    self.sizes = []
+    self.intervals = []
+    # times, when main thread was running
+    stamps = []
+
+    # thread, that holds interpreter lock, gives it to waiting thread after switch interval
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.0005)
+    try:
+      worker = threading.Thread(target=self.searchWorkload)
+      worker.start()
+      while worker.is_alive():
+        stamps.append(time.perf_counter())
+        time.sleep(0.0001)
+      worker.join()
+    finally:
+      sys.setswitchinterval(switch_interval)
+
+    self.assertEqual(self.sizes, [self.instances_num] * self.searches_num)
+
+    # interpreter lock is released during search, so main thread runs in the middle
+    # of search. Edges of interval are skipped, because main thread can run there anyway
+    progressed = 0
+    for start, end in self.intervals:
+      margin = (end - start) / 4
+      idx = bisect.bisect_right(stamps, start + margin)
+      if idx < len(stamps) and stamps[idx] < end - margin:
+        progressed += 1
+
+    self.assertGreater(progressed, 0)
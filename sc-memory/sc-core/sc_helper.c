@@ -16,6 +16,10 @@ sc_bool sc_helper_is_initialized = SC_FALSE;
 sc_char **keynodes_str = 0;
 sc_addr *sc_keynodes = 0;
 
+// incremented on each change of system identifiers
+static volatile gint s_system_identifiers_version = 0;
+static sc_event *s_system_identifiers_event = 0;
+
 sc_result resolve_nrel_system_identifier(sc_memory_context const * ctx)
 {
   sc_addr *results = 0;
@@ -132,6 +136,40 @@ sc_result sc_helper_init(sc_memory_context * ctx)
   return SC_RESULT_OK;
 }
 
+sc_result _on_system_identifier_removed(sc_event const * event, sc_addr arg)
+{
+  (void)event;
+  (void)arg;
+
+  g_atomic_int_inc(&s_system_identifiers_version);
+  return SC_RESULT_OK;
+}
+
+void sc_helper_start_watch(sc_memory_context const * ctx)
+{
+  // system identifier is removed with an arc from nrel_system_identifier (on element deletion)
+  s_system_identifiers_event = sc_event_new(ctx,
+                                            sc_keynodes[SC_KEYNODE_NREL_SYSTEM_IDENTIFIER],
+                                            SC_EVENT_REMOVE_OUTPUT_ARC,
+                                            0,
+                                            _on_system_identifier_removed,
+                                            0);
+}
+
+void sc_helper_stop_watch()
+{
+  if (s_system_identifiers_event != 0)
+  {
+    sc_event_destroy(s_system_identifiers_event);
+    s_system_identifiers_event = 0;
+  }
+}
+
+sc_uint32 sc_helper_get_system_identifiers_version()
+{
+  return (sc_uint32)g_atomic_int_get(&s_system_identifiers_version);
+}
+
 void sc_helper_shutdown()
 {
   g_message("Shutdown sc-helper");
@@ -251,6 +289,8 @@ sc_result sc_helper_set_system_identifier(sc_memory_context * ctx, sc_addr addr,
   if (SC_ADDR_IS_EMPTY(arc_addr))
     return SC_RESULT_ERROR;
 
+  g_atomic_int_inc(&s_system_identifiers_version);
+
   return SC_RESULT_OK;
 }
 
@@ -39,6 +39,12 @@ _SC_EXTERN sc_result sc_helper_find_element_by_system_identifier(sc_memory_conte
  */
 _SC_EXTERN sc_result sc_helper_set_system_identifier(sc_memory_context * ctx, sc_addr addr, const sc_char* data, sc_uint32 len);
 
+/*! Returns version of system identifiers. It increments synchronously, when system identifier is set
+ * by sc_helper_set_system_identifier, and asynchronously (by sc-event), when element with system identifier
+ * is deleted. Use it to invalidate caches of system identifiers
+ */
+_SC_EXTERN sc_uint32 sc_helper_get_system_identifiers_version();
+
 /*! Return sc-addr of system identifier for specified sc-element
  * @param el sc-addr of element to get it system identifier
  * @param sys_idtf_addr Pointer to found sc-addr of system identifier
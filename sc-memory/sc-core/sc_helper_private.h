@@ -16,6 +16,13 @@
  */
 sc_result sc_helper_init(sc_memory_context const * ctx);
 
+/*! Subscribes to removing of system identifiers. Need to be called after events initialization
+ */
+void sc_helper_start_watch(sc_memory_context const * ctx);
+
+//! Destroys event created by sc_helper_start_watch
+void sc_helper_stop_watch();
+
 /*! Shuts down sc-helper.
  * @remarks This function need to be called once at the end of sc-helper usage
  */
@@ -68,6 +68,7 @@ sc_memory_context* sc_memory_initialize(const sc_memory_params *params)
     g_error("Error while initialize events module");
     goto error;
   }
+  sc_helper_start_watch(s_memory_default_ctx);
 
   if (params->ext_path)
   {
@@ -116,6 +117,7 @@ void sc_memory_shutdown(sc_bool save_state)
 
   sc_memory_shutdown_ext();
 
+  sc_helper_stop_watch();
   sc_events_shutdown();
   sc_config_shutdown();
 
@@ -12,6 +12,12 @@
 #include "../utils/sc_cache.hpp"
 #include "../utils/sc_lock.hpp"
 
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <mutex>
+#include <thread>
+
 namespace bp = boost::python;
 
 extern "C"
@@ -110,7 +116,6 @@ class PyScEvent
 public:
   using EventID = uint32_t;
 
-protected:
   struct EmitParams
   {
     EventID m_id;
@@ -119,6 +124,7 @@ protected:
     ScAddr m_otherAddr;
   };
 
+protected:
   explicit PyScEvent(ScEvent * evt, EventID id)
     : m_id(id)
   {
@@ -184,6 +190,135 @@ private:
 };
 
 
+/* Batch of emitted events, that passes to python by one call.
+ * Events are stored in a native array, so python objects are created
+ * just for requested values
+ */
+class PyEventBatch
+{
+public:
+  using EventsVector = std::vector<PyScEvent::EmitParams>;
+
+  explicit PyEventBatch(EventsVector && events)
+    : m_events(std::move(events))
+  {
+  }
+
+  size_t Size() const
+  {
+    return m_events.size();
+  }
+
+  // returns tuple (id, addr, edge_addr, other_addr)
+  bp::tuple Get(size_t idx) const
+  {
+    if (idx >= m_events.size())
+    {
+      PyErr_SetString(PyExc_IndexError, "Event index out of range");
+      bp::throw_error_already_set();
+    }
+
+    PyScEvent::EmitParams const & params = m_events[idx];
+    return bp::make_tuple(params.m_id, params.m_addr, params.m_edgeAddr, params.m_otherAddr);
+  }
+
+  /* Returns memoryview of uint64 values with shape (size, 4). Each row contains
+   * event id and hashes of addr, edge_addr, other_addr
+   */
+  bp::object ToArray() const
+  {
+    bp::object buffer(bp::handle<>(PyBytes_FromStringAndSize(nullptr, m_events.size() * 4 * sizeof(uint64_t))));
+    uint64_t * data = reinterpret_cast<uint64_t *>(PyBytes_AS_STRING(buffer.ptr()));
+    for (auto const & params : m_events)
+    {
+      *data++ = params.m_id;
+      *data++ = params.m_addr.Hash();
+      *data++ = params.m_edgeAddr.Hash();
+      *data++ = params.m_otherAddr.Hash();
+    }
+
+    bp::object view(bp::handle<>(PyMemoryView_FromObject(buffer.ptr())));
+    if (m_events.empty())
+      return view.attr("cast")("Q");
+
+    return view.attr("cast")("Q", bp::make_tuple(m_events.size(), 4));
+  }
+
+private:
+  EventsVector m_events;
+};
+
+/* Ring buffer of emitted events. It grows, when there are no free space,
+ * because emitting thread can't wait for python (it can hold GIL). When buffer
+ * reaches `maxCapacity`, the oldest event is dropped to store a new one
+ */
+class PyEventsBuffer
+{
+public:
+  PyEventsBuffer(size_t capacity, size_t maxCapacity)
+    : m_items(std::max(std::min(capacity, maxCapacity), size_t(1)))
+    , m_maxCapacity(std::max(maxCapacity, size_t(1)))
+    , m_head(0)
+    , m_size(0)
+  {
+  }
+
+  size_t Size() const
+  {
+    return m_size;
+  }
+
+  // returns false, when the oldest event was dropped
+  bool Push(PyScEvent::EmitParams const & params)
+  {
+    if (m_size == m_items.size())
+    {
+      if (m_items.size() >= m_maxCapacity)
+      {
+        m_items[m_head] = params;
+        m_head = (m_head + 1) % m_items.size();
+        return false;
+      }
+
+      Grow();
+    }
+
+    m_items[(m_head + m_size) % m_items.size()] = params;
+    ++m_size;
+    return true;
+  }
+
+  void PopTo(PyEventBatch::EventsVector & outEvents, size_t maxCount)
+  {
+    size_t const count = std::min(maxCount, m_size);
+    outEvents.reserve(outEvents.size() + count);
+    for (size_t i = 0; i < count; ++i)
+    {
+      outEvents.push_back(m_items[m_head]);
+      m_head = (m_head + 1) % m_items.size();
+    }
+    m_size -= count;
+  }
+
+private:
+  void Grow()
+  {
+    std::vector<PyScEvent::EmitParams> items(std::min(m_items.size() * 2, m_maxCapacity));
+    for (size_t i = 0; i < m_size; ++i)
+      items[i] = m_items[(m_head + i) % m_items.size()];
+
+    m_items.swap(items);
+    m_head = 0;
+  }
+
+private:
+  std::vector<PyScEvent::EmitParams> m_items;
+  size_t m_maxCapacity;
+  size_t m_head;
+  size_t m_size;
+};
+
+
 class PyBridgeWrap
 {
   using EventsMap = std::unordered_map<PyScEvent::EventID, boost::shared_ptr<PyScEvent>>;
@@ -201,6 +336,8 @@ public:
 
   ~PyBridgeWrap()
   {
+    StopEventBatching();
+
     for (auto it : m_events)
       ClearEvent(it.second);
 
@@ -236,17 +373,68 @@ public:
 
   void Finish()
   {
+    StopEventBatching();
     m_impl->PythonFinish();
   }
 
+  /* Enables delivery of events by batches into `onEventBatch` delegate. Batch is delivered,
+   * when it contains `maxBatchSize` events, or after `flushLatencyUs` microseconds
+   * since the first event in batch was emitted. Use zero `maxBatchSize` to disable batching.
+   * Not more than `maxQueueSize` events wait for delivery, the oldest ones are dropped
+   */
+  void SetEventBatching(size_t maxBatchSize, uint32_t flushLatencyUs, size_t maxQueueSize)
+  {
+    StopEventBatching();
+    if (maxBatchSize == 0)
+      return;
+
+    {
+      std::lock_guard<std::mutex> lock(m_batchMutex);
+      m_batchSize = maxBatchSize;
+      m_batchLatency = std::chrono::microseconds(flushLatencyUs);
+      m_batchBuffer.reset(new PyEventsBuffer(maxBatchSize * kBatchBufferFactor, std::max(maxQueueSize, maxBatchSize)));
+      m_batchStop = false;
+      m_batchOverflow = false;
+    }
+
+    m_batchThread = std::thread(&PyBridgeWrap::FlushEventsLoop, this);
+  }
+
   bool IsExist() const
   {
     return m_impl->IsInitialized();
   }
 
+  // returns number of events, that were dropped without delivery into python
+  uint64_t GetDroppedEvents() const
+  {
+    return m_droppedEvents;
+  }
+
   // calls from PyScEvent to request emit it in main thread
   void EmitEvent(PyScEvent::EmitParams const & params)
   {
+    {
+      std::lock_guard<std::mutex> lock(m_batchMutex);
+      if (m_batchBuffer)
+      {
+        if (!m_batchBuffer->Push(params))
+        {
+          ++m_droppedEvents;
+          if (!m_batchOverflow)
+          {
+            m_batchOverflow = true;
+            SC_LOG_WARNING("Python events queue is full, the oldest events are dropped");
+          }
+        }
+
+        if (m_batchBuffer->Size() == 1 || m_batchBuffer->Size() >= m_batchSize)
+          m_batchCond.notify_all();
+
+        return;
+      }
+    }
+
     if (m_eventDelegate)
     {
       py::WithGIL gil;
@@ -304,7 +492,101 @@ protected:
       CallPythonFunction(m_closeDelegate);
   }
 
+  void StopEventBatching()
+  {
+    if (!m_batchThread.joinable())
+      return;
+
+    {
+      std::lock_guard<std::mutex> lock(m_batchMutex);
+      m_batchStop = true;
+    }
+    m_batchCond.notify_all();
+
+    // flush thread needs GIL to deliver the rest of events
+    if (Py_IsInitialized() && PyGILState_Check())
+    {
+      py::WithoutGIL nogil;
+      m_batchThread.join();
+    }
+    else
+    {
+      m_batchThread.join();
+    }
+
+    std::lock_guard<std::mutex> lock(m_batchMutex);
+    m_batchBuffer.reset();
+  }
+
+  void FlushEventsLoop()
+  {
+    PyEventBatch::EventsVector events;
+
+    std::unique_lock<std::mutex> lock(m_batchMutex);
+    while (true)
+    {
+      m_batchCond.wait(lock, [this]() { return m_batchStop || m_batchBuffer->Size() > 0; });
+      if (m_batchBuffer->Size() == 0)
+        break;
+
+      // wait for more events to make batch bigger
+      if (!m_batchStop)
+      {
+        m_batchCond.wait_for(lock, m_batchLatency, [this]() {
+          return m_batchStop || m_batchBuffer->Size() >= m_batchSize;
+        });
+      }
+
+      events.clear();
+      m_batchBuffer->PopTo(events, m_batchSize);
+      m_batchOverflow = false;
+
+      lock.unlock();
+      DeliverEventBatch(events);
+      lock.lock();
+    }
+  }
+
+  void DeliverEventBatch(PyEventBatch::EventsVector & events)
+  {
+    py::WithGIL gil;
+    if (m_eventBatchDelegate.is_none() && m_eventDelegate.is_none())
+    {
+      m_droppedEvents += events.size();
+      SC_LOG_WARNING("There are no python delegates, " << events.size() << " events are dropped");
+      return;
+    }
+
+    try
+    {
+      if (m_eventBatchDelegate.is_none())
+      {
+        // fallback to delivery of each event separately
+        for (auto const & params : events)
+        {
+          CallPythonFunctionNoGIL(
+            m_eventDelegate,
+            bp::object(params.m_id),
+            bp::object(params.m_addr),
+            bp::object(params.m_edgeAddr),
+            bp::object(params.m_otherAddr));
+        }
+        return;
+      }
+
+      boost::shared_ptr<PyEventBatch> batch(new PyEventBatch(std::move(events)));
+      CallPythonFunctionNoGIL(m_eventBatchDelegate, batch);
+    }
+    catch (bp::error_already_set const &)
+    {
+      PyErr_Print();
+    }
+  }
+
 private:
+  // initial capacity of events buffer in batches
+  static size_t const kBatchBufferFactor = 4;
+
   static PyScEvent::EventID ms_idCounter;
   mutable py::ScPythonBridgePtr m_impl;
   ScMemoryContext m_ctx;
@@ -312,10 +594,21 @@ private:
   utils::ScLock m_eventsLock;
   EventsMap m_events;
 
+  std::mutex m_batchMutex;
+  std::condition_variable m_batchCond;
+  std::thread m_batchThread;
+  std::unique_ptr<PyEventsBuffer> m_batchBuffer;
+  size_t m_batchSize = 0;
+  std::chrono::microseconds m_batchLatency;
+  bool m_batchStop = false;
+  bool m_batchOverflow = false;
+  std::atomic<uint64_t> m_droppedEvents = { 0 };
+
 public:
   // delegates that will be used in python module
   bp::object m_closeDelegate;
   bp::object m_eventDelegate;
+  bp::object m_eventBatchDelegate;
 };
 
 PyScEvent::EventID PyBridgeWrap::ms_idCounter = 0;
@@ -358,6 +651,7 @@ BOOST_PYTHON_MODULE(scb)
 {
   bp::register_ptr_to_python<boost::shared_ptr<PyScEvent>>();
   bp::register_ptr_to_python<boost::shared_ptr<PyBridgeWrap>>();
+  bp::register_ptr_to_python<boost::shared_ptr<PyEventBatch>>();
 
   bp::class_<PythonLog>("CppLog", bp::init<>())
     .def("write", bp::make_function(&PythonLog::Write))
@@ -381,6 +675,13 @@ BOOST_PYTHON_MODULE(scb)
     .def("GetID", bp::make_function(&PyScEvent::GetID))
     ;
 
+  bp::class_<PyEventBatch, boost::noncopyable>("ScPythonEventBatch", bp::no_init)
+    .def("Size", bp::make_function(&PyEventBatch::Size))
+    .def("__len__", bp::make_function(&PyEventBatch::Size))
+    .def("__getitem__", bp::make_function(&PyEventBatch::Get))
+    .def("ToArray", bp::make_function(&PyEventBatch::ToArray))
+    ;
+
   bp::class_<PyBridgeWrap, boost::noncopyable>("ScPythonBridge", bp::no_init)
     .def("Ready", bp::make_function(&PyBridgeWrap::Ready))
     .def("Finish", bp::make_function(&PyBridgeWrap::Finish))
@@ -388,6 +689,9 @@ BOOST_PYTHON_MODULE(scb)
     .def("DestroyEvent", bp::make_function(&PyBridgeWrap::DestroyEvent))
     .def_readwrite("onClose", &PyBridgeWrap::m_closeDelegate)
     .def_readwrite("onEvent", &PyBridgeWrap::m_eventDelegate)
+    .def_readwrite("onEventBatch", &PyBridgeWrap::m_eventBatchDelegate)
+    .def("SetEventBatching", bp::make_function(&PyBridgeWrap::SetEventBatching))
+    .def("DroppedEvents", bp::make_function(&PyBridgeWrap::GetDroppedEvents))
     .def("InitParams", bp::make_function(&PyBridgeWrap::GetInitParams))
     ;
 }
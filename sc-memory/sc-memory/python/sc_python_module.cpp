@@ -1,12 +1,18 @@
 #include "sc_python_module.hpp"
+#include "sc_python_threads.hpp"
 
 #include "../sc_memory.hpp"
 #include "../sc_stream.hpp"
 #include "../sc_link.hpp"
+#include "../sc_link_index.hpp"
 
 #include "../kpm/sc_agent.hpp"
 
+#include <algorithm>
 #include <iostream>
+#include <iterator>
+#include <unordered_map>
+#include <unordered_set>
 
 extern "C"
 {
@@ -27,6 +33,24 @@ void translateException(utils::ScException const & e)
 namespace impl
 {
 
+// Creates bytes object, that can store `size` uint64 values
+bp::object _makeUInt64Buffer(size_t size, uint64_t *& outData)
+{
+  bp::object buffer(bp::handle<>(PyBytes_FromStringAndSize(nullptr, size * sizeof(uint64_t))));
+  outData = reinterpret_cast<uint64_t *>(PyBytes_AS_STRING(buffer.ptr()));
+  return buffer;
+}
+
+// Returns uint64 memoryview of buffer with shape (rows, columns). For empty buffer 1-D view returns
+bp::object _makeUInt64View(bp::object const & buffer, size_t rows, size_t columns = 0)
+{
+  bp::object view(bp::handle<>(PyMemoryView_FromObject(buffer.ptr())));
+  if (rows == 0 || columns == 0)
+    return view.attr("cast")("Q");
+
+  return view.attr("cast")("Q", bp::make_tuple(rows, columns));
+}
+
 class PyTemplateGenResult
 {
 public:
@@ -173,6 +197,41 @@ public:
     return bp::object();
   }
 
+  /* Returns memoryview with `count` results starting from `start` as
+   * 2-D array of uint64 (ScAddr hashes) with shape (rows, columns).
+   * Negative `count` means all results till the end.
+   * If there are no values, then empty 1-D view returns
+   */
+  bp::object ToArray(size_t start = 0, int64_t count = -1) const
+  {
+    size_t const size = m_result->Size();
+    start = std::min(start, size);
+    size_t const rows = count < 0 ? size - start : std::min(static_cast<size_t>(count), size - start);
+
+    ScTemplateSearchResultItem item(nullptr, nullptr);
+    size_t columns = 0;
+    if (rows > 0 && m_result->GetResultItemSafe(start, item))
+      columns = item.Size();
+
+    uint64_t * data = nullptr;
+    bp::object buffer = _makeUInt64Buffer(rows * columns, data);
+    {
+      py::WithoutGIL nogil;
+      for (size_t i = 0; i < rows; ++i)
+      {
+        m_result->GetResultItemSafe(start + i, item);
+        size_t const itemSize = std::min(item.Size(), columns);
+        for (size_t j = 0; j < itemSize; ++j)
+          data[j] = item[j].Hash();
+        std::fill(data + itemSize, data + columns, 0);
+
+        data += columns;
+      }
+    }
+
+    return _makeUInt64View(buffer, rows, columns);
+  }
+
   bp::dict GetReplaceAliases() const
   {
     return m_replacements;
@@ -321,6 +380,63 @@ uint8_t PyLinkContent::Type::String = 0;
 uint8_t PyLinkContent::Type::Int = 1;
 uint8_t PyLinkContent::Type::Float = 2;
 
+// Provides access to content of sc-link by chunks, without copying of the whole content
+class PyLinkStream
+{
+public:
+  explicit PyLinkStream(ScStreamPtr const & stream)
+    : m_stream(stream)
+  {
+  }
+
+  size_t Size() const
+  {
+    return m_stream->Size();
+  }
+
+  size_t Pos() const
+  {
+    return m_stream->Pos();
+  }
+
+  bool Seek(size_t pos)
+  {
+    if (pos > m_stream->Size())
+      return false;
+
+    return m_stream->Seek(SC_STREAM_SEEK_SET, pos);
+  }
+
+  // Returns bytes object with at most `size` bytes from current position. Empty object means end of stream
+  bp::object Read(size_t size)
+  {
+    size = std::min(size, m_stream->Size() - std::min(m_stream->Pos(), m_stream->Size()));
+
+    bp::object buffer(bp::handle<>(PyBytes_FromStringAndSize(nullptr, size)));
+    size_t readBytes = 0;
+    bool isRead = true;
+    if (size > 0)
+    {
+      sc_char * data = PyBytes_AS_STRING(buffer.ptr());
+
+      // buffer isn't visible for other threads yet
+      py::WithoutGIL nogil;
+      isRead = m_stream->Read(data, size, readBytes);
+    }
+
+    if (!isRead)
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidState, "Can't read content of sc-link");
+
+    if (readBytes < size)
+      return buffer.slice(0, readBytes);
+
+    return buffer;
+  }
+
+private:
+  ScStreamPtr m_stream;
+};
+
 // ----------------------------
 
 ScMemoryContext * _context_CreateInstance(std::string const & name)
@@ -336,7 +452,12 @@ bp::list _context_FindLinksByContent(ScMemoryContext & self, bp::object const &
   if (strContent.check())
   {
     ScStreamPtr stream = ScStreamConverter::StreamFromString(strContent);
-    ScAddrVector const foundAddrs = self.FindLinksByContent(stream);
+    ScAddrVector foundAddrs;
+    {
+      py::WithoutGIL nogil;
+      foundAddrs = self.FindLinksByContent(stream);
+    }
+
     for (auto addr : foundAddrs)
       result.append(bp::object(addr));
   }
@@ -349,6 +470,35 @@ bp::list _context_FindLinksByContent(ScMemoryContext & self, bp::object const &
   return result;
 }
 
+bp::list _context_FindLinksByContentIndex(ScMemoryContext & self, std::string const & query,
+                                          ScLinkContentIndex::Mode mode, size_t limit)
+{
+  ScAddrVector foundAddrs;
+  {
+    py::WithoutGIL nogil;
+    foundAddrs = ScLinkContentIndex::Find(*self, query, mode, limit);
+  }
+
+  bp::list result;
+  for (auto addr : foundAddrs)
+    result.append(bp::object(addr));
+
+  return result;
+}
+
+void _context_setLinkContentIndexEnabled(ScMemoryContext & self, bool isEnabled)
+{
+  py::WithoutGIL nogil;
+  ScLinkContentIndex::SetEnabled(*self, isEnabled);
+}
+
+bool _context_deleteElement(ScMemoryContext & self, ScAddr const & addr)
+{
+  // removes all connected elements
+  py::WithoutGIL nogil;
+  return self.EraseElement(addr);
+}
+
 bp::tuple _context_getEdgeInfo(ScMemoryContext & self, ScAddr const & addr)
 {
   ScAddr src, trg;
@@ -384,21 +534,529 @@ bool _context_setLinkContent(ScMemoryContext & self, ScAddr const & linkAddr, bp
   if (s.check())
   {
     ScStreamPtr stream = ScStreamMakeRead(std::string(s));
+
+    py::WithoutGIL nogil;
     return self.SetLinkContent(linkAddr, stream);
   }
 
   return false;
 }
 
+class BatchElement
+{
+public:
+  enum class Kind : uint8_t
+  {
+    Node,
+    Edge,
+    Link
+  };
+
+  enum class ContentType : uint8_t
+  {
+    None,
+    Int,
+    Double,
+    String
+  };
+
+  Kind m_kind = Kind::Node;
+  ScType m_type;
+
+  // edge
+  ScAddr m_src;
+  ScAddr m_trg;
+  int64_t m_srcRef = -1;
+  int64_t m_trgRef = -1;
+
+  // link
+  ContentType m_contentType = ContentType::None;
+  int32_t m_intValue = 0;
+  double m_doubleValue = 0.0;
+  std::string m_stringValue;
+};
+
+// Parses source or target of edge: `ScAddr` or index of previous element in batch
+void _batchParseEdgeEnd(bp::object const & value, size_t index, ScAddr & outAddr, int64_t & outRef)
+{
+  bp::extract<ScAddr> ae(value);
+  if (ae.check())
+  {
+    outAddr = static_cast<ScAddr>(ae);
+    return;
+  }
+
+  bp::extract<int64_t> ie(value);
+  if (ie.check())
+  {
+    outRef = static_cast<int64_t>(ie);
+    if (outRef >= 0 && static_cast<size_t>(outRef) < index)
+      return;
+
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidParams,
+                       "Element " << index << " refers to element " << outRef << ", that isn't created before it");
+  }
+
+  SC_THROW_EXCEPTION(utils::ExceptionInvalidParams,
+                     "Edge source and target should be ScAddr or int (index of element in batch)");
+}
+
+BatchElement _batchParseElement(bp::object const & item, size_t index)
+{
+  BatchElement el;
+
+  bp::ssize_t const itemLen = bp::len(item);
+  bp::extract<std::string> ke(itemLen > 0 ? item[0] : bp::object());
+  if (!ke.check() || itemLen < 2)
+  {
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidParams,
+                       "Element " << index << " should be a tuple that starts with 'node', 'edge' or 'link' and ScType");
+  }
+
+  bp::extract<ScType> te(item[1]);
+  if (!te.check())
+  {
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidType,
+                       "Second value of element " << index << " should be an instance of ScType");
+  }
+  el.m_type = static_cast<ScType>(te);
+
+  std::string const kind = static_cast<std::string>(ke);
+  if (kind == "node" && itemLen == 2)
+  {
+    el.m_kind = BatchElement::Kind::Node;
+  }
+  else if (kind == "edge" && itemLen == 4)
+  {
+    el.m_kind = BatchElement::Kind::Edge;
+    _batchParseEdgeEnd(item[2], index, el.m_src, el.m_srcRef);
+    _batchParseEdgeEnd(item[3], index, el.m_trg, el.m_trgRef);
+  }
+  else if (kind == "link" && (itemLen == 2 || itemLen == 3))
+  {
+    el.m_kind = BatchElement::Kind::Link;
+
+    bp::object const content = itemLen == 3 ? bp::object(item[2]) : bp::object();
+    if (!content.is_none())
+    {
+      bp::extract<int32_t> l(content);
+      bp::extract<double> d(content);
+      bp::extract<std::string> s(content);
+      if (l.check())
+      {
+        el.m_contentType = BatchElement::ContentType::Int;
+        el.m_intValue = l;
+      }
+      else if (d.check())
+      {
+        el.m_contentType = BatchElement::ContentType::Double;
+        el.m_doubleValue = d;
+      }
+      else if (s.check())
+      {
+        el.m_contentType = BatchElement::ContentType::String;
+        el.m_stringValue = static_cast<std::string>(s);
+      }
+      else
+      {
+        SC_THROW_EXCEPTION(utils::ExceptionInvalidType,
+                           "Content of link " << index << " should be int, float or str");
+      }
+    }
+  }
+  else
+  {
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidParams,
+                       "Unknown element " << index << ": ('node', type), ('edge', type, src, trg) or "
+                       "('link', type[, content]) supported");
+  }
+
+  return el;
+}
+
+bp::object _context_createElementsBatch(ScMemoryContext & self, bp::object & spec)
+{
+  bp::ssize_t const count = bp::len(spec);
+  std::vector<BatchElement> elements;
+  elements.reserve(count);
+  for (bp::ssize_t i = 0; i < count; ++i)
+    elements.emplace_back(_batchParseElement(spec[i], i));
+
+  uint64_t * data = nullptr;
+  bp::object buffer = _makeUInt64Buffer(elements.size(), data);
+  {
+    py::WithoutGIL nogil;
+
+    std::vector<ScAddr> created(elements.size());
+    for (size_t i = 0; i < elements.size(); ++i)
+    {
+      BatchElement const & el = elements[i];
+      ScAddr addr;
+      switch (el.m_kind)
+      {
+      case BatchElement::Kind::Node:
+        addr = self.CreateNode(el.m_type);
+        break;
+
+      case BatchElement::Kind::Edge:
+      {
+        ScAddr const src = el.m_srcRef >= 0 ? created[el.m_srcRef] : el.m_src;
+        ScAddr const trg = el.m_trgRef >= 0 ? created[el.m_trgRef] : el.m_trg;
+        if (src.IsValid() && trg.IsValid())
+          addr = self.CreateEdge(el.m_type, src, trg);
+        break;
+      }
+
+      case BatchElement::Kind::Link:
+      {
+        addr = self.CreateLink(el.m_type);
+        if (!addr.IsValid())
+          break;
+
+        ScLink link(self, addr);
+        if (el.m_contentType == BatchElement::ContentType::Int)
+          link.Set(el.m_intValue);
+        else if (el.m_contentType == BatchElement::ContentType::Double)
+          link.Set(el.m_doubleValue);
+        else if (el.m_contentType == BatchElement::ContentType::String)
+          self.SetLinkContent(addr, ScStreamMakeRead(el.m_stringValue));
+        break;
+      }
+      }
+
+      created[i] = addr;
+      data[i] = addr.Hash();
+    }
+  }
+
+  return _makeUInt64View(buffer, elements.size(), 0);
+}
+
+// Parses list of `ScAddr`/int values or buffer of uint64 values (`array('Q')`, memoryview)
+std::vector<ScAddr::HashType> _parseAddrHashes(bp::object const & values)
+{
+  std::vector<ScAddr::HashType> result;
+  if (PyObject_CheckBuffer(values.ptr()))
+  {
+    Py_buffer view;
+    if (PyObject_GetBuffer(values.ptr(), &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) != 0)
+      bp::throw_error_already_set();
+
+    std::string const format = view.format ? view.format : "B";
+    bool const isUInt64 = view.itemsize == sizeof(uint64_t) && (format.back() == 'Q' || format.back() == 'L');
+    if (isUInt64)
+    {
+      uint64_t const * data = reinterpret_cast<uint64_t const *>(view.buf);
+      result.assign(data, data + view.len / sizeof(uint64_t));
+    }
+    PyBuffer_Release(&view);
+
+    if (!isUInt64)
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidParams, "Buffer of addrs should contain uint64 values");
+
+    return result;
+  }
+
+  bp::ssize_t const count = bp::len(values);
+  result.reserve(count);
+  for (bp::ssize_t i = 0; i < count; ++i)
+  {
+    bp::object const item = values[i];
+    bp::extract<ScAddr> ae(item);
+    bp::extract<ScAddr::HashType> ie(item);
+    if (ae.check())
+      result.push_back(static_cast<ScAddr>(ae).Hash());
+    else if (ie.check())
+      result.push_back(ie);
+    else
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidParams, "Value " << i << " should be ScAddr or int");
+  }
+
+  return result;
+}
+
+// Creates memoryview of bool values
+bp::object _makeBoolView(std::vector<bool> const & values)
+{
+  bp::object buffer(bp::handle<>(PyBytes_FromStringAndSize(nullptr, values.size())));
+  char * data = PyBytes_AS_STRING(buffer.ptr());
+  for (size_t i = 0; i < values.size(); ++i)
+    data[i] = values[i] ? 1 : 0;
+
+  bp::object view(bp::handle<>(PyMemoryView_FromObject(buffer.ptr())));
+  return view.attr("cast")("?");
+}
+
+/* Returns unique hashes of sc-set members. If `relAddr` is valid, then members of
+ * relation set are returned (`setAddr => relAddr: member`). Element, that connected with set
+ * by several edges, is returned once
+ */
+std::vector<ScAddr::HashType> _setMembers(ScMemoryContext & ctx, ScAddr const & setAddr, ScAddr const & relAddr)
+{
+  std::vector<ScAddr::HashType> members;
+  std::unordered_set<ScAddr::HashType> found;
+  auto const add = [&members, &found](ScAddr const & el) {
+    if (found.insert(el.Hash()).second)
+      members.push_back(el.Hash());
+  };
+
+  if (relAddr.IsValid())
+  {
+    ScIterator5Ptr it = ctx.Iterator5(
+        setAddr, ScType::EdgeDCommonConst, ScType::Unknown, ScType::EdgeAccessConstPosPerm, relAddr);
+    while (it->Next())
+      add(it->Get(2));
+  }
+  else
+  {
+    ScIterator3Ptr it = ctx.Iterator3(setAddr, ScType::EdgeAccessConstPosPerm, ScType::Unknown);
+    while (it->Next())
+      add(it->Get(2));
+  }
+
+  return members;
+}
+
+/* Finds edges, that connect sc-set with element (common edges for relation set). Iterators
+ * start from element, so complexity doesn't depend on set size. If `edges` is nullptr, then
+ * search stops on the first edge. Returns true, if element is a member of set
+ */
+bool _findSetMemberEdges(ScMemoryContext & ctx, ScAddr const & setAddr, ScAddr const & relAddr,
+                         ScAddr const & el, std::vector<ScAddr> * edges = nullptr)
+{
+  if (!ctx.IsElement(el))
+    return false;
+
+  bool found = false;
+  if (relAddr.IsValid())
+  {
+    ScIterator5Ptr it = ctx.Iterator5(
+        setAddr, ScType::EdgeDCommonConst, el, ScType::EdgeAccessConstPosPerm, relAddr);
+    while (it->Next())
+    {
+      found = true;
+      if (edges == nullptr)
+        break;
+      edges->push_back(it->Get(1));
+    }
+  }
+  else
+  {
+    ScIterator3Ptr it = ctx.Iterator3(setAddr, ScType::EdgeAccessConstPosPerm, el);
+    while (it->Next())
+    {
+      found = true;
+      if (edges == nullptr)
+        break;
+      edges->push_back(it->Get(1));
+    }
+  }
+
+  return found;
+}
+
+bp::object _context_helperSetMembers(ScMemoryContext & self, ScAddr const & setAddr, ScAddr const & relAddr)
+{
+  std::vector<ScAddr::HashType> members;
+  {
+    py::WithoutGIL nogil;
+    members = _setMembers(self, setAddr, relAddr);
+  }
+
+  uint64_t * data = nullptr;
+  bp::object buffer = _makeUInt64Buffer(members.size(), data);
+  std::copy(members.begin(), members.end(), data);
+
+  return _makeUInt64View(buffer, members.size(), 0);
+}
+
+size_t _context_helperSetSize(ScMemoryContext & self, ScAddr const & setAddr, ScAddr const & relAddr)
+{
+  py::WithoutGIL nogil;
+  return _setMembers(self, setAddr, relAddr).size();
+}
+
+bp::object _context_helperSetHasMany(ScMemoryContext & self, ScAddr const & setAddr, ScAddr const & relAddr, bp::object const & addrs)
+{
+  std::vector<ScAddr::HashType> const values = _parseAddrHashes(addrs);
+  std::vector<bool> result(values.size(), false);
+  {
+    py::WithoutGIL nogil;
+    for (size_t i = 0; i < values.size(); ++i)
+      result[i] = _findSetMemberEdges(self, setAddr, relAddr, ScAddr(values[i]));
+  }
+
+  return _makeBoolView(result);
+}
+
+// Returns flags, that are True for elements, that were added
+bp::object _context_helperSetAddMany(ScMemoryContext & self, ScAddr const & setAddr, ScAddr const & relAddr, bp::object const & addrs)
+{
+  std::vector<ScAddr::HashType> const values = _parseAddrHashes(addrs);
+  std::vector<bool> result(values.size(), false);
+  {
+    py::WithoutGIL nogil;
+    std::unordered_set<ScAddr::HashType> added;
+    for (size_t i = 0; i < values.size(); ++i)
+    {
+      ScAddr const el(values[i]);
+      if (!added.insert(values[i]).second || _findSetMemberEdges(self, setAddr, relAddr, el))
+        continue;
+
+      ScAddr edge;
+      if (relAddr.IsValid())
+      {
+        ScAddr const commonEdge = self.CreateEdge(ScType::EdgeDCommonConst, setAddr, el);
+        if (commonEdge.IsValid())
+          edge = self.CreateEdge(ScType::EdgeAccessConstPosPerm, relAddr, commonEdge);
+      }
+      else
+      {
+        edge = self.CreateEdge(ScType::EdgeAccessConstPosPerm, setAddr, el);
+      }
+
+      result[i] = edge.IsValid();
+    }
+  }
+
+  return _makeBoolView(result);
+}
+
+// Removes all edges between set and specified elements. Returns flags, that are True for removed elements
+bp::object _context_helperSetRemoveMany(ScMemoryContext & self, ScAddr const & setAddr, ScAddr const & relAddr, bp::object const & addrs)
+{
+  std::vector<ScAddr::HashType> const values = _parseAddrHashes(addrs);
+  std::vector<bool> result(values.size(), false);
+  {
+    py::WithoutGIL nogil;
+    std::vector<ScAddr> edges;
+    for (size_t i = 0; i < values.size(); ++i)
+    {
+      edges.clear();
+      _findSetMemberEdges(self, setAddr, relAddr, ScAddr(values[i]), &edges);
+      for (ScAddr const & edge : edges)
+        result[i] = self.EraseElement(edge) || result[i];
+    }
+  }
+
+  return _makeBoolView(result);
+}
+
+// Parses list of sets: (setAddr, relAddr) tuples
+std::vector<std::pair<ScAddr, ScAddr>> _parseSets(bp::object const & sets)
+{
+  std::vector<std::pair<ScAddr, ScAddr>> result;
+
+  bp::ssize_t const count = bp::len(sets);
+  for (bp::ssize_t i = 0; i < count; ++i)
+  {
+    bp::object const item = sets[i];
+    bp::extract<ScAddr> se(bp::len(item) == 2 ? item[0] : bp::object());
+    bp::extract<ScAddr> re(bp::len(item) == 2 ? item[1] : bp::object());
+    if (!se.check() || !re.check())
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidParams, "Set " << i << " should be a tuple (setAddr, relAddr)");
+
+    result.emplace_back(se, re);
+  }
+
+  if (result.empty())
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidParams, "At least one set should be specified");
+
+  return result;
+}
+
+// Returns sorted unique hashes of set members
+std::vector<ScAddr::HashType> _setSortedMembers(ScMemoryContext & ctx, std::pair<ScAddr, ScAddr> const & set)
+{
+  std::vector<ScAddr::HashType> members = _setMembers(ctx, set.first, set.second);
+  std::sort(members.begin(), members.end());
+
+  return members;
+}
+
+enum class SetOperation : uint8_t
+{
+  Union,
+  Intersect,
+  Difference
+};
+
+// Applies operation to all sets from left to right. Returns sorted uint64 array
+bp::object _setsOperation(ScMemoryContext & self, bp::object const & setsObj, SetOperation op)
+{
+  std::vector<std::pair<ScAddr, ScAddr>> sets = _parseSets(setsObj);
+
+  std::vector<ScAddr::HashType> result;
+  {
+    py::WithoutGIL nogil;
+
+    std::vector<std::vector<ScAddr::HashType>> members;
+    for (auto const & set : sets)
+      members.emplace_back(_setSortedMembers(self, set));
+
+    // the smallest sets are intersected first, to keep intermediate result small
+    if (op == SetOperation::Intersect)
+    {
+      std::sort(members.begin(), members.end(),
+                [](std::vector<ScAddr::HashType> const & a, std::vector<ScAddr::HashType> const & b) {
+                  return a.size() < b.size();
+                });
+    }
+
+    result = std::move(members.front());
+    std::vector<ScAddr::HashType> next;
+    for (size_t i = 1; i < members.size(); ++i)
+    {
+      next.clear();
+      auto out = std::back_inserter(next);
+      auto const & other = members[i];
+      if (op == SetOperation::Union)
+        std::set_union(result.begin(), result.end(), other.begin(), other.end(), out);
+      else if (op == SetOperation::Intersect)
+        std::set_intersection(result.begin(), result.end(), other.begin(), other.end(), out);
+      else
+        std::set_difference(result.begin(), result.end(), other.begin(), other.end(), out);
+
+      result.swap(next);
+    }
+  }
+
+  uint64_t * data = nullptr;
+  bp::object buffer = _makeUInt64Buffer(result.size(), data);
+  std::copy(result.begin(), result.end(), data);
+
+  return _makeUInt64View(buffer, result.size(), 0);
+}
+
+bp::object _context_helperSetsUnion(ScMemoryContext & self, bp::object const & sets)
+{
+  return _setsOperation(self, sets, SetOperation::Union);
+}
+
+bp::object _context_helperSetsIntersect(ScMemoryContext & self, bp::object const & sets)
+{
+  return _setsOperation(self, sets, SetOperation::Intersect);
+}
+
+bp::object _context_helperSetsDifference(ScMemoryContext & self, bp::object const & sets)
+{
+  return _setsOperation(self, sets, SetOperation::Difference);
+}
+
 bp::object _context_getLinkContent(ScMemoryContext & self, ScAddr const & linkAddr)
 {
-  ScStreamPtr stream = self.GetLinkContent(linkAddr);
+  ScStreamPtr stream;
+  ScLink::Type t = ScLink::Type::Unknown;
+  {
+    py::WithoutGIL nogil;
+    stream = self.GetLinkContent(linkAddr);
+    if (stream)
+      t = ScLink(self, linkAddr).DetermineType();
+  }
+
   if (stream)
   {
-    const ScLink link(self, linkAddr);
     uint8_t linkType = PyLinkContent::Type::String;
-
-    const auto t = link.DetermineType();
     switch (t)
     {
     case ScLink::Type::Int8:
@@ -426,10 +1084,72 @@ bp::object _context_getLinkContent(ScMemoryContext & self, ScAddr const & linkAd
   return bp::object();
 }
 
-template <typename TIteratorType>
+bp::object _context_getLinkStream(ScMemoryContext & self, ScAddr const & linkAddr)
+{
+  ScStreamPtr stream;
+  {
+    py::WithoutGIL nogil;
+    stream = self.GetLinkContent(linkAddr);
+  }
+
+  if (stream && stream->IsValid())
+    return bp::object(PyLinkStream(stream));
+
+  return bp::object();
+}
+
+template <typename TIteratorType, size_t Columns>
 class PyIteratorWrap
 {
 public:
+  // Number of rows, that are read by one call in python iteration protocol
+  static size_t const kChunkSize = 256;
+
+  // Iterates rows of sc-iterator. Rows are read by chunks without interpreter lock
+  class Rows
+  {
+  public:
+    explicit Rows(TIteratorType const & iter)
+      : m_iter(iter)
+      , m_pos(0)
+    {
+    }
+
+    bp::object Next()
+    {
+      if (m_pos >= m_chunk.size())
+      {
+        m_chunk.clear();
+        m_pos = 0;
+        {
+          py::WithoutGIL nogil;
+          ReadRows(m_iter, kChunkSize, m_chunk);
+        }
+      }
+
+      if (m_chunk.empty())
+      {
+        PyErr_SetNone(PyExc_StopIteration);
+        bp::throw_error_already_set();
+      }
+
+      bp::object row(bp::handle<>(PyTuple_New(Columns)));
+      for (size_t i = 0; i < Columns; ++i)
+      {
+        bp::object const addr(ScAddr(m_chunk[m_pos + i]));
+        PyTuple_SET_ITEM(row.ptr(), i, bp::incref(addr.ptr()));
+      }
+      m_pos += Columns;
+
+      return row;
+    }
+
+  private:
+    TIteratorType m_iter;
+    std::vector<uint64_t> m_chunk;
+    size_t m_pos;
+  };
+
   PyIteratorWrap()
   {
   }
@@ -439,6 +1159,46 @@ public:
   {
   }
 
+  // Reads at most `count` rows to the end of `outData`. Returns number of read rows
+  static size_t ReadRows(TIteratorType const & iter, size_t count, std::vector<uint64_t> & outData)
+  {
+    size_t rows = 0;
+    while (rows < count && iter->Next())
+    {
+      for (size_t i = 0; i < Columns; ++i)
+        outData.push_back(iter->Get(i).Hash());
+      ++rows;
+    }
+
+    return rows;
+  }
+
+  // Returns uint64 memoryview with shape (rows, Columns), where rows <= count
+  bp::object NextBatch(size_t count)
+  {
+    SC_ASSERT(m_iter.get(), ());
+
+    std::vector<uint64_t> values;
+    size_t rows = 0;
+    {
+      py::WithoutGIL nogil;
+      values.reserve(std::min(count, kChunkSize) * Columns);
+      rows = ReadRows(m_iter, count, values);
+    }
+
+    uint64_t * data = nullptr;
+    bp::object buffer = _makeUInt64Buffer(values.size(), data);
+    std::copy(values.begin(), values.end(), data);
+
+    return _makeUInt64View(buffer, rows, Columns);
+  }
+
+  Rows Iter() const
+  {
+    SC_ASSERT(m_iter.get(), ());
+    return Rows(m_iter);
+  }
+
   bool IsValid() const
   {
     SC_ASSERT(m_iter.get(), ());
@@ -461,8 +1221,8 @@ protected:
   TIteratorType m_iter;
 };
 
-using PyIterator3 = PyIteratorWrap<ScIterator3Ptr>;
-using PyIterator5 = PyIteratorWrap<ScIterator5Ptr>;
+using PyIterator3 = PyIteratorWrap<ScIterator3Ptr, 3>;
+using PyIterator5 = PyIteratorWrap<ScIterator5Ptr, 5>;
 
 bp::object _context_iterator3(ScMemoryContext & self,
                               bp::object & param1,
@@ -617,16 +1377,9 @@ bp::object _context_iterator5(ScMemoryContext & self,
   return bp::object();
 }
 
-bp::object _context_helperResolveSysIdtf(ScMemoryContext & self, bp::object & idtf, bp::object const & type = bp::object())
+ScType _resolveOptionalType(bp::object const & type)
 {
-  bp::extract<std::string> se(idtf);
-  if (!se.check())
-  {
-    SC_THROW_EXCEPTION(utils::ExceptionInvalidType,
-                       "First parameter should have an instance of str");
-  }
   ScType rawType;
-
   if (!type.is_none())
   {
     bp::extract<ScType> te(type);
@@ -638,11 +1391,61 @@ bp::object _context_helperResolveSysIdtf(ScMemoryContext & self, bp::object & id
     rawType = static_cast<ScType>(te);
   }
 
+  return rawType;
+}
+
+bp::object _context_helperResolveSysIdtf(ScMemoryContext & self, bp::object & idtf, bp::object const & type = bp::object())
+{
+  bp::extract<std::string> se(idtf);
+  if (!se.check())
+  {
+    SC_THROW_EXCEPTION(utils::ExceptionInvalidType,
+                       "First parameter should have an instance of str");
+  }
+  ScType const rawType = _resolveOptionalType(type);
+
   std::string const idtfValue = static_cast<std::string>(se);
   ScAddr resultAddr = self.HelperResolveSystemIdtf(idtfValue, rawType);
   return bp::object(resultAddr);
 }
 
+bp::list _context_helperResolveSysIdtfs(ScMemoryContext & self, bp::object & idtfs, bp::object const & type = bp::object())
+{
+  ScType const rawType = _resolveOptionalType(type);
+
+  bp::ssize_t const count = bp::len(idtfs);
+  std::vector<std::string> idtfValues;
+  idtfValues.reserve(count);
+  for (bp::ssize_t i = 0; i < count; ++i)
+  {
+    bp::extract<std::string> se(idtfs[i]);
+    if (!se.check())
+    {
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidType,
+                         "First parameter should be a list of str");
+    }
+    idtfValues.emplace_back(static_cast<std::string>(se));
+  }
+
+  ScAddrVector resultAddrs(idtfValues.size());
+  {
+    py::WithoutGIL nogil;
+    for (size_t i = 0; i < idtfValues.size(); ++i)
+      resultAddrs[i] = self.HelperResolveSystemIdtf(idtfValues[i], rawType);
+  }
+
+  bp::list result;
+  for (auto const & addr : resultAddrs)
+    result.append(bp::object(addr));
+
+  return result;
+}
+
+sc_uint32 _context_helperGetSystemIdtfsVersion(ScMemoryContext & self)
+{
+  return sc_helper_get_system_identifiers_version();
+}
+
 bp::object _context_helperFindBySystemIdtf(ScMemoryContext & self, bp::object & idtf)
 {
   bp::extract<std::string> se(idtf);
@@ -755,7 +1558,13 @@ private:
 bp::object _context_helperGenTemplate(ScMemoryContext & self, PyTemplate & templ, PyTemplateGenParams & params)
 {
   PyTemplateGenResult result;
-  if (self.HelperGenTemplate(templ.GetItemRef(), result.GetResultRef(), params.GetItemRef()))
+  bool isGenerated = false;
+  {
+    py::WithoutGIL nogil;
+    isGenerated = self.HelperGenTemplate(templ.GetItemRef(), result.GetResultRef(), params.GetItemRef());
+  }
+
+  if (isGenerated)
   {
     result.Update();
     return bp::object(result);
@@ -767,7 +1576,10 @@ bp::object _context_helperGenTemplate(ScMemoryContext & self, PyTemplate & templ
 bp::object _context_helperSearchTemplate(ScMemoryContext & self, PyTemplate & templ)
 {
   PyTemplateSearchResult result;
-  self.HelperSearchTemplate(templ.GetItemRef(), result.GetResultRef());
+  {
+    py::WithoutGIL nogil;
+    self.HelperSearchTemplate(templ.GetItemRef(), result.GetResultRef());
+  }
   result.Update();
   return bp::object(result);
 }
@@ -778,7 +1590,14 @@ bp::object _context_helperBuildTemplate(ScMemoryContext & self, bp::object & dat
   if (addr.check())
   {
     PyTemplate templ;
-    if (self.HelperBuildTemplate(templ.GetItemRef(), static_cast<ScAddr>(addr)))
+    ScAddr const templAddr = addr;
+    bool isBuilt = false;
+    {
+      py::WithoutGIL nogil;
+      isBuilt = self.HelperBuildTemplate(templ.GetItemRef(), templAddr);
+    }
+
+    if (isBuilt)
       return bp::object(templ);
   }
 
@@ -787,7 +1606,13 @@ bp::object _context_helperBuildTemplate(ScMemoryContext & self, bp::object & dat
   {
     PyTemplate templ;
     std::string const value = str;
-    if (self.HelperBuildTemplate(templ.GetItemRef(), value))
+    bool isBuilt = false;
+    {
+      py::WithoutGIL nogil;
+      isBuilt = self.HelperBuildTemplate(templ.GetItemRef(), value);
+    }
+
+    if (isBuilt)
       return bp::object(templ);
   }
 
@@ -842,6 +1667,7 @@ public:
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(ScMemoryContext_CreateLink_overload, ScMemoryContext::CreateLink, 0, 1)
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(PyTemplate_Triple_overload, impl::PyTemplate::Triple, 3, 4)
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(PyTemplate_TripleWithRelation_overload, impl::PyTemplate::TripleWithRelation, 5, 6)
+BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(PyTemplateSearchResult_ToArray_overload, impl::PyTemplateSearchResult::ToArray, 0, 2)
 
 BOOST_PYTHON_MODULE(sc)
 {
@@ -856,18 +1682,33 @@ BOOST_PYTHON_MODULE(sc)
     .def("CreateNode", &ScMemoryContext::CreateNode, bp::return_value_policy<bp::return_by_value>())
     .def("CreateEdge", &ScMemoryContext::CreateEdge)
     .def("CreateLink", &ScMemoryContext::CreateLink, ScMemoryContext_CreateLink_overload(bp::args("type"), "Create sc-link"))
-    .def("DeleteElement", &ScMemoryContext::EraseElement)
+    .def("CreateElementsBatch", impl::_context_createElementsBatch)
+    .def("DeleteElement", impl::_context_deleteElement)
     .def("GetName", &ScMemoryContext::GetName, bp::return_value_policy<bp::return_by_value>())
     .def("IsElement", &ScMemoryContext::IsElement)
     .def("GetElementType", &ScMemoryContext::GetElementType)
     .def("FindLinksByContent", impl::_context_FindLinksByContent)
+    .def("FindLinksByContentIndex", impl::_context_FindLinksByContentIndex,
+         (bp::arg("self"), bp::arg("query"), bp::arg("mode") = ScLinkContentIndex::Mode::Exact, bp::arg("limit") = 0))
+    .def("SetLinkContentIndexEnabled", impl::_context_setLinkContentIndexEnabled)
     .def("GetEdgeInfo", impl::_context_getEdgeInfo)
     .def("SetLinkContent", impl::_context_setLinkContent)
     .def("GetLinkContent", impl::_context_getLinkContent)
+    .def("GetLinkStream", impl::_context_getLinkStream)
+    .def("HelperSetMembers", impl::_context_helperSetMembers)
+    .def("HelperSetSize", impl::_context_helperSetSize)
+    .def("HelperSetHasMany", impl::_context_helperSetHasMany)
+    .def("HelperSetAddMany", impl::_context_helperSetAddMany)
+    .def("HelperSetRemoveMany", impl::_context_helperSetRemoveMany)
+    .def("HelperSetsUnion", impl::_context_helperSetsUnion)
+    .def("HelperSetsIntersect", impl::_context_helperSetsIntersect)
+    .def("HelperSetsDifference", impl::_context_helperSetsDifference)
     .def("Iterator3", impl::_context_iterator3)
     .def("Iterator5", impl::_context_iterator5)
     .def("HelperResolveSystemIdtf", impl::_context_helperResolveSysIdtf)
+    .def("HelperResolveSystemIdtfs", impl::_context_helperResolveSysIdtfs)
     .def("HelperSetSystemIdtf", &ScMemoryContext::HelperSetSystemIdtf)
+    .def("HelperGetSystemIdtfsVersion", impl::_context_helperGetSystemIdtfsVersion)
     .def("HelperGetSystemIdtf", &ScMemoryContext::HelperGetSystemIdtf)
     .def("HelperFindBySystemIdtf", impl::_context_helperFindBySystemIdtf)
     .def("HelperCheckEdge", &ScMemoryContext::HelperCheckEdge)
@@ -880,12 +1721,26 @@ BOOST_PYTHON_MODULE(sc)
     .def("Next", &impl::PyIterator3::Next)
     .def("IsValid", &impl::PyIterator3::IsValid)
     .def("Get", &impl::PyIterator3::Get)
+    .def("NextBatch", &impl::PyIterator3::NextBatch)
+    .def("__iter__", &impl::PyIterator3::Iter)
+    ;
+
+  bp::class_<impl::PyIterator3::Rows>("ScIterator3Rows", bp::no_init)
+    .def("__iter__", bp::objects::identity_function())
+    .def("__next__", &impl::PyIterator3::Rows::Next)
     ;
 
   bp::class_<impl::PyIterator5, boost::shared_ptr<impl::PyIterator5>>("ScIterator5", bp::no_init)
     .def("Next", &impl::PyIterator5::Next)
     .def("IsValid", &impl::PyIterator5::IsValid)
     .def("Get", &impl::PyIterator5::Get)
+    .def("NextBatch", &impl::PyIterator5::NextBatch)
+    .def("__iter__", &impl::PyIterator5::Iter)
+    ;
+
+  bp::class_<impl::PyIterator5::Rows>("ScIterator5Rows", bp::no_init)
+    .def("__iter__", bp::objects::identity_function())
+    .def("__next__", &impl::PyIterator5::Rows::Next)
     ;
 
   bp::class_<impl::PyLinkContent>("ScLinkContent", bp::no_init)
@@ -899,6 +1754,13 @@ BOOST_PYTHON_MODULE(sc)
     .def_readonly("Float", &impl::PyLinkContent::Type::Float)
     ;
 
+  bp::class_<impl::PyLinkStream>("ScLinkStream", bp::no_init)
+    .def("Size", &impl::PyLinkStream::Size)
+    .def("Pos", &impl::PyLinkStream::Pos)
+    .def("Seek", &impl::PyLinkStream::Seek)
+    .def("Read", &impl::PyLinkStream::Read)
+    ;
+
   bp::class_<impl::PyTemplateGenResult>("ScTemplateGenResult", bp::no_init)
     .def("Size", &impl::PyTemplateGenResult::Size)
     .def("__getitem__", &impl::PyTemplateGenResult::Get)
@@ -914,6 +1776,7 @@ BOOST_PYTHON_MODULE(sc)
     .def("Size", &impl::PyTemplateSearchResult::Size)
     .def("__getitem__", &impl::PyTemplateSearchResult::Get)
     .def("Aliases", &impl::PyTemplateSearchResult::GetReplaceAliases)
+    .def("ToArray", &impl::PyTemplateSearchResult::ToArray, PyTemplateSearchResult_ToArray_overload(bp::args("start", "count")))
     ;
 
   bp::class_<impl::PyTemplateItemValue>("ScTemplateItemValue", bp::no_init)
@@ -938,6 +1801,7 @@ BOOST_PYTHON_MODULE(sc)
     .def("ToInt", &ScAddr::Hash)
     .def("__eq__", &ScAddr::operator==)
     .def("__ne__", &ScAddr::operator!=)
+    .def("__hash__", &ScAddr::Hash)
     .def("__rshift__", impl::_scAddrToRShift)
     .def("rshift", impl::_scAddrToRShift)
     ;
@@ -1021,6 +1885,12 @@ BOOST_PYTHON_MODULE(sc)
     .value("Unknown", SC_RESULT_UNKNOWN)
     ;
 
+  bp::enum_<ScLinkContentIndex::Mode>("ScLinkSearchMode")
+    .value("Exact", ScLinkContentIndex::Mode::Exact)
+    .value("Prefix", ScLinkContentIndex::Mode::Prefix)
+    .value("Substring", ScLinkContentIndex::Mode::Substring)
+    ;
+
   bp::class_<ScKeynodes>("ScKeynodesImpl", bp::no_init)
     .def("GetResultCodeAddr", bp::make_function(&ScKeynodes::GetResultCodeAddr, bp::return_value_policy<bp::return_by_value>()))
     .staticmethod("GetResultCodeAddr")
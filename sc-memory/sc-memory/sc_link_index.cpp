@@ -0,0 +1,476 @@
+/*
+ * This source file is part of an OSTIS project. For the latest info, see http://ostis.net
+ * Distributed under the MIT License
+ * (See accompanying file COPYING.MIT or copy at http://opensource.org/licenses/MIT)
+ */
+
+#include "sc_link_index.hpp"
+
+#include "sc_debug.hpp"
+#include "utils/sc_log.hpp"
+
+#include <algorithm>
+#include <cstdio>
+#include <fstream>
+#include <mutex>
+
+namespace
+{
+
+char const * kIndexFileName = "link_content.idx";
+uint32_t const kIndexMagic = 0x494c4353; // SCLI
+uint32_t const kIndexVersion = 1;
+
+size_t const kNGramSize = 3;
+
+uint32_t MakeTrigram(std::string const & str, size_t pos)
+{
+  return (uint32_t(uint8_t(str[pos])) << 16) |
+         (uint32_t(uint8_t(str[pos + 1])) << 8) |
+         uint32_t(uint8_t(str[pos + 2]));
+}
+
+template <typename Type>
+void WriteValue(std::ofstream & stream, Type const & value)
+{
+  stream.write(reinterpret_cast<char const *>(&value), sizeof(Type));
+}
+
+template <typename Type>
+bool ReadValue(std::ifstream & stream, Type & value)
+{
+  return bool(stream.read(reinterpret_cast<char *>(&value), sizeof(Type)));
+}
+
+} // namespace
+
+std::shared_timed_mutex ScLinkContentIndex::ms_mutex;
+std::string ScLinkContentIndex::ms_path;
+std::atomic_bool ScLinkContentIndex::ms_isEnabled = { false };
+std::atomic_bool ScLinkContentIndex::ms_isLoaded = { false };
+std::atomic<uint64_t> ScLinkContentIndex::ms_updatesCount = { 0 };
+
+std::unordered_map<ScLinkContentIndex::HashType, std::string> ScLinkContentIndex::ms_contents;
+std::set<std::pair<std::string, ScLinkContentIndex::HashType>> ScLinkContentIndex::ms_sorted;
+std::unordered_map<uint32_t, ScLinkContentIndex::HashSet> ScLinkContentIndex::ms_trigrams;
+
+void ScLinkContentIndex::Initialize(sc_memory_context const * ctx, sc_memory_params const & params)
+{
+  std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+
+  Clear();
+  ms_path.clear();
+  if (params.repo_path)
+    ms_path = std::string(params.repo_path) + "/" + kIndexFileName;
+
+  // memory is empty, so index file is out of date
+  if (params.clear == SC_TRUE && !ms_path.empty())
+    std::remove(ms_path.c_str());
+
+  ms_isEnabled = false;
+  ms_isLoaded = false;
+  if (sc_config_get_value_boolean("memory", "link_content_index") == SC_TRUE)
+    Enable(ctx);
+}
+
+void ScLinkContentIndex::Shutdown(sc_memory_context const * ctx, bool saveState)
+{
+  std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+
+  if (saveState && ms_isLoaded)
+    Save(GetLinksCount(ctx));
+  else if (saveState && !ms_isEnabled && !ms_path.empty())
+  {
+    // memory is saved without index, so index file is out of date
+    std::remove(ms_path.c_str());
+  }
+
+  Clear();
+  ms_isEnabled = false;
+  ms_isLoaded = false;
+  ms_path.clear();
+}
+
+void ScLinkContentIndex::Flush(sc_memory_context const * ctx)
+{
+  std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+
+  if (ms_isLoaded)
+    Save(GetLinksCount(ctx));
+}
+
+void ScLinkContentIndex::SetEnabled(sc_memory_context const * ctx, bool isEnabled)
+{
+  std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+
+  if (isEnabled == ms_isEnabled)
+    return;
+
+  if (isEnabled)
+  {
+    Enable(ctx);
+  }
+  else
+  {
+    Clear();
+    ms_isEnabled = false;
+    ms_isLoaded = false;
+  }
+}
+
+bool ScLinkContentIndex::IsEnabled()
+{
+  return ms_isEnabled;
+}
+
+void ScLinkContentIndex::Update(sc_memory_context const * ctx, ScAddr const & linkAddr)
+{
+  // index is disabled or isn't built yet, so new content will be read on build
+  if (!ms_isLoaded)
+    return;
+
+  // content is read without lock, so lookups aren't blocked by storage
+  uint64_t const updateNum = ++ms_updatesCount;
+  std::string content;
+  bool isIndexable = ReadContent(ctx, *linkAddr, content) && IsIndexable(content);
+
+  std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+  if (!ms_isLoaded)
+    return;
+
+  // other update was started after content was read, so this link could be changed
+  // again and its update could be applied earlier. Content is re-read to keep the last one
+  if (ms_updatesCount != updateNum)
+    isIndexable = ReadContent(ctx, *linkAddr, content) && IsIndexable(content);
+
+  Remove(linkAddr.Hash());
+  if (isIndexable)
+    Add(linkAddr.Hash(), content);
+}
+
+ScAddrVector ScLinkContentIndex::Find(sc_memory_context const * ctx, std::string const & query, Mode mode, size_t limit)
+{
+  ScAddrVector result;
+
+  {
+    std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+    if (!ms_isEnabled)
+    {
+      SC_THROW_EXCEPTION(utils::ExceptionInvalidState,
+                         "Link content index is disabled. Set `link_content_index = true` in [memory] group of config");
+    }
+
+    if (query.empty())
+      return result;
+
+    if (!ms_isLoaded)
+      Rebuild(ctx);
+  }
+
+  std::vector<HashType> found;
+  std::vector<HashType> removed;
+  auto const isLink = [ctx](HashType hash)
+  {
+    sc_type type = 0;
+    return (sc_memory_get_element_type(ctx, *ScAddr(hash), &type) == SC_RESULT_OK && (type & sc_type_link));
+  };
+
+  auto const checkFunc = [&isLink, &removed](HashType hash)
+  {
+    if (isLink(hash))
+      return true;
+
+    removed.push_back(hash);
+    return false;
+  };
+
+  {
+    std::shared_lock<std::shared_timed_mutex> lock(ms_mutex);
+    if (mode == Mode::Substring)
+      FindSubstring(query, limit, checkFunc, found);
+    else
+      FindSorted(query, mode == Mode::Prefix, limit, checkFunc, found);
+  }
+
+  if (!removed.empty())
+  {
+    std::unique_lock<std::shared_timed_mutex> lock(ms_mutex);
+    for (HashType hash : removed)
+    {
+      // link could be created at the same address after lookup
+      if (!isLink(hash))
+        Remove(hash);
+    }
+  }
+
+  result.reserve(found.size());
+  for (HashType hash : found)
+    result.emplace_back(hash);
+
+  return result;
+}
+
+size_t ScLinkContentIndex::GetSize()
+{
+  std::shared_lock<std::shared_timed_mutex> lock(ms_mutex);
+  return ms_contents.size();
+}
+
+bool ScLinkContentIndex::ReadContent(sc_memory_context const * ctx, sc_addr addr, std::string & outContent)
+{
+  sc_stream * stream = nullptr;
+  if (sc_memory_get_link_content(ctx, addr, &stream) != SC_RESULT_OK || stream == nullptr)
+    return false;
+
+  bool result = false;
+  sc_uint32 length = 0;
+  if (sc_stream_get_length(stream, &length) == SC_RESULT_OK && length <= kMaxContentSize)
+  {
+    outContent.resize(length);
+    sc_uint32 readBytes = 0;
+    result = (length == 0) ||
+             (sc_stream_read_data(stream, &outContent[0], length, &readBytes) == SC_RESULT_OK && readBytes == length);
+  }
+
+  sc_stream_free(stream);
+  return result;
+}
+
+bool ScLinkContentIndex::IsIndexable(std::string const & content)
+{
+  // binary content (numbers, images and etc.) usually contains zero bytes
+  return !content.empty() && content.size() <= kMaxContentSize &&
+         content.find('\0') == std::string::npos;
+}
+
+uint32_t ScLinkContentIndex::GetLinksCount(sc_memory_context const * ctx)
+{
+  sc_stat stat;
+  if (sc_memory_stat(ctx, &stat) != SC_RESULT_OK)
+    return 0;
+
+  return stat.link_count;
+}
+
+void ScLinkContentIndex::Add(HashType hash, std::string const & content)
+{
+  auto const it = ms_contents.emplace(hash, content).first;
+  ms_sorted.emplace(it->second, hash);
+
+  for (size_t i = 0; i + kNGramSize <= content.size(); ++i)
+    ms_trigrams[MakeTrigram(content, i)].insert(hash);
+}
+
+void ScLinkContentIndex::Remove(HashType hash)
+{
+  auto const it = ms_contents.find(hash);
+  if (it == ms_contents.end())
+    return;
+
+  std::string const & content = it->second;
+  ms_sorted.erase(std::make_pair(content, hash));
+
+  for (size_t i = 0; i + kNGramSize <= content.size(); ++i)
+  {
+    auto const itGram = ms_trigrams.find(MakeTrigram(content, i));
+    if (itGram == ms_trigrams.end())
+      continue;
+
+    itGram->second.erase(hash);
+    if (itGram->second.empty())
+      ms_trigrams.erase(itGram);
+  }
+
+  ms_contents.erase(it);
+}
+
+void ScLinkContentIndex::Enable(sc_memory_context const * ctx)
+{
+  // if there are no valid index file, then it will be built on the first lookup
+  Clear();
+  ms_isEnabled = true;
+  ms_isLoaded = Load(GetLinksCount(ctx));
+}
+
+void ScLinkContentIndex::Clear()
+{
+  ms_contents.clear();
+  ms_sorted.clear();
+  ms_trigrams.clear();
+}
+
+void ScLinkContentIndex::Rebuild(sc_memory_context const * ctx)
+{
+  SC_LOG_INFO("Build link content index");
+
+  Clear();
+
+  sc_stat stat;
+  if (sc_memory_stat(ctx, &stat) == SC_RESULT_OK)
+  {
+    std::string content;
+    for (sc_uint32 seg = 0; seg < stat.segments_count; ++seg)
+    {
+      for (sc_uint32 offset = 0; offset < SC_SEGMENT_ELEMENTS_COUNT; ++offset)
+      {
+        sc_addr addr;
+        addr.seg = sc_addr_seg(seg);
+        addr.offset = sc_addr_offset(offset);
+
+        sc_type type = 0;
+        if (sc_memory_get_element_type(ctx, addr, &type) != SC_RESULT_OK || !(type & sc_type_link))
+          continue;
+
+        if (ReadContent(ctx, addr, content) && IsIndexable(content))
+          Add(ScAddr(addr).Hash(), content);
+      }
+    }
+  }
+
+  ms_isLoaded = true;
+}
+
+bool ScLinkContentIndex::Load(uint32_t linksCount)
+{
+  if (ms_path.empty())
+    return false;
+
+  std::ifstream stream(ms_path, std::ios::binary);
+  if (!stream.is_open())
+    return false;
+
+  uint32_t magic = 0, version = 0, savedLinksCount = 0;
+  uint64_t count = 0;
+  if (!ReadValue(stream, magic) || !ReadValue(stream, version) ||
+      !ReadValue(stream, savedLinksCount) || !ReadValue(stream, count))
+  {
+    return false;
+  }
+
+  // memory was changed without index, so it should be rebuilt
+  if (magic != kIndexMagic || version != kIndexVersion || savedLinksCount != linksCount)
+    return false;
+
+  std::string content;
+  for (uint64_t i = 0; i < count; ++i)
+  {
+    HashType hash = 0;
+    uint32_t size = 0;
+    if (!ReadValue(stream, hash) || !ReadValue(stream, size) || size > kMaxContentSize)
+    {
+      SC_LOG_WARNING("Link content index file " << ms_path << " is corrupted");
+      Clear();
+      return false;
+    }
+
+    content.resize(size);
+    if (size > 0 && !stream.read(&content[0], size))
+    {
+      SC_LOG_WARNING("Link content index file " << ms_path << " is corrupted");
+      Clear();
+      return false;
+    }
+
+    Add(hash, content);
+  }
+
+  return true;
+}
+
+bool ScLinkContentIndex::Save(uint32_t linksCount)
+{
+  if (ms_path.empty())
+    return false;
+
+  std::string const tmpPath = ms_path + ".tmp";
+  {
+    std::ofstream stream(tmpPath, std::ios::binary | std::ios::trunc);
+    if (!stream.is_open())
+    {
+      SC_LOG_WARNING("Can't save link content index to " << ms_path);
+      return false;
+    }
+
+    WriteValue(stream, kIndexMagic);
+    WriteValue(stream, kIndexVersion);
+    WriteValue(stream, linksCount);
+    WriteValue(stream, uint64_t(ms_contents.size()));
+
+    for (auto const & item : ms_contents)
+    {
+      WriteValue(stream, item.first);
+      WriteValue(stream, uint32_t(item.second.size()));
+      stream.write(item.second.data(), item.second.size());
+    }
+
+    if (!stream)
+    {
+      SC_LOG_WARNING("Can't save link content index to " << ms_path);
+      return false;
+    }
+  }
+
+  std::remove(ms_path.c_str());
+  return std::rename(tmpPath.c_str(), ms_path.c_str()) == 0;
+}
+
+void ScLinkContentIndex::FindSorted(std::string const & query, bool isPrefix, size_t limit,
+                                    CheckFunc const & checkFunc, std::vector<HashType> & outResult)
+{
+  for (auto it = ms_sorted.lower_bound(std::make_pair(query, HashType(0))); it != ms_sorted.end(); ++it)
+  {
+    std::string const & content = it->first;
+    bool const isMatched = isPrefix ? (content.compare(0, query.size(), query) == 0) : (content == query);
+    if (!isMatched)
+      break;
+
+    if (checkFunc(it->second))
+    {
+      outResult.push_back(it->second);
+      if (limit > 0 && outResult.size() >= limit)
+        break;
+    }
+  }
+}
+
+void ScLinkContentIndex::FindSubstring(std::string const & query, size_t limit,
+                                       CheckFunc const & checkFunc, std::vector<HashType> & outResult)
+{
+  auto const tryAdd = [&](HashType hash, std::string const & content)
+  {
+    if (content.find(query) != std::string::npos && checkFunc(hash))
+      outResult.push_back(hash);
+
+    return (limit == 0 || outResult.size() < limit);
+  };
+
+  // query is too short to use n-grams
+  if (query.size() < kNGramSize)
+  {
+    for (auto const & item : ms_sorted)
+    {
+      if (!tryAdd(item.second, item.first))
+        break;
+    }
+    return;
+  }
+
+  // check candidates from the smallest list of links, that contains n-gram of query
+  HashSet const * candidates = nullptr;
+  for (size_t i = 0; i + kNGramSize <= query.size(); ++i)
+  {
+    auto const it = ms_trigrams.find(MakeTrigram(query, i));
+    if (it == ms_trigrams.end())
+      return;
+
+    if (!candidates || it->second.size() < candidates->size())
+      candidates = &it->second;
+  }
+
+  for (HashType hash : *candidates)
+  {
+    auto const it = ms_contents.find(hash);
+    if (it != ms_contents.end() && !tryAdd(hash, it->second))
+      break;
+  }
+}
@@ -0,0 +1,108 @@
+/*
+ * This source file is part of an OSTIS project. For the latest info, see http://ostis.net
+ * Distributed under the MIT License
+ * (See accompanying file COPYING.MIT or copy at http://opensource.org/licenses/MIT)
+ */
+
+#pragma once
+
+#include "sc_addr.hpp"
+
+#include <atomic>
+#include <functional>
+#include <set>
+#include <shared_mutex>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+
+extern "C"
+{
+#include "sc-core/sc_memory_headers.h"
+}
+
+/* In-process index of string content of sc-links. It supports exact, prefix and
+ * substring (trigram) lookup. Index is updated by ScMemoryContext::SetLinkContent
+ * and it's stored in repository directory on memory shutdown.
+ *
+ * Index is disabled by default. It's enabled by `link_content_index = true` in `[memory]`
+ * group of config, or by `SetEnabled` call.
+ *
+ * If there are no index file on start (or it doesn't match to memory), then index
+ * is built by scan of memory on the first lookup.
+ *
+ * Content, that changed by C API (`sc_memory_set_link_content`, `sc_helper_set_system_identifier`
+ * from C modules), isn't updated in index.
+ */
+class ScLinkContentIndex
+{
+public:
+  enum class Mode : uint8_t
+  {
+    Exact = 0,
+    Prefix = 1,
+    Substring = 2
+  };
+
+  // Content, that is longer, isn't indexed
+  static size_t const kMaxContentSize = 4096;
+
+  // Just for internal usage
+  static void Initialize(sc_memory_context const * ctx, sc_memory_params const & params);
+  static void Shutdown(sc_memory_context const * ctx, bool saveState);
+  static void Update(sc_memory_context const * ctx, ScAddr const & linkAddr);
+  static void Flush(sc_memory_context const * ctx);
+
+  /* Enables or disables index. Enabled index is loaded from file or built on the first lookup,
+   * disabled index is cleared and its file is removed on shutdown
+   */
+  static _SC_EXTERN void SetEnabled(sc_memory_context const * ctx, bool isEnabled);
+  static _SC_EXTERN bool IsEnabled();
+
+  /* Returns links, which content matches to query. If limit is 0, then
+   * all found links are returned. Throws ExceptionInvalidState, if index is disabled
+   */
+  static _SC_EXTERN ScAddrVector Find(sc_memory_context const * ctx, std::string const & query, Mode mode, size_t limit);
+
+  //! Returns number of indexed links
+  static _SC_EXTERN size_t GetSize();
+
+private:
+  using HashType = ScAddr::HashType;
+  using HashSet = std::unordered_set<HashType>;
+
+  static bool ReadContent(sc_memory_context const * ctx, sc_addr addr, std::string & outContent);
+  static bool IsIndexable(std::string const & content);
+  static uint32_t GetLinksCount(sc_memory_context const * ctx);
+
+  static void Add(HashType hash, std::string const & content);
+  static void Remove(HashType hash);
+  static void Enable(sc_memory_context const * ctx);
+  static void Clear();
+  static void Rebuild(sc_memory_context const * ctx);
+
+  static bool Load(uint32_t linksCount);
+  static bool Save(uint32_t linksCount);
+
+  // Function returns false, when link should be skipped (it was removed from memory)
+  using CheckFunc = std::function<bool(HashType)>;
+
+  static void FindSorted(std::string const & query, bool isPrefix, size_t limit,
+                         CheckFunc const & checkFunc, std::vector<HashType> & outResult);
+  static void FindSubstring(std::string const & query, size_t limit,
+                            CheckFunc const & checkFunc, std::vector<HashType> & outResult);
+
+private:
+  static std::shared_timed_mutex ms_mutex;
+  static std::string ms_path;
+  // flags are changed under lock, but they are read without it to skip updates of disabled index
+  static std::atomic_bool ms_isEnabled;
+  static std::atomic_bool ms_isLoaded;
+  // number of started updates, it's used to check if content could be changed after it was read
+  static std::atomic<uint64_t> ms_updatesCount;
+
+  static std::unordered_map<HashType, std::string> ms_contents;
+  static std::set<std::pair<std::string, HashType>> ms_sorted;
+  static std::unordered_map<uint32_t, HashSet> ms_trigrams;
+};
@@ -6,6 +6,7 @@
 
 #include "sc_memory.hpp"
 #include "sc_keynodes.hpp"
+#include "sc_link_index.hpp"
 #include "sc_utils.hpp"
 #include "sc_stream.hpp"
 
@@ -94,6 +95,8 @@ bool ScMemory::Initialize(sc_memory_params const & params)
   if (ms_globalContext == nullptr)
     return false;
 
+  ScLinkContentIndex::Initialize(ms_globalContext, params);
+
   py::ScPythonInterpreter::Initialize("sc-memory");
   sc_memory_init_ext(params.ext_path, params.enabled_exts);
 
@@ -119,6 +122,8 @@ void ScMemory::Shutdown(bool saveState /* = true */)
     SC_THROW_EXCEPTION(utils::ExceptionInvalidState, description.str());
   }
 
+  ScLinkContentIndex::Shutdown(ms_globalContext, saveState);
+
   sc_memory_shutdown(SC_BOOL(saveState));
   ms_globalContext = 0;
 
@@ -327,7 +332,11 @@ bool ScMemoryContext::SetLinkContent(ScAddr const & addr, ScStreamPtr const & st
 {
   SC_ASSERT(IsValid(), ());
   SC_ASSERT(stream, ());
-  return sc_memory_set_link_content(m_context, *addr, stream->m_stream) == SC_RESULT_OK;
+  if (sc_memory_set_link_content(m_context, *addr, stream->m_stream) != SC_RESULT_OK)
+    return false;
+
+  ScLinkContentIndex::Update(m_context, addr);
+  return true;
 }
 
 ScStreamPtr ScMemoryContext::GetLinkContent(ScAddr const & addr)
@@ -370,7 +379,11 @@ ScAddrVector ScMemoryContext::FindLinksByContent(ScStreamPtr const & stream)
 bool ScMemoryContext::Save()
 {
   SC_ASSERT(IsValid(), ());
-  return (sc_memory_save(m_context) == SC_RESULT_OK);
+  if (sc_memory_save(m_context) != SC_RESULT_OK)
+    return false;
+
+  ScLinkContentIndex::Flush(m_context);
+  return true;
 }
 
 bool ScMemoryContext::HelperResolveSystemIdtf(std::string const & sysIdtf, ScAddr & outAddr, ScType const & type/* = ScType()*/)
@@ -401,7 +414,14 @@ ScAddr ScMemoryContext::HelperResolveSystemIdtf(std::string const & sysIdtf, ScT
 bool ScMemoryContext::HelperSetSystemIdtf(std::string const & sysIdtf, ScAddr const & addr)
 {
   SC_ASSERT(IsValid(), ());
-  return (sc_helper_set_system_identifier(m_context, *addr, sysIdtf.c_str(), (sc_uint32)sysIdtf.size()) == SC_RESULT_OK);
+  if (sc_helper_set_system_identifier(m_context, *addr, sysIdtf.c_str(), (sc_uint32)sysIdtf.size()) != SC_RESULT_OK)
+    return false;
+
+  ScAddr idtfLink;
+  if (sc_helper_get_system_identifier_link(m_context, *addr, &idtfLink.m_realAddr) == SC_RESULT_OK)
+    ScLinkContentIndex::Update(m_context, idtfLink);
+
+  return true;
 }
 
 std::string ScMemoryContext::HelperGetSystemIdtf(ScAddr const & addr)
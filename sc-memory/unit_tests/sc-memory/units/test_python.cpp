@@ -89,3 +89,27 @@ TEST_CASE("Python_clean", "[test python]")
 
   test::ScTestUnit::ShutdownMemory(false);
 }
+
+// Benchmarks of Python bindings are hidden, run them with `[bench]` tag
+TEST_CASE("Python_bench", "[.][bench]")
+{
+  test::ScTestUnit::InitMemory("sc-memory.ini", "");
+
+  try
+  {
+    py::ScPythonInterpreter::AddModulesPath(SC_TEST_KPM_PYTHON_PATH);
+
+    py::DummyService benchService("sc_tests/bench_main.py");
+    benchService.Run();
+
+    while (benchService.IsRun())
+      std::this_thread::sleep_for(std::chrono::milliseconds(10));
+
+    benchService.Stop();
+  } catch (...)
+  {
+    SC_LOG_ERROR("Test \"Python_bench\" failed")
+  }
+
+  test::ScTestUnit::ShutdownMemory(false);
+}
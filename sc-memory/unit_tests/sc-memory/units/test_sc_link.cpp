@@ -7,6 +7,7 @@
 #include "catch2/catch.hpp"
 #include "sc-test-framework/sc_test_unit.hpp"
 #include "sc-memory/sc_link.hpp"
+#include "sc-memory/sc_link_index.hpp"
 
 template<typename Type>
 void TestType(ScMemoryContext & ctx, Type const & value)
@@ -132,3 +133,90 @@ TEST_CASE("sc_link_as_string", "[test sc link]")
   ctx.Destroy();
   test::ScTestUnit::ShutdownMemory(false);
 }
+
+TEST_CASE("sc_link_content_index", "[test sc link]")
+{
+  test::ScTestUnit::InitMemory("sc-memory.ini", "");
+  ScMemoryContext * ctx = new ScMemoryContext(sc_access_lvl_make_min, "sc_link_content_index");
+
+  // index is disabled by default
+  REQUIRE_FALSE(ScLinkContentIndex::IsEnabled());
+  REQUIRE_THROWS_AS(ScLinkContentIndex::Find(**ctx, "apple", ScLinkContentIndex::Mode::Exact, 0),
+                    utils::ExceptionInvalidState);
+  ScLinkContentIndex::SetEnabled(**ctx, true);
+
+  auto const createLink = [ctx](std::string const & content)
+  {
+    ScAddr const linkAddr = ctx->CreateLink();
+    REQUIRE(ctx->SetLinkContent(linkAddr, ScStreamMakeRead(content)));
+    return linkAddr;
+  };
+
+  ScAddr const apple = createLink("apple");
+  ScAddr const applePie = createLink("apple pie");
+  ScAddr const pineapple = createLink("pineapple");
+
+  SECTION("exact")
+  {
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "apple", ScLinkContentIndex::Mode::Exact, 0) == ScAddrVector({ apple }));
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "appl", ScLinkContentIndex::Mode::Exact, 0).empty());
+  }
+
+  SECTION("prefix")
+  {
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "app", ScLinkContentIndex::Mode::Prefix, 0) == ScAddrVector({ apple, applePie }));
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "app", ScLinkContentIndex::Mode::Prefix, 1).size() == 1);
+  }
+
+  SECTION("substring")
+  {
+    ScAddrVector const found = ScLinkContentIndex::Find(**ctx, "apple", ScLinkContentIndex::Mode::Substring, 0);
+    REQUIRE(found.size() == 3);
+    REQUIRE(std::find(found.begin(), found.end(), apple) != found.end());
+    REQUIRE(std::find(found.begin(), found.end(), applePie) != found.end());
+    REQUIRE(std::find(found.begin(), found.end(), pineapple) != found.end());
+
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "e p", ScLinkContentIndex::Mode::Substring, 0) == ScAddrVector({ applePie }));
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "pp", ScLinkContentIndex::Mode::Substring, 2).size() == 2);
+  }
+
+  SECTION("update")
+  {
+    REQUIRE(ctx->SetLinkContent(pineapple, ScStreamMakeRead(std::string("pear"))));
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "pine", ScLinkContentIndex::Mode::Prefix, 0).empty());
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "pear", ScLinkContentIndex::Mode::Exact, 0) == ScAddrVector({ pineapple }));
+
+    REQUIRE(ctx->EraseElement(applePie));
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "apple", ScLinkContentIndex::Mode::Prefix, 0) == ScAddrVector({ apple }));
+  }
+
+  SECTION("persistence")
+  {
+    size_t const indexSize = ScLinkContentIndex::GetSize();
+
+    ctx->Destroy();
+    delete ctx;
+    test::ScTestUnit::ShutdownMemory(true);
+
+    sc_memory_params params;
+    sc_memory_params_clear(&params);
+    params.clear = SC_FALSE;
+    params.repo_path = "repo";
+    params.config_file = "sc-memory.ini";
+
+    ScMemory::LogMute();
+    ScMemory::Initialize(params);
+    ScMemory::LogUnmute();
+
+    ctx = new ScMemoryContext(sc_access_lvl_make_min, "sc_link_content_index");
+    ScLinkContentIndex::SetEnabled(**ctx, true);
+
+    // index is loaded from file, so it isn't built on lookup
+    REQUIRE(ScLinkContentIndex::GetSize() == indexSize);
+    REQUIRE(ScLinkContentIndex::Find(**ctx, "apple", ScLinkContentIndex::Mode::Exact, 0) == ScAddrVector({ apple }));
+  }
+
+  ctx->Destroy();
+  delete ctx;
+  test::ScTestUnit::ShutdownMemory(false);
+}
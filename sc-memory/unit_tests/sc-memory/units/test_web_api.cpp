@@ -38,3 +38,26 @@ TEST_CASE("WebAPI", "[test web api]")
 
   test::ScTestUnit::ShutdownMemory(false);
 }
+
+// Load of websocket API is hidden, run it with `[load]` tag
+TEST_CASE("WebAPI_load", "[.][load]")
+{
+  test::ScTestUnit::InitMemory("sc-memory.ini", "");
+  py::ScPythonInterpreter::AddModulesPath(SC_TEST_KPM_PYTHON_PATH);
+
+  try
+  {
+    py::DummyService loadService("http_api/test/load_web_api.py");
+    loadService.Run();
+
+    while (loadService.IsRun())
+      std::this_thread::sleep_for(std::chrono::milliseconds(10));
+
+    loadService.Stop();
+  } catch (...)
+  {
+    SC_LOG_ERROR("Test \"WebAPI_load\" failed")
+  }
+
+  test::ScTestUnit::ShutdownMemory(false);
+}